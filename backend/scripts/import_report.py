@@ -0,0 +1,85 @@
+"""
+Import-time report for the Lambda handlers.
+
+Imports each handler module in a fresh interpreter with `python -X importtime`
+and prints its total import time plus the slowest modules, so cold-start
+init cost can be tracked as dependencies change.
+
+Usage (from backend/):
+    python scripts/import_report.py [--top N] [handler_module ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+HANDLERS = (
+    "questions_handler",
+    "stream_processor",
+    "evaluate_answer",
+    "admin_create_user",
+)
+
+# Enough configuration for the handlers to import; no AWS calls are made
+IMPORT_ENV = {
+    "TABLE_NAME": "import-report",
+    "USER_POOL_ID": "import-report",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+}
+
+
+def measure(module):
+    """
+    Import one module in a subprocess.
+
+    Returns:
+        List of (cumulative_us, self_us, module_name) in import order
+    """
+    env = {**os.environ, **IMPORT_ENV, "PYTHONPATH": str(SRC_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # column header
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def report(module, top):
+    rows = measure(module)
+    total_us = next(
+        cumulative for cumulative, _, name in rows if name.strip() == module
+    )
+    print(f"{module}: {total_us / 1000:.1f} ms total import time")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  (self {self_us / 1000:6.1f})  {name}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=HANDLERS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report(module, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,21 @@ This endpoint is PUBLIC but has security measures:
 - User must change password on first login
 """
 
+import lambda_telemetry  # first, so init timing covers every other import
 import json
 import os
 import re
-import boto3
 from botocore.exceptions import ClientError
+import aws_clients
+import request_timing
+import structured_logging
+from serialization import to_json
 
-cognito_client = boto3.client("cognito-idp")
+lambda_telemetry.mark_init_phase("imports")
+
+logger = structured_logging.configure()
+
+cognito_client = aws_clients.lazy_client("cognito-idp")
 USER_POOL_ID = os.environ.get("USER_POOL_ID")
 
 
@@ -25,6 +33,7 @@ def is_valid_email(email):
     return re.match(pattern, email) is not None
 
 
+@lambda_telemetry.instrument
 def handler(event, context):
     """
     Public API to create users securely.
@@ -36,7 +45,8 @@ def handler(event, context):
     - Rate limiting should be configured at API Gateway level
     """
     try:
-        body = json.loads(event.get("body", "{}"))
+        with request_timing.span("parse"):
+            body = json.loads(event.get("body", "{}"))
         email = body.get("email", "").strip().lower()
 
         if not email:
@@ -46,7 +56,7 @@ def handler(event, context):
                     "Content-Type": "application/json",
                     "Access-Control-Allow-Origin": "*",
                 },
-                "body": json.dumps({"error": "Email is required"}),
+                "body": to_json({"error": "Email is required"}),
             }
 
         if not is_valid_email(email):
@@ -56,7 +66,7 @@ def handler(event, context):
                     "Content-Type": "application/json",
                     "Access-Control-Allow-Origin": "*",
                 },
-                "body": json.dumps({"error": "Invalid email format"}),
+                "body": to_json({"error": "Invalid email format"}),
             }
 
         # Create user with AdminCreateUser
@@ -80,7 +90,7 @@ def handler(event, context):
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps(
+            "body": to_json(
                 {
                     "message": (
                         "Account created! Check your email for a "
@@ -102,7 +112,7 @@ def handler(event, context):
                     "Content-Type": "application/json",
                     "Access-Control-Allow-Origin": "*",
                 },
-                "body": json.dumps({"error": "User already exists"}),
+                "body": to_json({"error": "User already exists"}),
             }
 
         if error_code == "InvalidParameterException":
@@ -112,28 +122,28 @@ def handler(event, context):
                     "Content-Type": "application/json",
                     "Access-Control-Allow-Origin": "*",
                 },
-                "body": json.dumps({"error": "Invalid parameters provided"}),
+                "body": to_json({"error": "Invalid parameters provided"}),
             }
 
-        print(f"Error creating user: {e}")
+        logger.error(f"Error creating user: {e}", extra={"error_type": error_code})
         return {
             "statusCode": 500,
             "headers": {
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps(
+            "body": to_json(
                 {"error": "Failed to create account. Please try again later."}
             ),
         }
 
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        logger.error(f"Unexpected error: {e}", exc_info=True)
         return {
             "statusCode": 500,
             "headers": {
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps({"error": "An unexpected error occurred"}),
+            "body": to_json({"error": "An unexpected error occurred"}),
         }
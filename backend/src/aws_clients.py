@@ -0,0 +1,106 @@
+"""
+Shared AWS client registry for the Lambda handlers.
+
+Every boto3 client and resource is created at most once per container and
+reused across warm invocations, with a tuned botocore Config: keep-alive
+connections, a pool large enough for parallel scans, short connect
+timeouts and adaptive retries.
+
+Clients that only some requests need should be created lazily with
+lazy_client(), so a cold start does not pay to load their service models:
+
+    s3 = aws_clients.lazy_client("s3")
+
+The returned proxy is a plain module attribute, so tests can still patch it.
+
+Every client is instrumented on creation (see aws_instrumentation).
+"""
+
+import threading
+
+import boto3
+from botocore.config import Config
+
+import aws_instrumentation
+
+BASE_CONFIG = Config(
+    # Parallel scan segments and batch requests share one pool per client
+    max_pool_connections=25,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+)
+
+# Per-service overrides merged over BASE_CONFIG
+SERVICE_CONFIGS = {
+    # Model invocations are slow; leave room inside the 30s Lambda timeout
+    "bedrock-runtime": Config(
+        read_timeout=25, retries={"max_attempts": 2, "mode": "adaptive"}
+    ),
+    # Metrics are best effort and must not hold up a response
+    "cloudwatch": Config(
+        read_timeout=3, retries={"max_attempts": 2, "mode": "adaptive"}
+    ),
+}
+
+_instances = {}
+_lock = threading.Lock()
+
+
+def config_for(service_name):
+    """botocore Config for a service: the shared defaults plus any overrides"""
+    override = SERVICE_CONFIGS.get(service_name)
+    return BASE_CONFIG.merge(override) if override else BASE_CONFIG
+
+
+def _get_or_create(kind, service_name, kwargs):
+    key = (kind, service_name, tuple(sorted(kwargs.items())))
+    instance = _instances.get(key)
+    if instance is not None:
+        return instance
+
+    with _lock:
+        instance = _instances.get(key)
+        if instance is None:
+            factory = boto3.client if kind == "client" else boto3.resource
+            instance = factory(service_name, config=config_for(service_name), **kwargs)
+            meta = instance.meta if kind == "client" else instance.meta.client.meta
+            aws_instrumentation.install(meta.events, service_name)
+            _instances[key] = instance
+    return instance
+
+
+def client(service_name, **kwargs):
+    """The container's shared low-level client for a service"""
+    return _get_or_create("client", service_name, kwargs)
+
+
+def resource(service_name, **kwargs):
+    """The container's shared boto3 resource for a service"""
+    return _get_or_create("resource", service_name, kwargs)
+
+
+class LazyClient:
+    """Proxy that creates the shared client on first attribute access"""
+
+    def __init__(self, service_name, **kwargs):
+        self._service_name = service_name
+        self._kwargs = kwargs
+
+    def __getattr__(self, name):
+        return getattr(client(self._service_name, **self._kwargs), name)
+
+    def __repr__(self):
+        return f"LazyClient({self._service_name!r})"
+
+
+def lazy_client(service_name, **kwargs):
+    """A client proxy that defers creation until the client is first used"""
+    return LazyClient(service_name, **kwargs)
+
+
+def reset():
+    """Forget every client (for tests)"""
+    with _lock:
+        _instances.clear()
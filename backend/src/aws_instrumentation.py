@@ -0,0 +1,151 @@
+"""
+botocore event-hook instrumentation of AWS API calls.
+
+install() hooks a client's event system so every call made through it is
+recorded: operation, duration, retry attempts, HTTP status, throttling
+and, for DynamoDB, consumed capacity (ReturnConsumedCapacity=TOTAL is
+requested on every operation that supports it). Each call's duration is
+also added to the current request's phase timings (see request_timing).
+
+Calls are aggregated per (service, operation) until take_stats() is
+called, once per invocation by lambda_telemetry, which reports them
+through custom_metrics.
+"""
+
+import threading
+import time
+
+import request_timing
+
+# Request phase a service's calls are timed under; defaults to the service
+# name
+CALL_PHASES = {
+    "bedrock-runtime": "bedrock",
+    "cognito-idp": "cognito",
+}
+
+# Not instrumented: the metric flush is timed and reported as a whole
+UNINSTRUMENTED_SERVICES = {"cloudwatch"}
+
+THROTTLING_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "ThrottledException",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+}
+
+# {(service, operation): {"calls", "errors", "throttles", "retries",
+#   "durations", "statuses", "capacity"}} for the invocation in progress
+call_stats = {}
+stats_lock = threading.Lock()
+
+
+def new_stats():
+    return {
+        "calls": 0,
+        "errors": 0,
+        "throttles": 0,
+        "retries": 0,
+        "durations": [],
+        "statuses": {},
+        "capacity": {},
+    }
+
+
+def consumed_capacity(parsed):
+    """
+    Capacity units per table from a DynamoDB response.
+
+    Returns:
+        {table name: capacity units}
+    """
+    capacity = parsed.get("ConsumedCapacity")
+    if not capacity:
+        return {}
+    if isinstance(capacity, dict):
+        capacity = [capacity]
+
+    units = {}
+    for entry in capacity:
+        table = entry.get("TableName", "unknown")
+        units[table] = units.get(table, 0.0) + float(entry.get("CapacityUnits", 0))
+    return units
+
+
+def record_call(
+    service_name, operation, duration_ms, status, retries, error_code, capacity
+):
+    """Fold one finished call into the invocation's stats"""
+    with stats_lock:
+        stats = call_stats.setdefault((service_name, operation), new_stats())
+        stats["calls"] += 1
+        stats["retries"] += retries
+        stats["durations"].append(duration_ms)
+        if status is not None:
+            stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+        if error_code is not None:
+            stats["errors"] += 1
+            if error_code in THROTTLING_ERROR_CODES:
+                stats["throttles"] += 1
+        for table, units in capacity.items():
+            stats["capacity"][table] = stats["capacity"].get(table, 0.0) + units
+
+
+def take_stats():
+    """Return and reset the stats gathered since the last call"""
+    global call_stats
+    with stats_lock:
+        stats, call_stats = call_stats, {}
+    return stats
+
+
+def install(events, service_name):
+    """Hook a client's event system so its calls are timed and recorded"""
+    if service_name in UNINSTRUMENTED_SERVICES:
+        return
+    phase = CALL_PHASES.get(service_name, service_name)
+
+    def before_call(params, model, context, **kwargs):
+        # provide-client-params is the first event of a call and, unlike
+        # before-call, cannot be short-circuited by another handler
+        context["instrumentation_started"] = time.perf_counter()
+        if service_name == "dynamodb":
+            members = model.input_shape.members if model.input_shape else {}
+            if "ReturnConsumedCapacity" in members:
+                params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+    def after_call(event_name, context, http_response=None, parsed=None, **kwargs):
+        started = context.pop("instrumentation_started", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        request_timing.record(phase, duration_ms)
+
+        # after-call also fires for error responses (parsed holds the Error);
+        # after-call-error only for calls that got no response at all
+        parsed = parsed or {}
+        metadata = parsed.get("ResponseMetadata", {})
+        status = metadata.get("HTTPStatusCode")
+        if status is None and http_response is not None:
+            status = http_response.status_code
+
+        error_code = parsed.get("Error", {}).get("Code")
+        exception = kwargs.get("exception")
+        if exception is not None:
+            error_code = type(exception).__name__
+
+        record_call(
+            service_name,
+            event_name.rsplit(".", 1)[-1],
+            duration_ms,
+            status,
+            metadata.get("RetryAttempts", 0),
+            error_code,
+            consumed_capacity(parsed),
+        )
+
+    events.register("provide-client-params", before_call)
+    events.register("after-call", after_call)
+    events.register("after-call-error", after_call)
@@ -2,6 +2,11 @@
 Custom CloudWatch Metrics Module
 Emits business-specific metrics for RoleReady application monitoring.
 
+METRICS_BACKEND selects how metrics reach CloudWatch:
+- "api" (default): PutMetricData calls
+- "emf": Embedded Metric Format JSON lines on stdout, which CloudWatch Logs
+  turns into the same metrics with no network I/O in the request
+
 Metrics tracked:
 - Questions retrieval and viewing patterns
 - AI evaluation usage and success rates
@@ -9,17 +14,144 @@ Metrics tracked:
 - System performance indicators
 """
 
-import boto3
+import json
 import logging
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
+import aws_clients
+import request_timing
+from serialization import to_json
+
 logger = logging.getLogger(__name__)
-cloudwatch = boto3.client("cloudwatch")
+cloudwatch = aws_clients.lazy_client("cloudwatch")
 
 # Namespace for all RoleReady custom metrics
 NAMESPACE = "RoleReady"
 
+METRICS_BACKEND = os.environ.get("METRICS_BACKEND", "api").lower()
+
+# PutMetricData limits: datums per request, and values per datum
+MAX_DATUMS_PER_CALL = 1000
+MAX_VALUES_PER_DATUM = 150
+
+# Embedded Metric Format limits: metrics per document, values per metric
+MAX_EMF_METRICS = 100
+MAX_EMF_VALUES = 100
+
+# Datapoints held back while a handler invocation is buffering (see
+# buffered_metrics); outside an invocation metrics are sent immediately
+buffer_state = {"depth": 0, "datapoints": []}
+buffer_lock = threading.Lock()
+
+# Distributions (latencies) are folded into per-series histograms that
+# outlive the invocation and are flushed once old or large enough
+HISTOGRAM_FLUSH_SECONDS = float(os.environ.get("METRICS_HISTOGRAM_FLUSH_SECONDS", 60))
+HISTOGRAM_MAX_BUCKETS = 500
+# Relative bucket width; values are reported within about half of this
+HISTOGRAM_PRECISION = 0.04
+
+histogram_state = {"series": {}, "buckets": 0, "started": None}
+
+# Per-metric emission controls for hot paths:
+# - sample_rate: fraction of datapoints kept; Count values are scaled by
+#   1/sample_rate so sums stay unbiased
+# - dimensions: names of the dimensions kept; others are dropped
+# - max_dimension_values: distinct values kept per dimension per container;
+#   later values are reported as "Other"
+# - max_per_minute: datapoints kept per container per minute; suppressed
+#   Count values are carried into the next datapoint that is kept
+# METRICS_CONTROLS (JSON) can override or extend these per metric.
+DEFAULT_METRIC_CONTROLS = {
+    "QuestionViewed": {
+        "sample_rate": 0.25,
+        "dimensions": ["Category"],
+        "max_dimension_values": 50,
+    },
+    "CacheHit": {"sample_rate": 0.25},
+    "CacheMiss": {"sample_rate": 0.25},
+    "EvaluationByCompetency": {"max_dimension_values": 20},
+    "EvaluationFailure": {"max_dimension_values": 20, "max_per_minute": 60},
+}
+METRIC_CONTROLS = {
+    **DEFAULT_METRIC_CONTROLS,
+    **json.loads(os.environ.get("METRICS_CONTROLS") or "{}"),
+}
+OTHER_DIMENSION_VALUE = "Other"
+
+# Container-lifetime state behind the controls
+control_state = {"dimension_values": {}, "windows": {}, "carry": {}}
+
+
+def apply_controls(
+    metric_name: str,
+    value: float,
+    unit: str,
+    dimensions: Optional[List[Dict[str, str]]],
+):
+    """
+    Apply the metric's sampling, dimension and rate controls.
+
+    Returns:
+        (value, dimensions) to emit, or None when the datapoint is dropped
+    """
+    controls = METRIC_CONTROLS.get(metric_name)
+    if not controls:
+        return value, dimensions
+
+    is_count = unit == "Count"
+    sample_rate = controls.get("sample_rate", 1.0)
+    if sample_rate < 1.0:
+        if random.random() >= sample_rate:
+            return None
+        if is_count:
+            value = value / sample_rate
+
+    if dimensions:
+        allowed = controls.get("dimensions")
+        if allowed is not None:
+            dimensions = [d for d in dimensions if d["Name"] in allowed]
+
+        max_values = controls.get("max_dimension_values")
+        if max_values is not None:
+            limited = []
+            with buffer_lock:
+                for d in dimensions:
+                    seen = control_state["dimension_values"].setdefault(
+                        (metric_name, d["Name"]), set()
+                    )
+                    if d["Value"] not in seen and len(seen) >= max_values:
+                        d = {"Name": d["Name"], "Value": OTHER_DIMENSION_VALUE}
+                    else:
+                        seen.add(d["Value"])
+                    limited.append(d)
+            dimensions = limited
+
+    max_per_minute = controls.get("max_per_minute")
+    if max_per_minute is not None:
+        series = (metric_name, tuple((d["Name"], d["Value"]) for d in dimensions or []))
+        minute = int(time.time() // 60)
+        with buffer_lock:
+            window = control_state["windows"].get(metric_name)
+            if window is None or window[0] != minute:
+                window = control_state["windows"][metric_name] = [minute, 0]
+            if window[1] >= max_per_minute:
+                if is_count:
+                    carry = control_state["carry"]
+                    carry[series] = carry.get(series, 0) + value
+                return None
+            window[1] += 1
+            if is_count:
+                value += control_state["carry"].pop(series, 0)
+
+    return value, dimensions
+
 
 def emit_metric(
     metric_name: str,
@@ -30,6 +162,10 @@ def emit_metric(
     """
     Emit a custom CloudWatch metric.
 
+    Inside buffered_metrics() the datapoint is queued and sent with the rest
+    of the invocation's metrics when the block exits. Metrics listed in
+    METRIC_CONTROLS may be sampled, trimmed or rate-limited first.
+
     Args:
         metric_name: Name of the metric
         value: Metric value
@@ -37,6 +173,11 @@ def emit_metric(
         dimensions: Optional list of dimension dicts [{'Name': 'x', 'Value': 'y'}]
     """
     try:
+        controlled = apply_controls(metric_name, value, unit, dimensions)
+        if controlled is None:
+            return
+        value, dimensions = controlled
+
         metric_data = {
             "MetricName": metric_name,
             "Value": value,
@@ -47,7 +188,15 @@ def emit_metric(
         if dimensions:
             metric_data["Dimensions"] = dimensions
 
-        cloudwatch.put_metric_data(Namespace=NAMESPACE, MetricData=[metric_data])
+        with buffer_lock:
+            if buffer_state["depth"]:
+                buffer_state["datapoints"].append(metric_data)
+                return
+
+        if METRICS_BACKEND == "emf":
+            write_emf([metric_data])
+        else:
+            cloudwatch.put_metric_data(Namespace=NAMESPACE, MetricData=[metric_data])
 
         logger.info(f"Emitted metric: {metric_name}={value} {unit}")
 
@@ -56,6 +205,246 @@ def emit_metric(
         logger.warning(f"Failed to emit metric {metric_name}: {str(e)}")
 
 
+def histogram_bucket(value: float) -> float:
+    """Representative value of the log-scale bucket a sample falls in"""
+    if value <= 0:
+        return 0
+    base = 1 + HISTOGRAM_PRECISION
+    index = math.floor(math.log(value, base))
+    return round(base ** (index + 0.5), 3)
+
+
+def record_distribution(
+    metric_name: str,
+    value: float,
+    unit: str = "Milliseconds",
+    dimensions: Optional[List[Dict[str, str]]] = None,
+) -> None:
+    """
+    Add a sample to the container's histogram for a metric.
+
+    Samples accumulate across warm invocations and are sent as Values/Counts
+    when the histograms are flushed (see flush_metrics), so percentiles come
+    from every sample at a fraction of the datapoints.
+    """
+    key = (
+        metric_name,
+        unit,
+        tuple((d["Name"], d["Value"]) for d in dimensions or []),
+    )
+    bucket = histogram_bucket(value)
+    with buffer_lock:
+        series = histogram_state["series"].setdefault(key, {})
+        if bucket not in series:
+            histogram_state["buckets"] += 1
+        series[bucket] = series.get(bucket, 0) + 1
+        if histogram_state["started"] is None:
+            histogram_state["started"] = time.monotonic()
+        buffering = buffer_state["depth"] > 0
+
+    if not buffering:
+        flush_metrics()
+
+
+def take_histograms(force: bool = False):
+    """
+    Remove the histograms from the aggregator if they are due (or forced).
+
+    Returns:
+        Datapoints carrying a Count per bucket, or [] if nothing is due
+    """
+    with buffer_lock:
+        started = histogram_state["started"]
+        if started is None:
+            return []
+        due = (
+            force
+            or histogram_state["buckets"] >= HISTOGRAM_MAX_BUCKETS
+            or time.monotonic() - started >= HISTOGRAM_FLUSH_SECONDS
+        )
+        if not due:
+            return []
+        series = histogram_state["series"]
+        histogram_state.update(series={}, buckets=0, started=None)
+
+    timestamp = datetime.utcnow()
+    datapoints = []
+    for (metric_name, unit, dimensions), buckets in series.items():
+        for value, count in buckets.items():
+            point = {
+                "MetricName": metric_name,
+                "Value": value,
+                "Count": count,
+                "Unit": unit,
+                "Timestamp": timestamp,
+            }
+            if dimensions:
+                point["Dimensions"] = [
+                    {"Name": name, "Value": dim_value} for name, dim_value in dimensions
+                ]
+            datapoints.append(point)
+    return datapoints
+
+
+def combine_datapoints(datapoints):
+    """
+    Fold datapoints for the same metric, unit and dimensions into datums
+    carrying Values/Counts arrays, so repeats cost one datum between them.
+
+    Returns:
+        List of PutMetricData datums
+    """
+    series = {}
+    for point in datapoints:
+        dimensions = tuple((d["Name"], d["Value"]) for d in point.get("Dimensions", []))
+        key = (point["MetricName"], point["Unit"], dimensions)
+        entry = series.get(key)
+        if entry is None:
+            entry = series[key] = {"point": point, "counts": {}}
+        counts = entry["counts"]
+        counts[point["Value"]] = counts.get(point["Value"], 0) + point.get("Count", 1)
+
+    datums = []
+    for entry in series.values():
+        point = entry["point"]
+        values = list(entry["counts"].items())
+        for start in range(0, len(values), MAX_VALUES_PER_DATUM):
+            end = start + MAX_VALUES_PER_DATUM
+            chunk = values[start:end]
+            datum = {
+                "MetricName": point["MetricName"],
+                "Unit": point["Unit"],
+                "Timestamp": point["Timestamp"],
+                "Values": [value for value, _ in chunk],
+                "Counts": [count for _, count in chunk],
+            }
+            if "Dimensions" in point:
+                datum["Dimensions"] = point["Dimensions"]
+            datums.append(datum)
+    return datums
+
+
+def emf_documents(datapoints):
+    """
+    Build Embedded Metric Format documents for datapoints. Metrics sharing a
+    dimension set go in one document, each with every value it recorded.
+
+    Returns:
+        List of EMF documents (dicts), each within the EMF limits
+    """
+    groups = {}
+    for point in datapoints:
+        dimensions = tuple((d["Name"], d["Value"]) for d in point.get("Dimensions", []))
+        metrics = groups.setdefault(dimensions, {})
+        entry = metrics.setdefault(
+            point["MetricName"], {"unit": point["Unit"], "values": []}
+        )
+        entry["values"].extend([point["Value"]] * point.get("Count", 1))
+
+    timestamp = int(time.time() * 1000)
+    documents = []
+    for dimensions, metrics in groups.items():
+        # Metrics with more than MAX_EMF_VALUES values spill into later rounds
+        rounds = {}
+        for name, entry in metrics.items():
+            values = entry["values"]
+            for number, start in enumerate(range(0, len(values), MAX_EMF_VALUES)):
+                end = start + MAX_EMF_VALUES
+                rounds.setdefault(number, []).append(
+                    (name, entry["unit"], values[start:end])
+                )
+
+        for series in rounds.values():
+            for start in range(0, len(series), MAX_EMF_METRICS):
+                end = start + MAX_EMF_METRICS
+                chunk = series[start:end]
+                document = {
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": NAMESPACE,
+                                "Dimensions": [[name for name, _ in dimensions]],
+                                "Metrics": [
+                                    {"Name": name, "Unit": unit}
+                                    for name, unit, _ in chunk
+                                ],
+                            }
+                        ],
+                    },
+                    **dict(dimensions),
+                }
+                for name, _, values in chunk:
+                    document[name] = values[0] if len(values) == 1 else values
+                documents.append(document)
+    return documents
+
+
+def write_emf(datapoints) -> None:
+    """Write datapoints to stdout as Embedded Metric Format log lines"""
+    for document in emf_documents(datapoints):
+        print(to_json(document), flush=True)
+
+
+def flush_metrics(force_histograms: bool = False) -> int:
+    """
+    Send every buffered datapoint, plus any histograms that are due, in as
+    few PutMetricData calls as the API limits allow (or as EMF log lines
+    with the "emf" backend).
+
+    Args:
+        force_histograms: Flush histograms even if they are not due yet
+
+    Returns:
+        Number of PutMetricData calls made
+    """
+    with buffer_lock:
+        datapoints = buffer_state["datapoints"]
+        buffer_state["datapoints"] = []
+    datapoints += take_histograms(force_histograms)
+
+    if not datapoints:
+        return 0
+
+    if METRICS_BACKEND == "emf":
+        write_emf(datapoints)
+        return 0
+
+    datums = combine_datapoints(datapoints)
+    calls = 0
+    for start in range(0, len(datums), MAX_DATUMS_PER_CALL):
+        end = start + MAX_DATUMS_PER_CALL
+        batch = datums[start:end]
+        try:
+            cloudwatch.put_metric_data(Namespace=NAMESPACE, MetricData=batch)
+            calls += 1
+        except Exception as e:
+            # Don't fail the Lambda if metrics fail
+            logger.warning(f"Failed to flush {len(batch)} metrics: {str(e)}")
+
+    logger.info(f"Flushed {len(datapoints)} datapoints in {calls} calls")
+    return calls
+
+
+@contextmanager
+def buffered_metrics():
+    """
+    Buffer metrics emitted inside the block and flush them when it exits,
+    whether it returns or raises. Nested blocks flush with the outermost.
+    """
+    with buffer_lock:
+        buffer_state["depth"] += 1
+    try:
+        yield
+    finally:
+        with buffer_lock:
+            buffer_state["depth"] -= 1
+            outermost = buffer_state["depth"] == 0
+        if outermost:
+            with request_timing.span("metrics"):
+                flush_metrics()
+
+
 class QuestionsMetrics:
     """Metrics for questions_handler Lambda"""
 
@@ -80,9 +469,26 @@ class QuestionsMetrics:
 
     @staticmethod
     def api_latency(latency_ms: float, operation: str) -> None:
-        """Track API operation latency"""
+        """Track API operation latency (aggregated into a histogram)"""
         dimensions = [{"Name": "Operation", "Value": operation}]
-        emit_metric("APILatency", latency_ms, "Milliseconds", dimensions)
+        record_distribution("APILatency", latency_ms, "Milliseconds", dimensions)
+
+    @staticmethod
+    def questions_imported(count: int) -> None:
+        """Track number of questions created by a bulk import"""
+        emit_metric("QuestionsImported", count, "Count")
+
+    @staticmethod
+    def cache_hit(cache_name: str) -> None:
+        """Track warm-container cache hits"""
+        dimensions = [{"Name": "Cache", "Value": cache_name}]
+        emit_metric("CacheHit", 1, "Count", dimensions)
+
+    @staticmethod
+    def cache_miss(cache_name: str) -> None:
+        """Track warm-container cache misses"""
+        dimensions = [{"Name": "Cache", "Value": cache_name}]
+        emit_metric("CacheMiss", 1, "Count", dimensions)
 
     @staticmethod
     def search_performed(result_count: int) -> None:
@@ -122,10 +528,21 @@ class EvaluationMetrics:
         dimensions = [{"Name": "ErrorType", "Value": error_type}]
         emit_metric("EvaluationFailure", 1, "Count", dimensions)
 
+    @staticmethod
+    def evaluation_cache_hit(tier: str) -> None:
+        """Track evaluations served from the cache, by tier (local/dynamodb)"""
+        dimensions = [{"Name": "Tier", "Value": tier}]
+        emit_metric("EvaluationCacheHit", 1, "Count", dimensions)
+
+    @staticmethod
+    def evaluation_cache_miss() -> None:
+        """Track evaluations that needed a Bedrock call"""
+        emit_metric("EvaluationCacheMiss", 1, "Count")
+
     @staticmethod
     def ai_response_time(duration_ms: float) -> None:
-        """Track Marcus AI response latency"""
-        emit_metric("MarcusResponseTime", duration_ms, "Milliseconds")
+        """Track Marcus AI response latency (aggregated into a histogram)"""
+        record_distribution("MarcusResponseTime", duration_ms, "Milliseconds")
 
     @staticmethod
     def user_engagement(score: int) -> None:
@@ -144,18 +561,86 @@ class EvaluationMetrics:
         emit_metric("UserEngagement", 1, "Count", dimensions)
 
 
+class AwsMetrics:
+    """Metrics for AWS API calls made by any Lambda (see aws_instrumentation)"""
+
+    @staticmethod
+    def api_calls(
+        service: str,
+        operation: str,
+        calls: int,
+        retries: int = 0,
+        throttles: int = 0,
+        errors: int = 0,
+    ) -> None:
+        """Track an invocation's calls to one operation, with failures"""
+        dimensions = [
+            {"Name": "Service", "Value": service},
+            {"Name": "Operation", "Value": operation},
+        ]
+        emit_metric("AWSCalls", calls, "Count", dimensions)
+        if retries:
+            emit_metric("AWSRetries", retries, "Count", dimensions)
+        if throttles:
+            emit_metric("AWSThrottles", throttles, "Count", dimensions)
+        if errors:
+            emit_metric("AWSErrors", errors, "Count", dimensions)
+
+    @staticmethod
+    def api_latency(service: str, operation: str, latency_ms: float) -> None:
+        """Track one call's latency (aggregated into a histogram)"""
+        dimensions = [
+            {"Name": "Service", "Value": service},
+            {"Name": "Operation", "Value": operation},
+        ]
+        record_distribution("AWSCallLatency", latency_ms, "Milliseconds", dimensions)
+
+    @staticmethod
+    def consumed_capacity(table: str, operation: str, units: float) -> None:
+        """Track DynamoDB capacity units consumed by an operation"""
+        dimensions = [
+            {"Name": "TableName", "Value": table},
+            {"Name": "Operation", "Value": operation},
+        ]
+        emit_metric("DynamoDBConsumedCapacity", units, "Count", dimensions)
+
+
 class SystemMetrics:
-    """System-wide metrics"""
+    """System-wide metrics, optionally broken down by Lambda function"""
+
+    @staticmethod
+    def function_dimensions(function_name: Optional[str]) -> List[Dict[str, str]]:
+        """FunctionName dimension, or none when the name is unknown"""
+        if not function_name:
+            return []
+        return [{"Name": "FunctionName", "Value": function_name}]
 
     @staticmethod
-    def cold_start() -> None:
+    def cold_start(function_name: Optional[str] = None) -> None:
         """Track Lambda cold starts"""
-        emit_metric("ColdStart", 1, "Count")
+        dimensions = SystemMetrics.function_dimensions(function_name)
+        emit_metric("ColdStart", 1, "Count", dimensions)
+
+    @staticmethod
+    def init_duration(duration_ms: float, function_name: Optional[str] = None) -> None:
+        """Track total init time of a cold start"""
+        dimensions = SystemMetrics.function_dimensions(function_name)
+        emit_metric("InitDuration", duration_ms, "Milliseconds", dimensions)
+
+    @staticmethod
+    def init_phase_duration(
+        phase: str, duration_ms: float, function_name: Optional[str] = None
+    ) -> None:
+        """Track the time spent in one init phase (imports, clients, ...)"""
+        dimensions = SystemMetrics.function_dimensions(function_name)
+        dimensions.append({"Name": "Phase", "Value": phase})
+        emit_metric("InitPhaseDuration", duration_ms, "Milliseconds", dimensions)
 
     @staticmethod
-    def memory_usage(memory_mb: float) -> None:
-        """Track Lambda memory usage"""
-        emit_metric("MemoryUsage", memory_mb, "Megabytes")
+    def memory_usage(memory_mb: float, function_name: Optional[str] = None) -> None:
+        """Track the peak RSS reached during one Lambda invocation"""
+        dimensions = SystemMetrics.function_dimensions(function_name)
+        emit_metric("MemoryUsage", memory_mb, "Megabytes", dimensions)
 
     @staticmethod
     def concurrent_executions(count: int) -> None:
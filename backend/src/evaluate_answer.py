@@ -1,24 +1,39 @@
+import lambda_telemetry  # first, so init timing covers every other import
 import json
-import boto3
 import time
+import aws_clients
+import evaluation_cache
+import request_timing
+import structured_logging
 from custom_metrics import EvaluationMetrics
+from serialization import to_json
 
-bedrock = boto3.client("bedrock-runtime", region_name="eu-west-2")
+lambda_telemetry.mark_init_phase("imports")
 
+logger = structured_logging.configure()
 
+bedrock = aws_clients.lazy_client("bedrock-runtime", region_name="eu-west-2")
+
+MODEL_ID = "anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+
+@lambda_telemetry.instrument
 def handler(event, context):
     """
     Marcus - AI Interview Coach via direct Bedrock invocation
 
+    Repeated submissions are answered from the evaluation cache (see
+    evaluation_cache) and tagged with "cached": true.
+
     Emits custom metrics:
     - Answer evaluation counts and scores
     - AI response times
     - User engagement tracking
+    - Evaluation cache hits and misses
     """
     try:
-        start_time = time.time()
-
-        body = json.loads(event.get("body", "{}"))
+        with request_timing.span("parse"):
+            body = json.loads(event.get("body", "{}"))
         question_text = body.get("question")
         user_answer = body.get("answer")
         competency_type = body.get("competency_type", "general")
@@ -27,9 +42,26 @@ def handler(event, context):
             return {
                 "statusCode": 400,
                 "headers": {"Access-Control-Allow-Origin": "*"},
-                "body": json.dumps({"error": "Missing question or answer"}),
+                "body": to_json({"error": "Missing question or answer"}),
             }
 
+        with request_timing.span("cache"):
+            cache_key = evaluation_cache.cache_key(
+                question_text, user_answer, competency_type, MODEL_ID
+            )
+            cached, tier = evaluation_cache.lookup(cache_key)
+
+        if cached is not None:
+            EvaluationMetrics.evaluation_cache_hit(tier)
+            EvaluationMetrics.evaluation_success()
+            return {
+                "statusCode": 200,
+                "headers": {"Access-Control-Allow-Origin": "*", "X-Cache": "Hit"},
+                "body": to_json({**cached, "cached": True}),
+            }
+
+        EvaluationMetrics.evaluation_cache_miss()
+
         # Marcus evaluation prompt
         prompt = f"""You are Marcus, an AI interview coach for AWS.
 You evaluate candidate answers for L4 Systems Engineer and
@@ -53,9 +85,10 @@ Respond ONLY with valid JSON in this exact format:
 
 Be constructive, specific, and encouraging."""
 
-        # Call Bedrock Claude 3.7 Sonnet
+        # Call Bedrock Claude 3.7 Sonnet (timed up to the full response body)
+        start_time = time.perf_counter()
         response = bedrock.invoke_model(
-            modelId="anthropic.claude-3-7-sonnet-20250219-v1:0",
+            modelId=MODEL_ID,
             body=json.dumps(
                 {
                     "anthropic_version": "bedrock-2023-05-31",
@@ -65,7 +98,12 @@ Be constructive, specific, and encouraging."""
             ),
         )
 
-        response_body = json.loads(response["body"].read())
+        # The model's output streams in with the body
+        with request_timing.span("bedrock"):
+            raw_body = response["body"].read()
+        response_time_ms = (time.perf_counter() - start_time) * 1000
+
+        response_body = json.loads(raw_body)
         feedback_text = response_body["content"][0]["text"]
 
         # Strip markdown code blocks if present
@@ -77,9 +115,6 @@ Be constructive, specific, and encouraging."""
         # Parse JSON from Marcus
         feedback = json.loads(feedback_text)
 
-        # Calculate AI response time
-        response_time_ms = (time.time() - start_time) * 1000
-
         # Emit custom metrics
         EvaluationMetrics.answer_evaluated(
             score=feedback.get("score", 0),
@@ -90,19 +125,27 @@ Be constructive, specific, and encouraging."""
         EvaluationMetrics.ai_response_time(response_time_ms)
         EvaluationMetrics.user_engagement(feedback.get("score", 0))
 
+        with request_timing.span("cache"):
+            evaluation_cache.store(cache_key, feedback, MODEL_ID)
+
         return {
             "statusCode": 200,
-            "headers": {"Access-Control-Allow-Origin": "*"},
-            "body": json.dumps(feedback),
+            "headers": {"Access-Control-Allow-Origin": "*", "X-Cache": "Miss"},
+            "body": to_json({**feedback, "cached": False}),
         }
 
     except Exception as e:
         # Track evaluation failures
         error_type = type(e).__name__
         EvaluationMetrics.evaluation_failure(error_type)
+        logger.error(
+            f"Evaluation failed: {str(e)}",
+            exc_info=True,
+            extra={"error_type": error_type},
+        )
 
         return {
             "statusCode": 500,
             "headers": {"Access-Control-Allow-Origin": "*"},
-            "body": json.dumps({"error": str(e)}),
+            "body": to_json({"error": str(e)}),
         }
@@ -0,0 +1,116 @@
+"""
+Content-addressed cache of Marcus evaluations.
+
+An evaluation is keyed by a hash of the normalized question, answer,
+competency and model id (plus PROMPT_VERSION), so resubmitting the same
+answer is served without calling Bedrock. Two tiers:
+- an in-container LRU (ttl_cache.TTLCache) for repeats within a warm
+  container, e.g. double clicks and client retries
+- a DynamoDB table (EVALUATION_CACHE_TABLE) with a TTL attribute, shared by
+  every container; disabled when the variable is unset
+
+Cache failures are logged and treated as misses.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+
+import aws_clients
+from ttl_cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_TABLE = os.environ.get("EVALUATION_CACHE_TABLE")
+CACHE_TTL_SECONDS = int(os.environ.get("EVALUATION_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+LOCAL_MAX_ENTRIES = 256
+LOCAL_TTL_SECONDS = 3600
+
+# Bump when the prompt changes so older evaluations stop matching
+PROMPT_VERSION = 1
+
+local_cache = TTLCache(LOCAL_MAX_ENTRIES, LOCAL_TTL_SECONDS)
+dynamodb = aws_clients.lazy_client("dynamodb")
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text):
+    """Fold differences that don't change an evaluation: case, width, spacing"""
+    text = unicodedata.normalize("NFKC", str(text or ""))
+    return WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def cache_key(question, answer, competency, model_id):
+    """SHA-256 hex digest identifying one evaluation request"""
+    material = json.dumps(
+        [
+            PROMPT_VERSION,
+            model_id,
+            normalize(competency),
+            normalize(question),
+            normalize(answer),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def lookup(key):
+    """
+    Find a cached evaluation.
+
+    Returns:
+        (feedback, tier) where tier is "local" or "dynamodb", or (None, None)
+    """
+    feedback = local_cache.get(key)
+    if feedback is not MISSING:
+        return feedback, "local"
+
+    if not CACHE_TABLE:
+        return None, None
+
+    try:
+        response = dynamodb.get_item(
+            TableName=CACHE_TABLE,
+            Key={"key": {"S": key}},
+            ProjectionExpression="feedback, expires_at",
+        )
+    except Exception as e:
+        logger.warning(f"Evaluation cache read failed: {str(e)}")
+        return None, None
+
+    item = response.get("Item")
+    # TTL deletion runs lazily, so expired items can still be returned
+    if not item or int(item["expires_at"]["N"]) <= time.time():
+        return None, None
+
+    feedback = json.loads(item["feedback"]["S"])
+    local_cache.set(key, feedback)
+    return feedback, "dynamodb"
+
+
+def store(key, feedback, model_id):
+    """Cache an evaluation in both tiers"""
+    local_cache.set(key, feedback)
+    if not CACHE_TABLE:
+        return
+
+    now = int(time.time())
+    try:
+        dynamodb.put_item(
+            TableName=CACHE_TABLE,
+            Item={
+                "key": {"S": key},
+                "feedback": {"S": json.dumps(feedback)},
+                "model_id": {"S": model_id},
+                "created_at": {"N": str(now)},
+                "expires_at": {"N": str(now + CACHE_TTL_SECONDS)},
+            },
+        )
+    except Exception as e:
+        logger.warning(f"Evaluation cache write failed: {str(e)}")
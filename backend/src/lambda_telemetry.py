@@ -0,0 +1,204 @@
+"""
+Cold-start and per-invocation telemetry for the Lambda handlers.
+
+Import this module first in a handler module so it can note when init
+began, mark the end of each init phase, and wrap the handler:
+
+    import lambda_telemetry  # noqa: F401 - first, to time the whole init
+    ...imports...
+    lambda_telemetry.mark_init_phase("imports")
+    ...clients and config...
+    lambda_telemetry.mark_init_phase("clients")
+
+    @lambda_telemetry.instrument
+    def handler(event, context): ...
+
+The first invocation in a container reports ColdStart, InitDuration and
+one InitPhaseDuration per phase; every invocation reports the peak RSS
+reached while it ran. All are dimensioned by function name. Each invocation's metrics
+are sent together when it finishes (see custom_metrics.buffered_metrics).
+"""
+
+import time
+
+# Set before anything heavy (boto3 via custom_metrics) is imported, so the
+# first phase includes loading the SDK
+INIT_STARTED = time.perf_counter()
+
+import logging  # noqa: E402
+import os  # noqa: E402
+from functools import wraps  # noqa: E402
+
+import aws_instrumentation  # noqa: E402
+import request_timing  # noqa: E402
+from custom_metrics import AwsMetrics, SystemMetrics, buffered_metrics  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# [(phase, end time)] in the order the phases finished
+init_phases = []
+
+CLEAR_REFS_PATH = "/proc/self/clear_refs"
+STATUS_PATH = "/proc/self/status"
+
+# Whether this container has already served an invocation
+state = {"warm": False}
+
+
+def mark_init_phase(name):
+    """Record that an init phase (everything since the previous mark) ended"""
+    init_phases.append((name, time.perf_counter()))
+
+
+def init_phase_durations():
+    """
+    Milliseconds spent in each marked init phase, in the order first marked.
+    A phase marked more than once (e.g. by a handler module imported by
+    another handler) accumulates.
+    """
+    durations = {}
+    previous = INIT_STARTED
+    for name, ended in init_phases:
+        durations[name] = durations.get(name, 0.0) + (ended - previous) * 1000
+        previous = ended
+    return list(durations.items())
+
+
+def reset_peak_rss():
+    """
+    Reset the kernel's RSS high-water mark (VmHWM) to the current RSS, so the
+    next peak_rss_mb() covers only what ran after this call. ru_maxrss can't
+    be used instead: it is the peak over the container's whole lifetime, so
+    one large request would set MemoryUsage for every later invocation.
+
+    Returns:
+        False where /proc is unavailable (not Linux)
+    """
+    try:
+        with open(CLEAR_REFS_PATH, "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_mb():
+    """Peak resident set size since the last reset_peak_rss(), or None"""
+    try:
+        with open(STATUS_PATH) as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024  # reported in kB
+    except OSError:
+        pass
+    return None
+
+
+def function_name_for(context):
+    """Function name from the invocation context, falling back to the environment"""
+    return getattr(context, "function_name", None) or os.environ.get(
+        "AWS_LAMBDA_FUNCTION_NAME"
+    )
+
+
+def record_cold_start(function_name):
+    """Report init timings; called once, on a container's first invocation"""
+    phases = init_phase_durations()
+    # Init ends at the last mark (the handler being defined), not at the first
+    # invocation, which can come much later with provisioned concurrency
+    init_ms = sum(duration for _, duration in phases)
+
+    SystemMetrics.cold_start(function_name)
+    SystemMetrics.init_duration(init_ms, function_name)
+    for phase, duration in phases:
+        SystemMetrics.init_phase_duration(phase, duration, function_name)
+
+    logger.info(
+        f"Cold start: init {init_ms:.1f} ms",
+        extra={
+            "init_ms": round(init_ms, 1),
+            "init_phases": {phase: round(ms, 1) for phase, ms in phases},
+            "initialization_type": os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE"),
+        },
+    )
+
+
+def report_aws_calls():
+    """Emit and log the AWS calls made during this invocation"""
+    stats = aws_instrumentation.take_stats()
+    for (service, operation), call in stats.items():
+        AwsMetrics.api_calls(
+            service,
+            operation,
+            call["calls"],
+            retries=call["retries"],
+            throttles=call["throttles"],
+            errors=call["errors"],
+        )
+        for duration in call["durations"]:
+            AwsMetrics.api_latency(service, operation, duration)
+        for table, units in call["capacity"].items():
+            AwsMetrics.consumed_capacity(table, operation, units)
+
+    if stats:
+        logger.info(
+            f"AWS calls: {sum(call['calls'] for call in stats.values())}",
+            extra={
+                "aws_calls": {
+                    f"{service}.{operation}": {
+                        "calls": call["calls"],
+                        "ms": round(sum(call["durations"]), 1),
+                        "retries": call["retries"],
+                        "throttles": call["throttles"],
+                        "statuses": call["statuses"],
+                        "capacity": call["capacity"],
+                    }
+                    for (service, operation), call in stats.items()
+                }
+            },
+        )
+
+
+def instrument(handler):
+    """
+    Wrap a Lambda handler to report cold starts and memory per invocation.
+    Metrics emitted during the invocation are buffered and flushed once at
+    the end, even when the handler raises. The request's phase timings are
+    logged and returned as a Server-Timing header.
+    """
+    mark_init_phase("handler")
+
+    @wraps(handler)
+    def wrapper(event, context):
+        function_name = function_name_for(context)
+        timer = request_timing.start()
+        try:
+            with buffered_metrics():
+                if not state["warm"]:
+                    state["warm"] = True
+                    try:
+                        record_cold_start(function_name)
+                    except Exception as e:
+                        logger.warning(f"Failed to record cold start: {str(e)}")
+
+                peak_reset = reset_peak_rss()
+                try:
+                    response = handler(event, context)
+                finally:
+                    peak_mb = peak_rss_mb() if peak_reset else None
+                    if peak_mb is not None:
+                        SystemMetrics.memory_usage(round(peak_mb, 1), function_name)
+                    try:
+                        report_aws_calls()
+                    except Exception as e:
+                        logger.warning(f"Failed to report AWS calls: {str(e)}")
+        finally:
+            request_timing.stop()
+            logger.info(
+                f"Request timing: {timer.server_timing()}",
+                extra={"timings": timer.as_fields()},
+            )
+
+        return request_timing.add_server_timing(response, timer)
+
+    return wrapper
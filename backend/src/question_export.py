@@ -0,0 +1,118 @@
+"""
+Streaming NDJSON export of the question bank to S3.
+
+Items are written as newline-delimited JSON into an S3 multipart upload,
+one part at a time, so peak memory is bounded by the part size plus one
+scan page regardless of how large the bank grows.
+"""
+
+import logging
+
+from serialization import to_json_bytes
+
+logger = logging.getLogger(__name__)
+
+# S3 requires every part except the last to be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class NdjsonMultipartWriter:
+    """Buffers NDJSON lines and uploads them to S3 part by part"""
+
+    def __init__(self, s3_client, bucket, key, part_size=MIN_PART_SIZE):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.buffer = bytearray()
+        self.parts = []
+        self.upload_id = None
+        self.count = 0
+
+    def write(self, item):
+        """Append one item as a JSON line, uploading a part when the buffer fills"""
+        self.buffer += to_json_bytes(item) + b"\n"
+        self.count += 1
+        if len(self.buffer) >= self.part_size:
+            self._upload_part()
+
+    def _upload_part(self):
+        if self.upload_id is None:
+            response = self.s3.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType="application/x-ndjson",
+            )
+            self.upload_id = response["UploadId"]
+
+        part_number = len(self.parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=bytes(self.buffer),
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self.buffer.clear()
+
+    def close(self):
+        """Flush the remaining buffer and finish the object"""
+        if self.upload_id is None:
+            # Small exports never reach a full part; a single PUT is enough
+            self.s3.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=bytes(self.buffer),
+                ContentType="application/x-ndjson",
+            )
+            self.buffer.clear()
+            return
+
+        if self.buffer:
+            self._upload_part()
+
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+    def abort(self):
+        """Discard any uploaded parts so they don't accrue storage charges"""
+        if self.upload_id is None:
+            return
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+        except Exception as e:
+            logger.warning(f"Failed to abort multipart upload: {str(e)}")
+
+
+def export_questions(pages, s3_client, bucket, key, part_size=MIN_PART_SIZE):
+    """
+    Stream pages of questions to s3://bucket/key as NDJSON.
+
+    Args:
+        pages: Iterable of lists of items, e.g. one list per scan page
+        s3_client: boto3 S3 client
+        bucket: Destination bucket
+        key: Destination object key
+        part_size: Multipart part size in bytes
+
+    Returns:
+        Number of items exported
+    """
+    writer = NdjsonMultipartWriter(s3_client, bucket, key, part_size)
+    try:
+        for page in pages:
+            for item in page:
+                writer.write(item)
+        writer.close()
+    except Exception:
+        writer.abort()
+        raise
+
+    return writer.count
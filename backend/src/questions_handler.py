@@ -4,79 +4,2002 @@ Manages CRUD operations for interview questions in DynamoDB.
 
 Endpoints:
 - GET /questions - List all questions
+- GET /questions?limit=&cursor= - List one page of questions
+- GET /questions?category=&difficulty= - List questions via the category GSIs
+- GET /questions/search?q= - Ranked full-text search
+- GET /questions/facets - Question counts per category and difficulty
+- GET /questions/snapshot - Locations of the CDN-served per-category snapshots
+- GET /questions/random?n=&category=&difficulty= - Random sample
 - GET /questions/{id} - Get single question by ID
+- ?fields=a,b|summary|all on either GET picks the attributes returned
+  (listings default to summary fields)
 - POST /questions - Create new question
-- PUT /questions/{id} - Update existing question
-- DELETE /questions/{id} - Delete question
+- POST /questions/batch - Get several questions by ID
+- POST /questions/import - Bulk import from JSON Lines or CSV (admin)
+- GET /questions/export - Stream the bank to S3 as NDJSON (admin)
+- PUT /questions/{id} - Update existing question (409 if "version" is stale)
+- DELETE /questions/{id}?version= - Delete question (409 if version is stale)
 """
 
+import lambda_telemetry  # first, so init timing covers every other import
+
+import base64
+import csv
+import hashlib
+import io
 import json
-import logging
 import os
-import sys
+import random
+import time
 from datetime import datetime, timezone
+from decimal import Decimal
 import uuid
-import boto3
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+import aws_clients
+import request_timing
+import structured_logging
+
+# Import custom metrics
+from custom_metrics import QuestionsMetrics
+from question_export import export_questions
+from search_index import STORED_FIELDS as SEARCH_FIELDS, SearchIndex
+from serialization import json_default, to_json, to_json_bytes
+from snapshot_builder import delete_shards, publish_shard, read_shard
+from ttl_cache import MISSING, TTLCache
+
+lambda_telemetry.mark_init_phase("imports")
+
+# Configure JSON structured logging for CloudWatch
+logger = structured_logging.configure()
+
+# Every request reads the table, so it is set up during init (which runs
+# with a full CPU burst); S3 is only needed for exports and snapshots
+dynamodb = aws_clients.resource("dynamodb")
+table = dynamodb.Table(os.environ["TABLE_NAME"])
+s3 = aws_clients.lazy_client("s3")
+
+lambda_telemetry.mark_init_phase("clients")
+
+# Frontend bucket (served by CloudFront) receiving question snapshots
+SNAPSHOT_BUCKET = os.environ.get("SNAPSHOT_BUCKET")
+
+# Bucket receiving admin NDJSON exports
+EXPORT_BUCKET = os.environ.get("EXPORT_BUCKET")
+EXPORT_URL_EXPIRY_SECONDS = 900
+
+# Reserved item holding the question bank version stamp.
+# It lives in the same table but is never returned as a question.
+META_ITEM_ID = "__meta__"
+# Reserved item holding facet counters in its "counts" map, one
+# [category, difficulty] key per combination, maintained from the stream
+FACETS_ITEM_ID = "__facets__"
+FACET_COUNTS_ATTRIBUTE = "counts"
+# Reserved items "__applied__:<question id>" recording the last stream change
+# applied to the counters for each question, so replayed changes are skipped.
+# They expire once the change can no longer be replayed: stream records are
+# kept for 24 hours.
+APPLIED_ITEM_PREFIX = "__applied__:"
+APPLIED_MARKER_TTL_SECONDS = 2 * 24 * 3600
+# Stream sequence numbers are decimal strings; padded, they compare in order
+SEQUENCE_NUMBER_WIDTH = 64
+# Counters changed per update when reconciling
+FACET_UPDATE_CHUNK_SIZE = 50
+# Reserved item pointing at the current snapshot shard of each category,
+# one "shard:<category>" attribute per category
+SNAPSHOT_ITEM_ID = "__snapshot__"
+SHARD_ATTRIBUTE_PREFIX = "shard:"
+RESERVED_IDS = frozenset({META_ITEM_ID, FACETS_ITEM_ID, SNAPSHOT_ITEM_ID})
+
+# Warm-container read-through cache for question reads
+CACHE_TTL_SECONDS = float(os.environ.get("QUESTIONS_CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.environ.get("QUESTIONS_CACHE_MAX_ENTRIES", "512"))
+# How often a warm container re-reads the version stamp written by admin writes
+VERSION_CHECK_INTERVAL_SECONDS = float(
+    os.environ.get("QUESTIONS_CACHE_VERSION_CHECK_SECONDS", "5")
+)
+
+question_cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+cache_state = {"version": None, "checked_at": 0.0}
+
+# Warm-container search index, rebuilt when the bank version moves on
+search_state = {"index": None, "version": None}
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+SEARCH_MAX_QUERY_LENGTH = 200
+
+# Cached marker for ids known not to exist (negative lookups)
+QUESTION_NOT_FOUND = object()
+
+# Global secondary indexes used for filtered listing
+CATEGORY_INDEX = "category-index"
+CATEGORY_DIFFICULTY_INDEX = "category-difficulty-index"
+# Sparse index over (sample_pool, rand) used for random sampling
+RANDOM_INDEX = "random-index"
+# Indexes that exist on the table. CloudFormation adds at most one GSI per
+# table update, so they are rolled out one deployment at a time and reads
+# must not assume the later ones are there yet. Unset means all of them.
+DEPLOYED_INDEXES = frozenset(
+    os.environ.get(
+        "QUESTION_INDEXES",
+        ",".join((CATEGORY_INDEX, CATEGORY_DIFFICULTY_INDEX, RANDOM_INDEX)),
+    ).split(",")
+)
+
+# Bookkeeping attributes stored on questions but never returned to clients
+INTERNAL_ATTRIBUTES = frozenset({"rand", "sample_pool"})
+
+# GET /questions/random limits
+RANDOM_DEFAULT_SIZE = 5
+RANDOM_MAX_SIZE = 50
+# Draw attempts per requested item before falling back to reading the pool
+RANDOM_ATTEMPTS_PER_ITEM = 3
+
+# Parallel scan settings for full-bank reads. 1 keeps the sequential scan.
+SCAN_SEGMENTS = int(os.environ.get("SCAN_SEGMENTS", "1"))
+SCAN_MAX_WORKERS = int(os.environ.get("SCAN_MAX_WORKERS", "8"))
+
+deserializer = TypeDeserializer()
+
+# Attributes clients may request through ?fields=
+QUESTION_FIELDS = (
+    "id",
+    "question_text",
+    "category",
+    "difficulty",
+    "reference_answer",
+    "created_at",
+)
+# Default projection for listings: what the list views actually render
+SUMMARY_FIELDS = ("id", "question_text", "category", "difficulty")
+# Fields published in snapshot shards. Shards are readable by anyone holding
+# a shard URL and CDN copies cannot be revoked, so reference answers are
+# left out; they are only served by the authenticated API.
+SNAPSHOT_FIELDS = tuple(
+    field for field in QUESTION_FIELDS if field != "reference_answer"
+)
+
+# POST /questions/batch limits. BatchGetItem itself takes 100 keys per call.
+BATCH_GET_MAX_IDS = int(os.environ.get("BATCH_GET_MAX_IDS", "300"))
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_MAX_ATTEMPTS = 5
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+
+# BatchWriteItem takes at most 25 put requests per call
+BATCH_WRITE_CHUNK_SIZE = 25
+
+# Fields PUT /questions/{id} may change
+UPDATABLE_FIELDS = ("question_text", "category", "difficulty", "reference_answer")
+
+# Fields every question must have (POST /questions and bulk import)
+REQUIRED_FIELDS = ["question_text", "category", "difficulty"]
+
+# Pagination settings for GET /questions?limit=&cursor=
+DEFAULT_PAGE_SIZE = int(os.environ.get("QUESTIONS_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.environ.get("QUESTIONS_MAX_PAGE_SIZE", "200"))
+# Keep pages well below the 6 MB synchronous Lambda response limit
+MAX_PAGE_BYTES = 4 * 1024 * 1024
+# Stop filling a page when the invocation has less than this left to run
+PAGE_TIME_RESERVE_MS = 3000
+
+
+def convert_dynamodb_item(item):
+    """
+    Drop internal attributes from a DynamoDB item.
+
+    DynamoDB types (Decimal numbers, sets) are left as they are and
+    converted once when the response is serialized.
+    """
+    return {k: v for k, v in item.items() if k not in INTERNAL_ATTRIBUTES}
+
+
+def is_reserved_id(item_id):
+    """True for the ids of bookkeeping items, which are never questions"""
+    return item_id in RESERVED_IDS or (
+        isinstance(item_id, str) and item_id.startswith(APPLIED_ITEM_PREFIX)
+    )
+
+
+def is_question_item(item):
+    """Return False for reserved bookkeeping items such as the version stamp"""
+    return not is_reserved_id(item.get("id"))
+
+
+def get_bank_version():
+    """
+    Read the question bank version stamp bumped by every admin write.
+    """
+    response = table.get_item(
+        Key={"id": META_ITEM_ID},
+        ProjectionExpression="#version",
+        ExpressionAttributeNames={"#version": "version"},
+    )
+    item = response.get("Item")
+    if not isinstance(item, dict):
+        return 0
+    return int(item.get("version", 0))
+
+
+def refresh_cache_version():
+    """
+    Drop cached entries when another container has bumped the bank version.
+    The version stamp is re-read at most every VERSION_CHECK_INTERVAL_SECONDS.
+    """
+    now = time.monotonic()
+    if now - cache_state["checked_at"] < VERSION_CHECK_INTERVAL_SECONDS:
+        return
+    cache_state["checked_at"] = now
+
+    try:
+        version = get_bank_version()
+    except Exception as e:
+        logger.warning(f"Failed to read question bank version: {str(e)}")
+        return
+
+    if version != cache_state["version"]:
+        question_cache.clear()
+        cache_state["version"] = version
+
+
+def bump_bank_version():
+    """
+    Invalidate cached questions in this container and, through the version
+    stamp, in every other warm container.
+
+    Returns:
+        The new version, or None if the stamp could not be updated
+    """
+    question_cache.clear()
+
+    try:
+        response = table.update_item(
+            Key={"id": META_ITEM_ID},
+            UpdateExpression="ADD #version :one",
+            ExpressionAttributeNames={"#version": "version"},
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        cache_state["version"] = int(response["Attributes"]["version"])
+        cache_state["checked_at"] = time.monotonic()
+        return cache_state["version"]
+    except Exception as e:
+        # Other containers fall back to the cache TTL
+        logger.warning(f"Failed to bump question bank version: {str(e)}")
+        return None
+
+
+def pool_key(category, difficulty):
+    """Key shared by a category/difficulty combination's facet counter and
+    random-index partition"""
+    return json.dumps([category, difficulty])
+
+
+def facet_deltas(old_items=(), new_items=()):
+    """Counter changes for replacing old_items with new_items"""
+    deltas = Counter()
+    for item in old_items:
+        deltas[(item.get("category"), item.get("difficulty"))] -= 1
+    for item in new_items:
+        deltas[(item.get("category"), item.get("difficulty"))] += 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def counter_updates(deltas):
+    """
+    SET actions moving the facets item's counters by deltas.
+
+    Returns:
+        (actions, names, values) for an update expression
+    """
+    names = {"#counts": FACET_COUNTS_ATTRIBUTE}
+    values = {":zero": 0}
+    actions = []
+    for i, (key, delta) in enumerate(deltas.items()):
+        names[f"#f{i}"] = pool_key(*key)
+        values[f":d{i}"] = delta
+        actions.append(f"#counts.#f{i} = if_not_exists(#counts.#f{i}, :zero) + :d{i}")
+    return actions, names, values
+
+
+def is_transaction_condition_failure(error):
+    """True for a transaction cancelled only by failed ConditionExpressions"""
+    if error.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+        return False
+    codes = {
+        reason.get("Code") for reason in error.response.get("CancellationReasons", [])
+    }
+    return "ConditionalCheckFailed" in codes and codes <= {
+        "ConditionalCheckFailed",
+        "None",
+    }
+
+
+def adjust_facets(deltas, question_id, sequence_number):
+    """
+    Apply one stream change's counter deltas to the facets item, once.
+
+    The counters move in the same transaction as a write to the question's
+    applied marker, which only goes through if this change's sequence number
+    is newer than the one recorded, so a replayed change (a retried or
+    bisected batch) is a no-op. The markers are separate items so the facets
+    item stays the same size however many questions there are.
+
+    Counters are only adjusted once the item exists; until then the next
+    GET /questions/facets backfills it from a scan, which already includes
+    this write.
+
+    Returns:
+        False if the change was skipped
+    """
+    if not deltas:
+        return False
+
+    sequence = str(sequence_number).zfill(SEQUENCE_NUMBER_WIDTH)
+    actions, names, values = counter_updates(deltas)
+
+    try:
+        table.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": table.name,
+                        "Item": {
+                            "id": APPLIED_ITEM_PREFIX + question_id,
+                            "sequence_number": sequence,
+                            "expires_at": int(time.time()) + APPLIED_MARKER_TTL_SECONDS,
+                        },
+                        "ConditionExpression": (
+                            "attribute_not_exists(#id) OR #sequence < :sequence"
+                        ),
+                        "ExpressionAttributeNames": {
+                            "#id": "id",
+                            "#sequence": "sequence_number",
+                        },
+                        "ExpressionAttributeValues": {":sequence": sequence},
+                    }
+                },
+                {
+                    "Update": {
+                        "TableName": table.name,
+                        "Key": {"id": FACETS_ITEM_ID},
+                        "UpdateExpression": "SET " + ", ".join(actions),
+                        "ConditionExpression": "attribute_exists(#counts)",
+                        "ExpressionAttributeNames": names,
+                        "ExpressionAttributeValues": values,
+                    }
+                },
+            ]
+        )
+    except ClientError as e:
+        if is_transaction_condition_failure(e):
+            return False
+        raise
+    return True
+
+
+def parse_facet_counts(item):
+    """{(category, difficulty): count} from the facets item's counters"""
+    return {
+        tuple(json.loads(key)): int(count)
+        for key, count in item.get(FACET_COUNTS_ATTRIBUTE, {}).items()
+    }
+
+
+def get_facets_item(consistent=False):
+    """The facets item, projected to its counters, or None"""
+    response = table.get_item(
+        Key={"id": FACETS_ITEM_ID},
+        ProjectionExpression="#counts",
+        ExpressionAttributeNames={"#counts": FACET_COUNTS_ATTRIBUTE},
+        ConsistentRead=consistent,
+    )
+    item = response.get("Item")
+    # Also None for an item still in the old one-attribute-per-counter
+    # layout, which the backfill replaces
+    if not isinstance(item, dict) or FACET_COUNTS_ATTRIBUTE not in item:
+        return None
+    return item
+
+
+def backfill_facets(counts):
+    """
+    Create the facets item from counts, unless another writer already has.
+    """
+    try:
+        table.put_item(
+            Item={
+                "id": FACETS_ITEM_ID,
+                FACET_COUNTS_ATTRIBUTE: {
+                    pool_key(category, difficulty): count
+                    for (category, difficulty), count in counts.items()
+                },
+            },
+            ConditionExpression="attribute_not_exists(#counts)",
+            ExpressionAttributeNames={"#counts": FACET_COUNTS_ATTRIBUTE},
+        )
+    except Exception as e:
+        # Another container backfilled first; its counters win
+        logger.warning(f"Failed to backfill facet counts: {str(e)}")
+
+
+def reconcile_facets():
+    """
+    Correct the facet counters against a fresh count of the table, creating
+    the facets item if it doesn't exist yet.
+
+    Stream updates are replay-safe, but counters can still drift, e.g. when
+    the facets item is backfilled while writes are in flight. The drift is
+    applied as a delta, so stream updates landing meanwhile are kept.
+
+    Returns:
+        {(category, difficulty): drift} of the counters corrected
+    """
+    item = get_facets_item(consistent=True)
+    questions = fetch_all_questions(**build_projection_kwargs(SUMMARY_FIELDS))
+    expected = facet_deltas(new_items=questions)
+
+    if item is None:
+        backfill_facets(expected)
+        return {}
+
+    current = parse_facet_counts(item)
+    drift = {
+        key: expected.get(key, 0) - current.get(key, 0)
+        for key in set(expected) | set(current)
+        if expected.get(key, 0) != current.get(key, 0)
+    }
+
+    drift_items = list(drift.items())
+    for start in range(0, len(drift_items), FACET_UPDATE_CHUNK_SIZE):
+        end = start + FACET_UPDATE_CHUNK_SIZE
+        chunk = dict(drift_items[start:end])
+        actions, names, values = counter_updates(chunk)
+        table.update_item(
+            Key={"id": FACETS_ITEM_ID},
+            UpdateExpression="SET " + ", ".join(actions),
+            ConditionExpression="attribute_exists(#counts)",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+
+    if drift:
+        corrections = {pool_key(*key): delta for key, delta in drift_items}
+        logger.warning(f"Corrected facet counter drift: {corrections}")
+    return drift
+
+
+def load_facets():
+    """
+    Read facet counters with a single get_item, backfilling the facets item
+    from a projected scan the first time.
+
+    Returns:
+        {(category, difficulty): count} for every non-empty combination
+    """
+    item = get_facets_item()
+    if item is not None:
+        return {
+            key: count for key, count in parse_facet_counts(item).items() if count > 0
+        }
+
+    questions = fetch_all_questions(**build_projection_kwargs(SUMMARY_FIELDS))
+    counts = facet_deltas(new_items=questions)
+    backfill_facets(counts)
+    return counts
+
+
+def load_snapshot_pointers():
+    """Current shard pointer per category, from the snapshot item"""
+    response = table.get_item(Key={"id": SNAPSHOT_ITEM_ID}, ConsistentRead=True)
+    item = response.get("Item")
+    if not isinstance(item, dict):
+        return None
+    return {
+        name.removeprefix(SHARD_ATTRIBUTE_PREFIX): pointer
+        for name, pointer in item.items()
+        if name.startswith(SHARD_ATTRIBUTE_PREFIX)
+    }
+
+
+def publish_categories(questions_by_category, previous_pointers):
+    """
+    Upload shards for the given categories and repoint the snapshot item.
+
+    Each category is its own attribute, so concurrent rebuilds of different
+    categories never overwrite each other. Empty categories are removed.
+    The update only goes through if every category still points at its
+    shard in previous_pointers; otherwise the ConditionalCheckFailed error
+    propagates and the caller must start again from fresh pointers.
+    """
+    names = {}
+    values = {}
+    set_actions = []
+    remove_actions = []
+    conditions = []
+    superseded = []
+
+    for i, (category, items) in enumerate(sorted(questions_by_category.items())):
+        names[f"#s{i}"] = SHARD_ATTRIBUTE_PREFIX + category
+        previous = previous_pointers.get(category)
+        if previous:
+            names["#key"] = "key"
+            values[f":p{i}"] = previous["key"]
+            conditions.append(f"#s{i}.#key = :p{i}")
+        else:
+            conditions.append(f"attribute_not_exists(#s{i})")
+        if items:
+            pointer = publish_shard(s3, SNAPSHOT_BUCKET, category, items)
+            values[f":s{i}"] = pointer
+            set_actions.append(f"#s{i} = :s{i}")
+        else:
+            pointer = None
+            remove_actions.append(f"#s{i}")
+        if previous and (pointer is None or previous["key"] != pointer["key"]):
+            superseded.append(previous["key"])
+
+    if not conditions:
+        return
+
+    update_expression = ""
+    if set_actions:
+        update_expression += "SET " + ", ".join(set_actions)
+    if remove_actions:
+        update_expression += " REMOVE " + ", ".join(remove_actions)
+
+    update_kwargs = {"ExpressionAttributeValues": values} if values else {}
+    table.update_item(
+        Key={"id": SNAPSHOT_ITEM_ID},
+        UpdateExpression=update_expression.strip(),
+        ConditionExpression=" AND ".join(conditions),
+        ExpressionAttributeNames=names,
+        **update_kwargs,
+    )
+
+    # Clients holding the previous pointers fall back to the API on a miss
+    delete_shards(s3, SNAPSHOT_BUCKET, superseded)
+
+
+def rebuild_snapshot():
+    """
+    Publish a shard for every category from one strongly consistent full
+    scan. Losing a race with a concurrent publish leaves its pointers.
+    """
+    questions = fetch_all_questions(
+        ConsistentRead=True, **build_projection_kwargs(SNAPSHOT_FIELDS)
+    )
+    by_category = {}
+    for item in questions:
+        if item.get("category"):
+            by_category.setdefault(item["category"], []).append(item)
+
+    previous = load_snapshot_pointers() or {}
+    for category in previous:
+        by_category.setdefault(category, [])
+    try:
+        publish_categories(by_category, previous)
+    except ClientError as e:
+        if not is_condition_failure(e):
+            raise
+
+
+def shard_item(image):
+    """A question as stored in a snapshot shard, from a full item image"""
+    return convert_dynamodb_item(
+        {field: image[field] for field in SNAPSHOT_FIELDS if field in image}
+    )
+
+
+def apply_snapshot_changes(changes):
+    """
+    Patch the shards of every category touched by stream changes.
+
+    Each shard is read back from S3 and edited with the changes' own
+    images in stream order, so it never depends on an index that may not
+    have caught up with the change yet. Failures propagate so the stream
+    batch is retried; replaying a change leaves a shard as it was.
+    """
+    if not SNAPSHOT_BUCKET:
+        return
+
+    categories = {
+        image.get("category")
+        for change in changes
+        for image in (change["old"], change["new"])
+        if image and image.get("category")
+    }
+    if not categories:
+        return
+
+    previous = load_snapshot_pointers()
+    if previous is None:
+        # First publish; the scan already includes these changes
+        rebuild_snapshot()
+        return
+
+    shards = {}
+    for category in categories:
+        pointer = previous.get(category)
+        items = read_shard(s3, SNAPSHOT_BUCKET, pointer["key"]) if pointer else []
+        shards[category] = {item["id"]: shard_item(item) for item in items}
+
+    for change in changes:
+        if change["old"] and change["old"].get("category") in shards:
+            shards[change["old"]["category"]].pop(change["id"], None)
+        if change["new"] and change["new"].get("category") in shards:
+            shards[change["new"]["category"]][change["id"]] = shard_item(change["new"])
+
+    publish_categories(
+        {category: list(items.values()) for category, items in shards.items()},
+        previous,
+    )
+
+
+def record_write(changed_items=(), removed_ids=()):
+    """
+    Bump the bank version after an admin write and apply the change to this
+    container's search index. Facet counts, random-index pools and snapshots
+    are derived asynchronously from the table stream (see stream_processor).
+
+    The index is only patched in place when it was current right before
+    this write; if another container wrote in between it is dropped and
+    rebuilt on the next search.
+    """
+    previous_version = cache_state["version"]
+    new_version = bump_bank_version()
+
+    index = search_state["index"]
+    if index is None:
+        return
+
+    in_step = (
+        new_version is not None
+        and previous_version is not None
+        and search_state["version"] == previous_version
+        and new_version == previous_version + 1
+    )
+    if not in_step:
+        search_state.update(index=None, version=None)
+        return
+
+    for item in changed_items:
+        index.add(item)
+    for question_id in removed_ids:
+        index.remove(question_id)
+    search_state["version"] = new_version
+
+
+def reset_caches():
+    """Clear all warm-container state (used by tests)"""
+    question_cache.clear()
+    cache_state.update(version=None, checked_at=0.0)
+    search_state.update(index=None, version=None)
+
+
+def read_through(cache_key, cache_name, loader):
+    """
+    Return the cached value for cache_key, calling loader() on a miss.
+    Hits and misses are emitted per cache name.
+    """
+    value = question_cache.get(cache_key)
+    if value is not MISSING:
+        QuestionsMetrics.cache_hit(cache_name)
+        return value
+
+    QuestionsMetrics.cache_miss(cache_name)
+    value = loader()
+    question_cache.set(cache_key, value)
+    return value
+
+
+def build_payload(data, **meta):
+    """
+    Serialize a response body once and compute its strong ETag.
+
+    The payload is what gets cached, so warm hits (and 304s) skip both the
+    DynamoDB read and JSON encoding; the ETag is hashed from the same
+    encoded bytes. Extra keyword arguments are kept alongside for metrics
+    and logging.
+    """
+    encoded = to_json_bytes(data)
+    etag = '"' + hashlib.sha256(encoded).hexdigest()[:32] + '"'
+    return {"body": encoded.decode("utf-8"), "etag": etag, **meta}
+
+
+def get_header(event, name):
+    """Case-insensitive request header lookup"""
+    headers = event.get("headers") or {}
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def etag_matches(event, etag):
+    """
+    Check the request's If-None-Match header against an ETag.
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+    """
+    if_none_match = get_header(event, "If-None-Match")
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def conditional_response(event, payload):
+    """
+    Return 200 with the cached body, or 304 with no body when the client
+    already holds the current representation.
+    """
+    headers = {
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Expose-Headers": "ETag",
+        "Cache-Control": "private, no-cache",
+        "ETag": payload["etag"],
+    }
+
+    if etag_matches(event, payload["etag"]):
+        return {"statusCode": 304, "headers": headers, "body": ""}
+
+    return {"statusCode": 200, "headers": headers, "body": payload["body"]}
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter for retrying unprocessed batches"""
+    return random.uniform(0, BATCH_BACKOFF_BASE_SECONDS * (2**attempt))
+
+
+def batch_get_questions(question_ids, fields=None):
+    """
+    Fetch questions by id with BatchGetItem, 100 keys per call.
+    UnprocessedKeys are retried with exponential backoff.
+
+    Returns:
+        Tuple of (dict of id -> item, list of ids still unprocessed)
+    """
+    found = {}
+    unprocessed = []
+
+    for start in range(0, len(question_ids), BATCH_GET_CHUNK_SIZE):
+        end = start + BATCH_GET_CHUNK_SIZE
+        chunk = question_ids[start:end]
+        request = {
+            table.name: {
+                "Keys": [{"id": question_id} for question_id in chunk],
+                **build_projection_kwargs(fields),
+            }
+        }
+
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(backoff_delay(attempt))
+
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(table.name, []):
+                found[item["id"]] = convert_dynamodb_item(item)
+
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                break
+
+        for keys_and_attributes in request.values():
+            unprocessed.extend(key["id"] for key in keys_and_attributes["Keys"])
+
+    return found, unprocessed
+
+
+def handle_batch_get(event, log_extra, start_time):
+    """
+    POST /questions/batch - fetch several questions in one request.
+
+    Body: {"ids": [...], "fields": "a,b" (optional)}
+    Items come back in request order; unknown ids are listed under "missing".
+    """
+    with request_timing.span("parse"):
+        body = json.loads(event.get("body") or "{}")
+    question_ids = body.get("ids") if isinstance(body, dict) else None
+
+    error = None
+    if not isinstance(body, dict):
+        error = "Body must be a JSON object"
+    elif not isinstance(question_ids, list) or not question_ids:
+        error = "ids must be a non-empty list"
+    elif len(question_ids) > BATCH_GET_MAX_IDS:
+        error = f"At most {BATCH_GET_MAX_IDS} ids per request"
+    elif not all(isinstance(qid, str) and qid for qid in question_ids):
+        error = "ids must be non-empty strings"
+
+    if error is None:
+        try:
+            fields = parse_fields(body)
+        except ValueError as e:
+            error = str(e)
+
+    if error:
+        return {
+            "statusCode": 400,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": error}),
+        }
+
+    # Deduplicate while keeping request order
+    unique_ids = list(dict.fromkeys(question_ids))
+    lookup_ids = [qid for qid in unique_ids if not is_reserved_id(qid)]
+
+    found, unprocessed = batch_get_questions(lookup_ids, fields)
+
+    items = [found[qid] for qid in unique_ids if qid in found]
+    missing = [qid for qid in unique_ids if qid not in found and qid not in unprocessed]
+
+    QuestionsMetrics.questions_retrieved(len(items))
+    latency_ms = (time.time() - start_time) * 1000
+    QuestionsMetrics.api_latency(latency_ms, "BatchGetQuestions")
+
+    logger.info(
+        "Batch fetched questions",
+        extra={**log_extra, "question_count": len(items)},
+    )
+
+    return {
+        "statusCode": 200,
+        "headers": {"Access-Control-Allow-Origin": "*"},
+        "body": to_json(
+            {"items": items, "missing": missing, "unprocessed": unprocessed}
+        ),
+    }
+
+
+def validate_question_fields(body):
+    """
+    Check a new question for required fields.
+
+    Returns:
+        Error message, or None when the question is valid
+    """
+    if not isinstance(body, dict):
+        return "Question must be a JSON object"
+
+    for field in REQUIRED_FIELDS:
+        value = body.get(field)
+        if value is None or value == "":
+            return f"Missing required field: {field}"
+        # category and difficulty are index keys, which must be strings
+        if not isinstance(value, str) or not value.strip():
+            return f"{field} must be a non-empty string"
+
+    return None
+
+
+def validate_updated_fields(body, fields):
+    """
+    Check the fields a PUT changes.
+
+    Returns:
+        Error message, or None when the update is valid
+    """
+    if not fields:
+        return "No fields to update"
+
+    for field in fields:
+        value = body[field]
+        # Required fields can't be cleared; category and difficulty are
+        # index keys, which must be strings
+        if field in REQUIRED_FIELDS and (
+            not isinstance(value, str) or not value.strip()
+        ):
+            return f"{field} must be a non-empty string"
+
+    return None
+
+
+def normalize_difficulty(difficulty):
+    """
+    Canonical spelling of a difficulty ("medium" -> "Medium"). Difficulty is
+    an index key matched exactly, so every write and filter goes through
+    this. Non-string values are returned as they are.
+    """
+    if not isinstance(difficulty, str):
+        return difficulty
+    return difficulty.strip().capitalize()
+
+
+def build_question_item(body):
+    """Build a new DynamoDB question item from validated input"""
+    difficulty = normalize_difficulty(body["difficulty"])
+    return {
+        "id": str(uuid.uuid4()),
+        "question_text": body["question_text"],
+        "category": body["category"],
+        "difficulty": difficulty,
+        "reference_answer": body.get("reference_answer") or "",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "version": 1,
+        **sample_key(body["category"], difficulty),
+    }
+
+
+def parse_expected_version(raw):
+    """
+    Parse the optional version a client last read, for optimistic concurrency.
+
+    Raises:
+        ValueError: If the version is not a non-negative integer
+    """
+    if raw in (None, ""):
+        return None
+    try:
+        version = int(raw)
+    except (TypeError, ValueError):
+        version = -1
+    if version < 0:
+        raise ValueError("version must be a non-negative integer")
+    return version
+
+
+def version_condition(expected_version, names, values):
+    """
+    ConditionExpression requiring the question to exist and, when the
+    client sent one, to still be at the version it read. Questions written
+    before versioning have no version attribute and count as version 0.
+    """
+    names["#id"] = "id"
+    condition = "attribute_exists(#id)"
+    if expected_version is None:
+        return condition
+
+    names["#version"] = "version"
+    values[":expected_version"] = expected_version
+    if expected_version == 0:
+        return (
+            condition
+            + " AND (attribute_not_exists(#version) OR #version = :expected_version)"
+        )
+    return condition + " AND #version = :expected_version"
+
+
+def is_condition_failure(error):
+    """True for a ClientError raised by a failed ConditionExpression"""
+    return error.response.get("Error", {}).get("Code") == (
+        "ConditionalCheckFailedException"
+    )
+
+
+def condition_failure_response(error, question_id, log_extra):
+    """
+    Map a failed conditional write to 404 (no such question) or 409 (it
+    changed since the client read it), using the item DynamoDB returned
+    with the failure.
+    """
+    current = error.response.get("Item")
+    if not current:
+        return {
+            "statusCode": 404,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": "Question not found"}),
+        }
+
+    current = {key: deserializer.deserialize(value) for key, value in current.items()}
+    current_version = int(current.get("version", 0))
+
+    logger.warning(
+        "Version conflict",
+        extra={**log_extra, "question_id": question_id},
+    )
+    return {
+        "statusCode": 409,
+        "headers": {"Access-Control-Allow-Origin": "*"},
+        "body": to_json(
+            {
+                "error": "Question was changed by someone else; reload and retry",
+                "version": current_version,
+            }
+        ),
+    }
+
+
+def move_to_pool(question_id, item):
+    """
+    Point a question at the random-index pool for its current category and
+    difficulty. Skipped if a newer write has already replaced this version.
+    """
+    key = sample_key(item.get("category"), item.get("difficulty"))
+    values = {":sample_pool": key["sample_pool"], ":rand": key["rand"]}
+    if "version" in item:
+        condition = "#version = :version"
+        values[":version"] = item["version"]
+    else:
+        condition = "attribute_exists(#id) AND attribute_not_exists(#version)"
+    try:
+        table.update_item(
+            Key={"id": question_id},
+            UpdateExpression=(
+                "SET #sample_pool = :sample_pool, #rand = if_not_exists(#rand, :rand)"
+            ),
+            ConditionExpression=condition,
+            ExpressionAttributeNames={
+                "#id": "id",
+                "#sample_pool": "sample_pool",
+                "#rand": "rand",
+                "#version": "version",
+            },
+            ExpressionAttributeValues=values,
+        )
+    except ClientError as e:
+        if not is_condition_failure(e):
+            raise
+
+
+def sample_key(category, difficulty):
+    """Attributes placing a question at a random point of its random-index pool"""
+    return {
+        "sample_pool": pool_key(category, difficulty),
+        "rand": Decimal(str(random.random())),
+    }
+
+
+def iter_import_rows(text, import_format):
+    """
+    Lazily parse an import file, one row at a time.
+
+    Yields:
+        Tuple of (row number, parsed row or None, parse error or None)
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for row_number, row in enumerate(reader, start=1):
+            yield row_number, row, None
+        return
+
+    row_number = 0
+    for line in io.StringIO(text):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            yield row_number, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"Invalid JSON: {e.msg}"
+
+
+def batch_write_questions(items):
+    """
+    Write up to BATCH_WRITE_CHUNK_SIZE items with BatchWriteItem.
+    UnprocessedItems are retried with exponential backoff.
+
+    Returns:
+        Set of ids that still could not be written
+    """
+    request = {table.name: [{"PutRequest": {"Item": item}} for item in items]}
+
+    for attempt in range(BATCH_MAX_ATTEMPTS):
+        if attempt:
+            time.sleep(backoff_delay(attempt))
+
+        response = dynamodb.batch_write_item(RequestItems=request)
+        request = response.get("UnprocessedItems") or {}
+        if not request:
+            return set()
+
+    return {
+        write_request["PutRequest"]["Item"]["id"]
+        for write_requests in request.values()
+        for write_request in write_requests
+    }
+
+
+def get_import_format(event):
+    """Pick csv or jsonl from ?format= or the Content-Type header"""
+    params = event.get("queryStringParameters") or {}
+    if params.get("format") in ("csv", "jsonl"):
+        return params["format"]
+
+    content_type = (get_header(event, "Content-Type") or "").lower()
+    return "csv" if "csv" in content_type else "jsonl"
+
+
+def handle_import(event, log_extra, start_time):
+    """
+    POST /questions/import - admin bulk import from JSON Lines or CSV.
+
+    Rows are validated as they are parsed and written through
+    BatchWriteItem in chunks of 25, so only one chunk of items is held at
+    a time. Returns a result per row.
+    """
+    text = event.get("body") or ""
+    if event.get("isBase64Encoded"):
+        text = base64.b64decode(text).decode("utf-8")
+
+    import_format = get_import_format(event)
+
+    results = []
+    pending = []
+    created_items = []
+
+    def flush():
+        try:
+            failed_ids = batch_write_questions([item for _, item in pending])
+            write_error = "Write failed"
+        except ClientError as e:
+            # DynamoDB rejects the whole chunk; earlier chunks stay written
+            logger.warning(
+                f"Import chunk failed: {str(e)}",
+                extra={**log_extra, "error_type": type(e).__name__},
+            )
+            failed_ids = {item["id"] for _, item in pending}
+            write_error = f"Write failed: {e.response['Error'].get('Code')}"
+        for row_number, item in pending:
+            if item["id"] in failed_ids:
+                results.append(
+                    {"row": row_number, "status": "error", "error": write_error}
+                )
+            else:
+                created_items.append(item)
+                results.append(
+                    {"row": row_number, "status": "created", "id": item["id"]}
+                )
+        pending.clear()
+
+    for row_number, row, parse_error in iter_import_rows(text, import_format):
+        error = parse_error or validate_question_fields(row)
+        if error:
+            results.append({"row": row_number, "status": "error", "error": error})
+            continue
+
+        pending.append((row_number, build_question_item(row)))
+        if len(pending) == BATCH_WRITE_CHUNK_SIZE:
+            flush()
+
+    if pending:
+        flush()
+
+    created = len(created_items)
+    if created:
+        record_write(changed_items=created_items)
+
+    failed = len(results) - created
+    QuestionsMetrics.questions_imported(created)
+    latency_ms = (time.time() - start_time) * 1000
+    QuestionsMetrics.api_latency(latency_ms, "ImportQuestions")
+
+    logger.info(
+        "Imported questions",
+        extra={**log_extra, "question_count": created},
+    )
+
+    # Chunks finish in order, but validation errors are recorded immediately
+    results.sort(key=lambda result: result["row"])
+
+    return {
+        "statusCode": 200,
+        "headers": {"Access-Control-Allow-Origin": "*"},
+        "body": to_json({"created": created, "failed": failed, "results": results}),
+    }
+
+
+def handle_facets(event, log_extra, start_time):
+    """
+    GET /questions/facets - counts per category and per difficulty, for
+    rendering filters before any questions have loaded.
+    """
+
+    def load():
+        counts = Counter()
+        for (category, difficulty), count in load_facets().items():
+            # Difficulties stored before writes normalized them count under
+            # the canonical spelling
+            counts[(category, normalize_difficulty(difficulty))] += count
+        categories = Counter()
+        difficulties = Counter()
+        for (category, difficulty), count in counts.items():
+            categories[category] += count
+            difficulties[difficulty] += count
+
+        return build_payload(
+            {
+                "categories": dict(sorted(categories.items())),
+                "difficulties": dict(sorted(difficulties.items())),
+                "combinations": [
+                    {"category": category, "difficulty": difficulty, "count": count}
+                    for (category, difficulty), count in sorted(counts.items())
+                ],
+                "total": sum(counts.values()),
+            }
+        )
+
+    # Counters are maintained from the stream, after the version bump that
+    # clears the cache, so they are read fresh; 304s still skip the body
+    payload = load()
+
+    latency_ms = (time.time() - start_time) * 1000
+    QuestionsMetrics.api_latency(latency_ms, "GetFacets")
+
+    logger.info("Retrieved facet counts", extra=log_extra)
+
+    return conditional_response(event, payload)
+
+
+def parse_sample_size(params):
+    """
+    Read and validate ?n= for GET /questions/random.
+
+    Raises:
+        ValueError: If n is not an integer within range
+    """
+    raw = params.get("n")
+    if raw in (None, ""):
+        return RANDOM_DEFAULT_SIZE
+
+    try:
+        size = int(raw)
+    except (TypeError, ValueError):
+        size = 0
+    if not 1 <= size <= RANDOM_MAX_SIZE:
+        raise ValueError(f"n must be an integer between 1 and {RANDOM_MAX_SIZE}")
+    return size
+
+
+def allocate_draws(pool_counts, size):
+    """
+    Split size draws across pools in proportion to their sizes, as if size
+    distinct questions were picked uniformly from every matching question.
+
+    Picks size distinct positions out of the combined pools (a multivariate
+    hypergeometric draw), then counts how many land in each pool.
+    """
+    pools = sorted(pool_counts)
+    total = sum(pool_counts[pool] for pool in pools)
+    positions = sorted(random.sample(range(total), min(size, total)))
+
+    allocation = Counter()
+    pool_index = 0
+    pool_end = pool_counts[pools[0]] if pools else 0
+    for position in positions:
+        while position >= pool_end:
+            pool_index += 1
+            pool_end += pool_counts[pools[pool_index]]
+        allocation[pools[pool_index]] += 1
+    return dict(allocation)
+
+
+def query_random_pool(pool, **query_kwargs):
+    """Query one partition of the random index"""
+    condition = Key("sample_pool").eq(pool)
+    if "rand_from" in query_kwargs:
+        condition &= Key("rand").gte(query_kwargs.pop("rand_from"))
+    return table.query(
+        IndexName=RANDOM_INDEX, KeyConditionExpression=condition, **query_kwargs
+    )
+
+
+def draw_from_pool(pool):
+    """
+    Draw one question: the first item at or after a random point of the
+    pool's rand order, wrapping around to the start.
+
+    A question's odds are the gap between its key and the previous one, so
+    a single draw is not uniform: a question after a wide gap comes up more
+    often. Draws write nothing; the scheduled reconciliation re-rolls every
+    key (see reroll_sample_keys), so no question keeps its odds for long.
+    """
+    rand_from = Decimal(str(random.random()))
+    items = query_random_pool(pool, rand_from=rand_from, Limit=1).get("Items", [])
+    if not items:
+        items = query_random_pool(pool, Limit=1).get("Items", [])
+    if not items:
+        return None
 
-# Import custom metrics
-from custom_metrics import QuestionsMetrics
+    return convert_dynamodb_item(items[0])
 
-# Configure JSON structured logging for CloudWatch
-logger = logging.getLogger()
-log_level = os.environ.get("LOG_LEVEL", "INFO")
-logger.setLevel(getattr(logging, log_level))
-
-
-# JSON formatter for structured logs
-class JsonFormatter(logging.Formatter):
-    def format(self, record):
-        log_data = {
-            "timestamp": self.formatTime(record),
-            "level": record.levelname,
-            "message": record.getMessage(),
-            "logger": record.name,
+
+def sample_pool(pool, size):
+    """
+    Draw size distinct questions from one pool with O(size) single-item
+    queries. When draws keep colliding (size is a large share of the pool)
+    the remainder is picked from the pool read in full, which is then small.
+    """
+    drawn = {}
+    for _ in range(size * RANDOM_ATTEMPTS_PER_ITEM):
+        if len(drawn) == size:
+            return list(drawn.values())
+        item = draw_from_pool(pool)
+        if item is None:
+            return []
+        drawn.setdefault(item["id"], item)
+
+    if len(drawn) < size:
+        rest = []
+        response = query_random_pool(pool)
+        rest.extend(response.get("Items", []))
+        while "LastEvaluatedKey" in response:
+            response = query_random_pool(
+                pool, ExclusiveStartKey=response["LastEvaluatedKey"]
+            )
+            rest.extend(response.get("Items", []))
+        rest = [convert_dynamodb_item(item) for item in rest if item["id"] not in drawn]
+        for item in random.sample(rest, min(size - len(drawn), len(rest))):
+            drawn[item["id"]] = item
+
+    return list(drawn.values())
+
+
+def backfill_sample_keys():
+    """
+    Give questions written before random sampling existed a sample key, so
+    they enter the random index. A full filtered scan, so it runs from the
+    scheduled reconciliation (see stream_processor), never on a request.
+
+    Returns:
+        Number of questions keyed
+    """
+    read_kwargs = {
+        "FilterExpression": Attr("rand").not_exists(),
+        **build_projection_kwargs(SUMMARY_FIELDS),
+    }
+    unkeyed = fetch_all_questions(**read_kwargs)
+    for item in unkeyed:
+        key = sample_key(item.get("category"), item.get("difficulty"))
+        try:
+            table.update_item(
+                Key={"id": item["id"]},
+                UpdateExpression=(
+                    "SET #sample_pool = :sample_pool,"
+                    " #rand = if_not_exists(#rand, :rand)"
+                ),
+                # Never recreate a question deleted since the scan
+                ConditionExpression="attribute_exists(#id)",
+                ExpressionAttributeNames={
+                    "#id": "id",
+                    "#sample_pool": "sample_pool",
+                    "#rand": "rand",
+                },
+                ExpressionAttributeValues={
+                    ":sample_pool": key["sample_pool"],
+                    ":rand": key["rand"],
+                },
+            )
+        except ClientError as e:
+            if not is_condition_failure(e):
+                raise
+
+    logger.info("Backfilled sample keys", extra={"question_count": len(unkeyed)})
+    return len(unkeyed)
+
+
+def normalize_stored_difficulties():
+    """
+    Rewrite difficulties stored before writes normalized them ("medium"),
+    which exact-match index queries would miss. Each rewrite bumps the
+    question's version like an admin edit, and the stream then moves its
+    facet counter, random-index pool and snapshot shard.
+
+    Returns:
+        Number of questions rewritten
+    """
+    questions = fetch_all_questions(**build_projection_kwargs(("id", "difficulty")))
+    changed = []
+    for item in questions:
+        stored = item.get("difficulty")
+        difficulty = normalize_difficulty(stored)
+        if not difficulty or difficulty == stored:
+            continue
+        try:
+            response = table.update_item(
+                Key={"id": item["id"]},
+                UpdateExpression=(
+                    "SET #difficulty = :difficulty,"
+                    " #version = if_not_exists(#version, :zero) + :one"
+                ),
+                # Leave questions edited (or deleted) since the scan alone
+                ConditionExpression="#difficulty = :stored",
+                ExpressionAttributeNames={
+                    "#difficulty": "difficulty",
+                    "#version": "version",
+                },
+                ExpressionAttributeValues={
+                    ":difficulty": difficulty,
+                    ":stored": stored,
+                    ":zero": 0,
+                    ":one": 1,
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if not is_condition_failure(e):
+                raise
+            continue
+        changed.append(convert_dynamodb_item(response["Attributes"]))
+
+    if changed:
+        record_write(changed_items=changed)
+    logger.info("Normalized difficulties", extra={"question_count": len(changed)})
+    return len(changed)
+
+
+def reroll_sample_keys():
+    """
+    Move every keyed question to a new random point of its pool, so the gaps
+    that set each question's odds of being drawn (see draw_from_pool) don't
+    favour the same questions for good. A full scan and a write per
+    question, so it runs from the scheduled reconciliation, never on a
+    request; the stream processor ignores the resulting changes.
+
+    Returns:
+        Number of questions re-keyed
+    """
+    read_kwargs = {
+        "FilterExpression": Attr("rand").exists(),
+        **build_projection_kwargs(("id",)),
+    }
+    keyed = fetch_all_questions(**read_kwargs)
+    for item in keyed:
+        try:
+            table.update_item(
+                Key={"id": item["id"]},
+                UpdateExpression="SET #rand = :rand",
+                # Never recreate a question deleted since the scan
+                ConditionExpression="attribute_exists(#rand)",
+                ExpressionAttributeNames={"#rand": "rand"},
+                ExpressionAttributeValues={":rand": Decimal(str(random.random()))},
+            )
+        except ClientError as e:
+            if not is_condition_failure(e):
+                raise
+
+    logger.info("Re-rolled sample keys", extra={"question_count": len(keyed)})
+    return len(keyed)
+
+
+def handle_random(event, log_extra, start_time):
+    """
+    GET /questions/random?n=&category=&difficulty= - random sample.
+
+    Facet counts decide how many draws each category/difficulty pool gets,
+    in proportion to its size; each draw is a single-item query on the
+    random index, so a sample of n costs O(n) reads instead of a table scan.
+    Within a pool the draws are only roughly uniform: questions after wide
+    gaps in the rand order are favoured until the keys are next re-rolled
+    (see draw_from_pool). The request path never writes.
+    """
+    if RANDOM_INDEX not in DEPLOYED_INDEXES:
+        return {
+            "statusCode": 503,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": "Random sampling is not available yet"}),
+        }
+
+    params = event.get("queryStringParameters") or {}
+    try:
+        size = parse_sample_size(params)
+    except ValueError as e:
+        return {
+            "statusCode": 400,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": str(e)}),
         }
 
-        # Add extra fields if present
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
-        if hasattr(record, "path"):
-            log_data["path"] = record.path
-        if hasattr(record, "method"):
-            log_data["method"] = record.method
-        if hasattr(record, "error_type"):
-            log_data["error_type"] = record.error_type
-        if hasattr(record, "question_id"):
-            log_data["question_id"] = record.question_id
-        if hasattr(record, "question_count"):
-            log_data["question_count"] = record.question_count
+    category = params.get("category")
+    difficulty = normalize_difficulty(params.get("difficulty"))
 
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+    refresh_cache_version()
+    counts = read_through(("facet_counts",), "Facets", load_facets)
+    # Pools keep the difficulty as stored, so match them case-insensitively
+    pool_counts = {
+        pool_key(pool_category, pool_difficulty): count
+        for (pool_category, pool_difficulty), count in counts.items()
+        if (not category or pool_category == category)
+        and (not difficulty or normalize_difficulty(pool_difficulty) == difficulty)
+    }
 
-        return json.dumps(log_data)
+    # Questions not in the index yet are keyed by the scheduled backfill
+    items = []
+    for pool, draws in allocate_draws(pool_counts, size).items():
+        items.extend(sample_pool(pool, draws))
 
+    random.shuffle(items)
 
-# Apply JSON formatter to handler
-log_handler = logging.StreamHandler(sys.stdout)
-log_handler.setFormatter(JsonFormatter())
-logger.handlers = [log_handler]
+    QuestionsMetrics.questions_retrieved(len(items))
+    latency_ms = (time.time() - start_time) * 1000
+    QuestionsMetrics.api_latency(latency_ms, "RandomQuestions")
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["TABLE_NAME"])
+    logger.info(
+        "Sampled random questions",
+        extra={**log_extra, "question_count": len(items)},
+    )
 
+    return {
+        "statusCode": 200,
+        "headers": {"Access-Control-Allow-Origin": "*"},
+        "body": to_json({"items": items, "count": len(items)}),
+    }
 
-def convert_dynamodb_item(item):
+
+def handle_snapshot(event, log_extra, start_time):
     """
-    Convert DynamoDB item to regular Python dict.
-    Handles DynamoDB-specific types like sets.
+    GET /questions/snapshot - where to fetch the static question snapshot.
+
+    Returns the site-relative path of each category's shard. The shards are
+    served by CloudFront; only this authenticated call reveals their
+    content-hashed names.
     """
-    if isinstance(item, dict):
-        return {k: convert_dynamodb_item(v) for k, v in item.items()}
-    elif isinstance(item, set):
-        return list(item)
-    else:
-        return item
+    if not SNAPSHOT_BUCKET:
+        return {
+            "statusCode": 501,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": "Snapshots are not configured"}),
+        }
+
+    # Shards are republished from the stream after the write's version bump,
+    # so the pointers are read fresh rather than cached
+    refresh_cache_version()
+    pointers = load_snapshot_pointers()
+    if pointers is None:
+        # The first publish is a full scan, left to the scheduled reconcile;
+        # clients fall back to the paginated API meanwhile
+        return {
+            "statusCode": 503,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": "Snapshot is not published yet"}),
+        }
+
+    shards = [
+        {"category": category, "path": pointer["path"], "count": pointer["count"]}
+        for category, pointer in sorted(pointers.items())
+    ]
+    payload = build_payload(
+        {"version": cache_state["version"], "shards": shards},
+        count=len(shards),
+    )
+
+    latency_ms = (time.time() - start_time) * 1000
+    QuestionsMetrics.api_latency(latency_ms, "GetSnapshot")
+
+    logger.info("Retrieved snapshot manifest", extra=log_extra)
+
+    return conditional_response(event, payload)
+
+
+def get_search_index():
+    """
+    Return this container's search index, building it from a full scan
+    when it is missing or the bank version has moved on.
+    """
+    refresh_cache_version()
+    index = search_state["index"]
+    if index is not None and search_state["version"] == cache_state["version"]:
+        return index
+
+    # Capture the version first so a write during the scan triggers a rebuild
+    version = cache_state["version"]
+    items = fetch_all_questions(**build_projection_kwargs(SEARCH_FIELDS))
+    index = SearchIndex.from_items(items)
+    search_state.update(index=index, version=version)
+
+    logger.info("Built search index", extra={"question_count": len(index)})
+    return index
+
+
+def handle_search(event, log_extra, start_time):
+    """
+    GET /questions/search?q=&limit=&category=&difficulty= - ranked search.
+
+    Matches question text and category with BM25, tolerating prefixes and
+    single-character typos. Category and difficulty narrow the results.
+    """
+    params = event.get("queryStringParameters") or {}
+    query = (params.get("q") or "").strip()
+
+    error = None
+    if not query:
+        error = "q is required"
+    elif len(query) > SEARCH_MAX_QUERY_LENGTH:
+        error = f"q must be at most {SEARCH_MAX_QUERY_LENGTH} characters"
+
+    limit = SEARCH_DEFAULT_LIMIT
+    if not error and params.get("limit"):
+        try:
+            limit = int(params["limit"])
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= SEARCH_MAX_LIMIT:
+            error = f"limit must be an integer between 1 and {SEARCH_MAX_LIMIT}"
+
+    if error:
+        return {
+            "statusCode": 400,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": error}),
+        }
+
+    category = params.get("category")
+    difficulty = params.get("difficulty")
+
+    results = get_search_index().search(query, limit=None)
+    items = [
+        result
+        for result in results
+        if (not category or result["category"] == category)
+        and (not difficulty or result["difficulty"] == difficulty)
+    ][:limit]
+
+    QuestionsMetrics.search_performed(len(items))
+    latency_ms = (time.time() - start_time) * 1000
+    QuestionsMetrics.api_latency(latency_ms, "SearchQuestions")
+
+    logger.info(
+        "Searched questions",
+        extra={**log_extra, "question_count": len(items)},
+    )
+
+    return conditional_response(
+        event, build_payload({"query": query, "items": items, "count": len(items)})
+    )
+
+
+def iter_question_pages():
+    """
+    Yield the whole bank one scan page at a time, so callers never hold
+    more than a single page (at most 1 MB of items) in memory.
+    """
+    scan_kwargs = {}
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield [
+            convert_dynamodb_item(item)
+            for item in response.get("Items", [])
+            if is_question_item(item)
+        ]
+
+        if "LastEvaluatedKey" not in response:
+            return
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def handle_export(event, log_extra, start_time, request_id):
+    """
+    GET /questions/export - admin NDJSON export of the whole bank.
+
+    Streams scan pages into an S3 object and returns a short-lived
+    download URL for it.
+    """
+    if not EXPORT_BUCKET:
+        return {
+            "statusCode": 501,
+            "headers": {"Access-Control-Allow-Origin": "*"},
+            "body": to_json({"error": "Export bucket is not configured"}),
+        }
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    key = f"exports/questions-{timestamp}-{request_id}.ndjson"
+
+    count = export_questions(iter_question_pages(), s3, EXPORT_BUCKET, key)
+
+    url = s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": EXPORT_BUCKET, "Key": key},
+        ExpiresIn=EXPORT_URL_EXPIRY_SECONDS,
+    )
+
+    latency_ms = (time.time() - start_time) * 1000
+    QuestionsMetrics.api_latency(latency_ms, "ExportQuestions")
+
+    logger.info("Exported questions", extra={**log_extra, "question_count": count})
+
+    return {
+        "statusCode": 200,
+        "headers": {"Access-Control-Allow-Origin": "*"},
+        "body": to_json(
+            {
+                "bucket": EXPORT_BUCKET,
+                "key": key,
+                "count": count,
+                "url": url,
+                "expires_in": EXPORT_URL_EXPIRY_SECONDS,
+            }
+        ),
+    }
+
+
+def encode_cursor(last_evaluated_key):
+    """
+    Encode a DynamoDB LastEvaluatedKey as an opaque, URL-safe cursor.
+    """
+    raw = json.dumps(
+        last_evaluated_key,
+        separators=(",", ":"),
+        sort_keys=True,
+        default=json_default,
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor back into an ExclusiveStartKey.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(key, dict) or not key:
+        raise ValueError("Invalid cursor")
+
+    return key
+
+
+def parse_page_limit(params):
+    """
+    Read the `limit` query parameter, clamped to 1..MAX_PAGE_SIZE.
+
+    Raises:
+        ValueError: If limit is not an integer
+    """
+    raw_limit = params.get("limit")
+    if raw_limit in (None, ""):
+        return DEFAULT_PAGE_SIZE
+
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def get_remaining_time_ms(context):
+    """
+    Return the remaining invocation time in ms, or None when unknown
+    (local runs and tests pass a plain dict or no context at all).
+    """
+    getter = getattr(context, "get_remaining_time_in_millis", None)
+    if not callable(getter):
+        return None
+
+    remaining = getter()
+    if isinstance(remaining, (int, float)):
+        return remaining
+    return None
+
+
+def build_filter_kwargs(params):
+    """
+    Translate category/difficulty query parameters into DynamoDB read kwargs.
+
+    category (and optionally difficulty) is served by a Query against the
+    matching GSI, so only matching items are read. difficulty on its own has
+    no index and falls back to a filtered scan, as does any filter whose
+    index is not deployed yet (see DEPLOYED_INDEXES).
+
+    Returns:
+        Dict of Query/Scan kwargs (empty when no filter is requested)
+    """
+    category = params.get("category")
+    difficulty = normalize_difficulty(params.get("difficulty"))
+
+    if category and difficulty and CATEGORY_DIFFICULTY_INDEX in DEPLOYED_INDEXES:
+        return {
+            "IndexName": CATEGORY_DIFFICULTY_INDEX,
+            "KeyConditionExpression": Key("category").eq(category)
+            & Key("difficulty").eq(difficulty),
+        }
+
+    difficulty_filter = Attr("difficulty").eq(difficulty) if difficulty else None
+    if category and CATEGORY_INDEX in DEPLOYED_INDEXES:
+        kwargs = {
+            "IndexName": CATEGORY_INDEX,
+            "KeyConditionExpression": Key("category").eq(category),
+        }
+        if difficulty_filter is not None:
+            kwargs["FilterExpression"] = difficulty_filter
+        return kwargs
+
+    condition = Attr("category").eq(category) if category else None
+    if difficulty_filter is not None:
+        condition = (
+            difficulty_filter if condition is None else condition & difficulty_filter
+        )
+    return {"FilterExpression": condition} if condition is not None else {}
+
+
+def parse_fields(params, default=None):
+    """
+    Read the `fields` query parameter.
+
+    Accepts "all", "summary" or a comma-separated list of QUESTION_FIELDS.
+    "id" is always included.
+
+    Returns:
+        Tuple of attribute names, or None for every attribute
+
+    Raises:
+        ValueError: If fields is not a string or names an unknown field
+    """
+    raw_fields = params.get("fields")
+    if raw_fields is None or raw_fields == "":
+        return default
+    if not isinstance(raw_fields, str):
+        raise ValueError('fields must be a string, e.g. "summary" or "id,category"')
+    if raw_fields == "all":
+        return None
+    if raw_fields == "summary":
+        return SUMMARY_FIELDS
+
+    fields = ["id"]
+    for field in raw_fields.split(","):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in QUESTION_FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        fields.append(field)
+
+    return tuple(fields)
+
+
+def build_projection_kwargs(fields):
+    """
+    Turn a fields tuple into ProjectionExpression kwargs for Get/Query/Scan.
+    Every name goes through a placeholder to avoid reserved-word clashes.
+    """
+    if not fields:
+        return {}
+
+    return {
+        "ProjectionExpression": ", ".join(f"#{field}" for field in fields),
+        "ExpressionAttributeNames": {f"#{field}": field for field in fields},
+    }
+
+
+def read_questions(**read_kwargs):
+    """
+    Run a single Query (when a key condition is given) or Scan call.
+    """
+    # boto3 merges generated placeholders into ExpressionAttributeNames in
+    # place, so never hand it a dict that is reused between calls
+    if "ExpressionAttributeNames" in read_kwargs:
+        read_kwargs["ExpressionAttributeNames"] = dict(
+            read_kwargs["ExpressionAttributeNames"]
+        )
+
+    if "KeyConditionExpression" in read_kwargs:
+        return table.query(**read_kwargs)
+    return table.scan(**read_kwargs)
+
+
+def scan_segment(segment, total_segments, **scan_kwargs):
+    """
+    Scan one segment of the table to completion.
+
+    Uses the table's client, which (unlike boto3 resources) is safe to
+    share between threads. It is the resource's own client, so it already
+    (de)serializes attribute values like table.scan() does. scan_kwargs may
+    only carry plain-string expressions such as a ProjectionExpression.
+    """
+    client = table.meta.client
+    scan_kwargs = {
+        **scan_kwargs,
+        "TableName": table.name,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+    }
+
+    items = []
+    while True:
+        response = client.scan(**scan_kwargs)
+        items.extend(response.get("Items", []))
+
+        if "LastEvaluatedKey" not in response:
+            return items
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def parallel_scan(total_segments, **scan_kwargs):
+    """
+    Scan the whole table as total_segments parallel segments on a bounded
+    thread pool. Segments are concatenated in segment order, so the result
+    order is stable between calls.
+    """
+    workers = max(1, min(total_segments, SCAN_MAX_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda segment: scan_segment(segment, total_segments, **scan_kwargs),
+            range(total_segments),
+        )
+        return [item for segment_items in results for item in segment_items]
+
+
+def fetch_all_questions(**read_kwargs):
+    """
+    Read every question matching read_kwargs, following LastEvaluatedKey.
+    Unfiltered full-bank reads use a parallel scan when SCAN_SEGMENTS > 1.
+    """
+    is_filtered = (
+        "KeyConditionExpression" in read_kwargs or "FilterExpression" in read_kwargs
+    )
+    if not is_filtered and SCAN_SEGMENTS > 1:
+        items = parallel_scan(SCAN_SEGMENTS, **read_kwargs)
+        return [convert_dynamodb_item(item) for item in items if is_question_item(item)]
+
+    items = []
+    response = read_questions(**read_kwargs)
+    items.extend(response.get("Items", []))
+
+    # Handle pagination
+    while "LastEvaluatedKey" in response:
+        response = read_questions(
+            ExclusiveStartKey=response["LastEvaluatedKey"], **read_kwargs
+        )
+        items.extend(response.get("Items", []))
+
+    return [convert_dynamodb_item(item) for item in items if is_question_item(item)]
+
+
+def fetch_question_page(limit, exclusive_start_key=None, context=None, **read_kwargs):
+    """
+    Read a single page of questions, optionally filtered via read_kwargs.
+
+    Keeps reading until `limit` items are collected, the page approaches
+    MAX_PAGE_BYTES, or the invocation is running out of time. The Limit sent
+    to DynamoDB shrinks with the average item size seen so far, so the
+    LastEvaluatedKey returned always points at the last item in the page.
+
+    Returns:
+        Tuple of (items, last_evaluated_key or None)
+    """
+    items = []
+    page_bytes = 0
+    start_key = exclusive_start_key
+
+    while True:
+        request_limit = limit - len(items)
+        if items:
+            average_item_bytes = max(1, page_bytes // len(items))
+            request_limit = min(
+                request_limit, (MAX_PAGE_BYTES - page_bytes) // average_item_bytes
+            )
+        if request_limit <= 0:
+            break
+
+        page_kwargs = {**read_kwargs, "Limit": request_limit}
+        if start_key:
+            page_kwargs["ExclusiveStartKey"] = start_key
+
+        response = read_questions(**page_kwargs)
+        batch = [
+            convert_dynamodb_item(item)
+            for item in response.get("Items", [])
+            if is_question_item(item)
+        ]
+        items.extend(batch)
+        page_bytes += len(to_json_bytes(batch))
+
+        start_key = response.get("LastEvaluatedKey")
+        if not start_key:
+            break
+
+        remaining_ms = get_remaining_time_ms(context)
+        if remaining_ms is not None and remaining_ms < PAGE_TIME_RESERVE_MS:
+            break
+
+    return items, start_key
 
 
 def get_user_groups(event):
@@ -112,7 +2035,8 @@ def is_admin(event):
     Returns:
         True if user is in the Admin group, False otherwise
     """
-    groups = get_user_groups(event)
+    with request_timing.span("auth"):
+        groups = get_user_groups(event)
     return "Admin" in groups
 
 
@@ -138,7 +2062,7 @@ def require_admin(event):
                 "Access-Control-Allow-Origin": "*",
                 "Content-Type": "application/json",
             },
-            "body": json.dumps(
+            "body": to_json(
                 {
                     "error": "Forbidden",
                     "message": "Admin access required for this operation",
@@ -149,6 +2073,7 @@ def require_admin(event):
     return None
 
 
+@lambda_telemetry.instrument
 def handler(event, context):
     """
     Main Lambda handler for question operations.
@@ -161,8 +2086,6 @@ def handler(event, context):
     # Create logger adapter with request context
     log_extra = {"request_id": request_id, "method": method, "path": path}
 
-    import time
-
     start_time = time.time()
 
     logger.info("Incoming request", extra=log_extra)
@@ -171,23 +2094,93 @@ def handler(event, context):
         # List all questions
         if path == "/questions":
             if method == "GET":
-                logger.info("Fetching all questions from DynamoDB", extra=log_extra)
+                params = event.get("queryStringParameters") or {}
+                try:
+                    fields = parse_fields(params, default=SUMMARY_FIELDS)
+                except ValueError as e:
+                    return {
+                        "statusCode": 400,
+                        "headers": {"Access-Control-Allow-Origin": "*"},
+                        "body": to_json({"error": str(e)}),
+                    }
+                read_kwargs = {
+                    **build_filter_kwargs(params),
+                    **build_projection_kwargs(fields),
+                }
 
-                items = []
-                response = table.scan()
-                items.extend(response.get("Items", []))
+                # Paginated listing when the client asks for it
+                if "limit" in params or "cursor" in params:
+                    try:
+                        limit = parse_page_limit(params)
+                        start_key = (
+                            decode_cursor(params["cursor"])
+                            if params.get("cursor")
+                            else None
+                        )
+                    except ValueError as e:
+                        return {
+                            "statusCode": 400,
+                            "headers": {"Access-Control-Allow-Origin": "*"},
+                            "body": to_json({"error": str(e)}),
+                        }
+
+                    logger.info("Fetching page of questions", extra=log_extra)
+
+                    def load_page():
+                        items, last_key = fetch_question_page(
+                            limit, start_key, context, **read_kwargs
+                        )
+                        return build_payload(
+                            {
+                                "items": items,
+                                "next_cursor": (
+                                    encode_cursor(last_key) if last_key else None
+                                ),
+                            },
+                            count=len(items),
+                        )
+
+                    refresh_cache_version()
+                    cache_key = (
+                        "page",
+                        params.get("category"),
+                        params.get("difficulty"),
+                        fields,
+                        limit,
+                        params.get("cursor"),
+                    )
+                    payload = read_through(cache_key, "List", load_page)
+
+                    QuestionsMetrics.questions_retrieved(payload["count"])
+
+                    latency_ms = (time.time() - start_time) * 1000
+                    QuestionsMetrics.api_latency(latency_ms, "ListQuestionsPage")
 
-                # Handle pagination
-                while "LastEvaluatedKey" in response:
-                    response = table.scan(
-                        ExclusiveStartKey=response["LastEvaluatedKey"]
+                    logger.info(
+                        "Successfully retrieved page of questions",
+                        extra={**log_extra, "question_count": payload["count"]},
                     )
-                    items.extend(response.get("Items", []))
 
-                items = [convert_dynamodb_item(item) for item in items]
+                    return conditional_response(event, payload)
+
+                logger.info("Fetching all questions from DynamoDB", extra=log_extra)
+
+                refresh_cache_version()
+                cache_key = (
+                    "list",
+                    params.get("category"),
+                    params.get("difficulty"),
+                    fields,
+                )
+
+                def load_list():
+                    items = fetch_all_questions(**read_kwargs)
+                    return build_payload(items, count=len(items))
+
+                payload = read_through(cache_key, "List", load_list)
 
                 # Emit custom metrics
-                QuestionsMetrics.questions_retrieved(len(items))
+                QuestionsMetrics.questions_retrieved(payload["count"])
 
                 # Track API latency
                 latency_ms = (time.time() - start_time) * 1000
@@ -195,14 +2188,10 @@ def handler(event, context):
 
                 logger.info(
                     "Successfully retrieved questions",
-                    extra={**log_extra, "question_count": len(items)},
+                    extra={**log_extra, "question_count": payload["count"]},
                 )
 
-                return {
-                    "statusCode": 200,
-                    "headers": {"Access-Control-Allow-Origin": "*"},
-                    "body": json.dumps(items),
-                }
+                return conditional_response(event, payload)
 
             elif method == "POST":
                 # Check admin access
@@ -211,33 +2200,24 @@ def handler(event, context):
                     return admin_check
 
                 # Create new question
-                body = json.loads(event.get("body", "{}"))
+                with request_timing.span("parse"):
+                    body = json.loads(event.get("body", "{}"))
 
                 # Validate required fields
-                required_fields = ["question", "category"]
-                required_fields = ["question_text", "category", "difficulty"]
-                for field in required_fields:
-                    if field not in body:
-                        return {
-                            "statusCode": 400,
-                            "headers": {"Access-Control-Allow-Origin": "*"},
-                            "body": json.dumps(
-                                {"error": f"Missing required field: {field}"}
-                            ),
-                        }
+                error = validate_question_fields(body)
+                if error:
+                    return {
+                        "statusCode": 400,
+                        "headers": {"Access-Control-Allow-Origin": "*"},
+                        "body": to_json({"error": error}),
+                    }
 
                 # Generate ID and create item
-                question_id = str(uuid.uuid4())
-                item = {
-                    "id": question_id,
-                    "question_text": body["question_text"],
-                    "category": body["category"],
-                    "difficulty": body["difficulty"],
-                    "reference_answer": body.get("reference_answer", ""),
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                }
+                item = build_question_item(body)
+                question_id = item["id"]
 
                 table.put_item(Item=item)
+                record_write(changed_items=[item])
 
                 logger.info(
                     "Question created", extra={**log_extra, "question_id": question_id}
@@ -246,9 +2226,45 @@ def handler(event, context):
                 return {
                     "statusCode": 201,
                     "headers": {"Access-Control-Allow-Origin": "*"},
-                    "body": json.dumps(item),
+                    "body": to_json(convert_dynamodb_item(item)),
                 }
 
+        # Admin NDJSON export
+        elif path == "/questions/export" and method == "GET":
+            admin_check = require_admin(event)
+            if admin_check:
+                return admin_check
+
+            return handle_export(event, log_extra, start_time, request_id)
+
+        # Admin bulk import
+        elif path == "/questions/import" and method == "POST":
+            admin_check = require_admin(event)
+            if admin_check:
+                return admin_check
+
+            return handle_import(event, log_extra, start_time)
+
+        # Facet counts for filter dropdowns
+        elif path == "/questions/facets" and method == "GET":
+            return handle_facets(event, log_extra, start_time)
+
+        # Random practice set
+        elif path == "/questions/random" and method == "GET":
+            return handle_random(event, log_extra, start_time)
+
+        # Static snapshot manifest
+        elif path == "/questions/snapshot" and method == "GET":
+            return handle_snapshot(event, log_extra, start_time)
+
+        # Ranked full-text search
+        elif path == "/questions/search" and method == "GET":
+            return handle_search(event, log_extra, start_time)
+
+        # Fetch several questions by id
+        elif path == "/questions/batch" and method == "POST":
+            return handle_batch_get(event, log_extra, start_time)
+
         # Get single question by ID
         elif path.startswith("/questions/"):
             question_id = path.split("/")[-1]
@@ -259,13 +2275,37 @@ def handler(event, context):
                     extra={**log_extra, "question_id": question_id},
                 )
 
-                response = table.get_item(Key={"id": question_id})
+                params = event.get("queryStringParameters") or {}
+                try:
+                    fields = parse_fields(params)
+                except ValueError as e:
+                    return {
+                        "statusCode": 400,
+                        "headers": {"Access-Control-Allow-Origin": "*"},
+                        "body": to_json({"error": str(e)}),
+                    }
 
-                if "Item" in response:
-                    item = convert_dynamodb_item(response["Item"])
+                def load_item():
+                    response = table.get_item(
+                        Key={"id": question_id}, **build_projection_kwargs(fields)
+                    )
+                    if "Item" in response:
+                        item = convert_dynamodb_item(response["Item"])
+                        return build_payload(
+                            item, category=item.get("category", "Unknown")
+                        )
+                    return QUESTION_NOT_FOUND
+
+                payload = QUESTION_NOT_FOUND
+                if not is_reserved_id(question_id):
+                    refresh_cache_version()
+                    payload = read_through(
+                        ("item", question_id, fields), "Item", load_item
+                    )
 
+                if payload is not QUESTION_NOT_FOUND:
                     # Emit custom metrics for question view
-                    category = item.get("category", "Unknown")
+                    category = payload["category"]
                     QuestionsMetrics.question_viewed(question_id, category)
 
                     latency_ms = (time.time() - start_time) * 1000
@@ -275,11 +2315,7 @@ def handler(event, context):
                         "Question found",
                         extra={**log_extra, "question_id": question_id},
                     )
-                    return {
-                        "statusCode": 200,
-                        "headers": {"Access-Control-Allow-Origin": "*"},
-                        "body": json.dumps(item),
-                    }
+                    return conditional_response(event, payload)
 
                 # Track 404 errors
                 QuestionsMetrics.question_not_found()
@@ -291,7 +2327,7 @@ def handler(event, context):
                 return {
                     "statusCode": 404,
                     "headers": {"Access-Control-Allow-Origin": "*"},
-                    "body": json.dumps({"error": "Not found"}),
+                    "body": to_json({"error": "Not found"}),
                 }
 
             elif method == "PUT":
@@ -300,44 +2336,77 @@ def handler(event, context):
                 if admin_check:
                     return admin_check
 
+                if is_reserved_id(question_id):
+                    return {
+                        "statusCode": 404,
+                        "headers": {"Access-Control-Allow-Origin": "*"},
+                        "body": to_json({"error": "Question not found"}),
+                    }
+
                 # Update existing question
-                body = json.loads(event.get("body", "{}"))
+                with request_timing.span("parse"):
+                    body = json.loads(event.get("body", "{}"))
 
-                # Check if question exists
-                response = table.get_item(Key={"id": question_id})
-                if "Item" not in response:
+                if not isinstance(body, dict):
                     return {
-                        "statusCode": 404,
+                        "statusCode": 400,
                         "headers": {"Access-Control-Allow-Origin": "*"},
-                        "body": json.dumps({"error": "Question not found"}),
+                        "body": to_json({"error": "Body must be a JSON object"}),
                     }
 
-                # Build update expression
-                update_fields = ["question_text", "category", "difficulty", "reference_answer"]
-                update_expr = "SET " + ", ".join(
-                    [f"#{f} = :{f}" for f in update_fields if f in body]
-                )
-                expr_attr_names = {f"#{f}": f for f in update_fields if f in body}
-                expr_attr_values = {
-                    f":{f}": body[f] for f in update_fields if f in body
-                }
+                try:
+                    expected_version = parse_expected_version(body.get("version"))
+                except ValueError as e:
+                    return {
+                        "statusCode": 400,
+                        "headers": {"Access-Control-Allow-Origin": "*"},
+                        "body": to_json({"error": str(e)}),
+                    }
 
-                if not expr_attr_values:
+                # Build update expression
+                fields = [f for f in UPDATABLE_FIELDS if f in body]
+                error = validate_updated_fields(body, fields)
+                if error:
                     return {
                         "statusCode": 400,
                         "headers": {"Access-Control-Allow-Origin": "*"},
-                        "body": json.dumps({"error": "No fields to update"}),
+                        "body": to_json({"error": error}),
                     }
 
-                table.update_item(
-                    Key={"id": question_id},
-                    UpdateExpression=update_expr,
-                    ExpressionAttributeNames=expr_attr_names,
-                    ExpressionAttributeValues=expr_attr_values,
+                actions = [f"#{f} = :{f}" for f in fields]
+                expr_attr_names = {f"#{f}": f for f in fields}
+                expr_attr_values = {f":{f}": body[f] for f in fields}
+                if "difficulty" in body:
+                    expr_attr_values[":difficulty"] = normalize_difficulty(
+                        body["difficulty"]
+                    )
+
+                actions.append("#version = if_not_exists(#version, :zero) + :one")
+                expr_attr_names["#version"] = "version"
+                expr_attr_values.update({":zero": 0, ":one": 1})
+
+                condition = version_condition(
+                    expected_version, expr_attr_names, expr_attr_values
                 )
 
-                # Fetch updated item
-                updated = table.get_item(Key={"id": question_id})
+                # One round trip: existence and version are checked by the write
+                try:
+                    response = table.update_item(
+                        Key={"id": question_id},
+                        UpdateExpression="SET " + ", ".join(actions),
+                        ConditionExpression=condition,
+                        ExpressionAttributeNames=expr_attr_names,
+                        ExpressionAttributeValues=expr_attr_values,
+                        ReturnValues="ALL_NEW",
+                        ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                    )
+                except ClientError as e:
+                    if not is_condition_failure(e):
+                        raise
+                    return condition_failure_response(e, question_id, log_extra)
+
+                updated = convert_dynamodb_item(response["Attributes"])
+                record_write(changed_items=[updated])
 
                 logger.info(
                     "Question updated", extra={**log_extra, "question_id": question_id}
@@ -345,7 +2414,7 @@ def handler(event, context):
                 return {
                     "statusCode": 200,
                     "headers": {"Access-Control-Allow-Origin": "*"},
-                    "body": json.dumps(convert_dynamodb_item(updated["Item"])),
+                    "body": to_json(updated),
                 }
 
             elif method == "DELETE":
@@ -354,13 +2423,52 @@ def handler(event, context):
                 if admin_check:
                     return admin_check
 
-                # TODO: Implement delete question logic
                 logger.info(
                     "Deleting question",
                     extra={**log_extra, "question_id": question_id},
                 )
 
-                table.delete_item(Key={"id": question_id})
+                if is_reserved_id(question_id):
+                    return {
+                        "statusCode": 404,
+                        "headers": {"Access-Control-Allow-Origin": "*"},
+                        "body": to_json({"error": "Question not found"}),
+                    }
+
+                params = event.get("queryStringParameters") or {}
+                try:
+                    expected_version = parse_expected_version(params.get("version"))
+                except ValueError as e:
+                    return {
+                        "statusCode": 400,
+                        "headers": {"Access-Control-Allow-Origin": "*"},
+                        "body": to_json({"error": str(e)}),
+                    }
+
+                expr_attr_names = {}
+                expr_attr_values = {}
+                condition = version_condition(
+                    expected_version, expr_attr_names, expr_attr_values
+                )
+                if expr_attr_values:
+                    condition_kwargs = {"ExpressionAttributeValues": expr_attr_values}
+                else:
+                    condition_kwargs = {}
+
+                try:
+                    table.delete_item(
+                        Key={"id": question_id},
+                        ConditionExpression=condition,
+                        ExpressionAttributeNames=expr_attr_names,
+                        ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                        **condition_kwargs,
+                    )
+                except ClientError as e:
+                    if not is_condition_failure(e):
+                        raise
+                    return condition_failure_response(e, question_id, log_extra)
+
+                record_write(removed_ids=[question_id])
 
                 return {
                     "statusCode": 204,
@@ -374,7 +2482,7 @@ def handler(event, context):
             return {
                 "statusCode": 200,
                 "headers": {"Access-Control-Allow-Origin": "*"},
-                "body": json.dumps({"message": "Hello from Lambda!"}),
+                "body": to_json({"message": "Hello from Lambda!"}),
             }
 
     except Exception as e:
@@ -390,5 +2498,5 @@ def handler(event, context):
         return {
             "statusCode": 500,
             "headers": {"Access-Control-Allow-Origin": "*"},
-            "body": json.dumps({"error": str(e)}),
+            "body": to_json({"error": str(e)}),
         }
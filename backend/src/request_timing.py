@@ -0,0 +1,94 @@
+"""
+Per-request phase timing.
+
+Code times a phase of the current request with span():
+
+    with request_timing.span("parse"):
+        body = json.loads(event["body"])
+
+Spans with the same name add up. lambda_telemetry.instrument starts a
+timer for every invocation, returns the phases as a Server-Timing header
+and logs them as structured fields. Outside an invocation span() does
+nothing.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class RequestTimer:
+    """Accumulated milliseconds per named phase of one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+
+    def add(self, name, duration_ms):
+        self.phases[name] = self.phases.get(name, 0.0) + duration_ms
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_fields(self):
+        """Phase timings (plus total) rounded for logging"""
+        fields = {name: round(ms, 2) for name, ms in self.phases.items()}
+        fields["total"] = round(self.total_ms(), 2)
+        return fields
+
+    def server_timing(self):
+        """Server-Timing header value, e.g. "parse;dur=0.2, total;dur=15.1" """
+        return ", ".join(
+            f"{name};dur={ms:.1f}" for name, ms in self.as_fields().items()
+        )
+
+
+# The timer of the invocation in progress, if any
+state = {"timer": None}
+
+
+def start():
+    """Begin timing a new request"""
+    timer = state["timer"] = RequestTimer()
+    return timer
+
+
+def stop():
+    """Finish the current request; later spans are not recorded"""
+    timer, state["timer"] = state["timer"], None
+    return timer
+
+
+def record(name, duration_ms):
+    """Add an externally measured duration to the current request"""
+    timer = state["timer"]
+    if timer is not None:
+        timer.add(name, duration_ms)
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block as (part of) the named phase"""
+    timer = state["timer"]
+    if timer is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, (time.perf_counter() - started) * 1000)
+
+
+def add_server_timing(response, timer):
+    """Attach the Server-Timing header to an API Gateway proxy response"""
+    if not isinstance(response, dict) or "statusCode" not in response:
+        return response
+
+    headers = response.setdefault("headers", {})
+    headers["Server-Timing"] = timer.server_timing()
+    # Let the browser expose the timings to a cross-origin frontend
+    origin = headers.get("Access-Control-Allow-Origin")
+    if origin:
+        headers["Timing-Allow-Origin"] = origin
+    return response
@@ -0,0 +1,216 @@
+"""
+In-memory full-text search index for questions.
+
+A compact inverted index (term -> {doc number: term frequency}) ranked
+with BM25. Query terms also match vocabulary terms they are a prefix of
+(search-as-you-type) and, when there is no exact hit, terms one edit away
+(typo tolerance). Built once per warm container and updated in place on
+admin writes.
+"""
+
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Relative weight of expanded matches compared to an exact term match
+PREFIX_WEIGHT = 0.8
+TYPO_WEIGHT = 0.6
+
+# Shorter query terms are too ambiguous to expand
+MIN_PREFIX_LENGTH = 2
+MIN_TYPO_LENGTH = 4
+MAX_PREFIX_EXPANSIONS = 50
+
+# Attributes indexed and returned with each hit
+INDEXED_FIELDS = ("question_text", "category")
+STORED_FIELDS = ("id", "question_text", "category", "difficulty")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how in is it of on or the "
+    "to what when which who why with you your".split()
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase text and split it into indexable terms"""
+    if not text:
+        return []
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(str(text).lower())
+        if token not in STOPWORDS
+    ]
+
+
+def within_one_edit(a, b):
+    """True when a and b differ by at most one insert, delete, swap or transposition"""
+    if a == b:
+        return True
+
+    if abs(len(a) - len(b)) > 1:
+        return False
+
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and a[diffs[0]] == b[diffs[1]]
+            and a[diffs[1]] == b[diffs[0]]
+        )
+
+    # One insertion/deletion: walk the shorter string against the longer
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    i = j = 0
+    skipped = False
+    while i < len(shorter) and j < len(longer):
+        if shorter[i] == longer[j]:
+            i += 1
+        elif skipped:
+            return False
+        else:
+            skipped = True
+        j += 1
+    return True
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over question text and category"""
+
+    def __init__(self):
+        # Documents are stored under small integer numbers to keep postings compact
+        self._numbers = {}
+        self._docs = []
+        self._lengths = []
+        self._terms = []
+        self._postings = {}
+        self._vocabulary = []
+        self._total_length = 0
+
+    @classmethod
+    def from_items(cls, items):
+        """Build an index from question items"""
+        index = cls()
+        for item in items:
+            index.add(item)
+        return index
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def add(self, item):
+        """Index a question, replacing any previous version with the same id"""
+        doc_id = item["id"]
+        self.remove(doc_id)
+
+        tokens = []
+        for field in INDEXED_FIELDS:
+            tokens.extend(tokenize(item.get(field)))
+        frequencies = Counter(tokens)
+
+        number = len(self._docs)
+        self._numbers[doc_id] = number
+        self._docs.append({field: item.get(field) for field in STORED_FIELDS})
+        self._lengths.append(len(tokens))
+        self._terms.append(tuple(frequencies))
+        self._total_length += len(tokens)
+
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[number] = frequency
+
+    def remove(self, doc_id):
+        """Drop a question from the index if present"""
+        number = self._numbers.pop(doc_id, None)
+        if number is None:
+            return
+
+        for term in self._terms[number]:
+            postings = self._postings[term]
+            del postings[number]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+
+        self._total_length -= self._lengths[number]
+        self._docs[number] = None
+        self._lengths[number] = 0
+        self._terms[number] = ()
+
+    def _expand(self, term):
+        """Map a query term to {vocabulary term: weight}"""
+        matches = {}
+        if term in self._postings:
+            matches[term] = 1.0
+
+        if len(term) >= MIN_PREFIX_LENGTH:
+            start = bisect_left(self._vocabulary, term)
+            end = start + MAX_PREFIX_EXPANSIONS
+            for vocabulary_term in self._vocabulary[start:end]:
+                if not vocabulary_term.startswith(term):
+                    break
+                matches.setdefault(vocabulary_term, PREFIX_WEIGHT)
+
+        if not matches and len(term) >= MIN_TYPO_LENGTH:
+            for vocabulary_term in self._vocabulary:
+                if within_one_edit(term, vocabulary_term):
+                    matches[vocabulary_term] = TYPO_WEIGHT
+
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Rank questions against a free-text query.
+
+        Args:
+            query: Free text typed by the user
+            limit: Maximum number of hits, or None for every match
+
+        Returns:
+            List of stored question fields plus a "score", best first
+        """
+        doc_count = len(self._numbers)
+        if not doc_count:
+            return []
+
+        average_length = self._total_length / doc_count or 1.0
+        scores = Counter()
+
+        for query_term in dict.fromkeys(tokenize(query)):
+            # A document scores each query term once, via its best expansion
+            term_scores = {}
+            for term, weight in self._expand(query_term).items():
+                postings = self._postings[term]
+                idf = math.log(
+                    1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for number, frequency in postings.items():
+                    length_norm = 1 - B + B * self._lengths[number] / average_length
+                    score = (
+                        weight
+                        * idf
+                        * frequency
+                        * (K1 + 1)
+                        / (frequency + K1 * length_norm)
+                    )
+                    if score > term_scores.get(number, 0.0):
+                        term_scores[number] = score
+
+            scores.update(term_scores)
+
+        results = []
+        for number, score in scores.most_common(limit):
+            results.append({**self._docs[number], "score": round(score, 4)})
+        return results
@@ -0,0 +1,50 @@
+"""
+Shared JSON serialization for Lambda responses.
+
+Handles the types boto3 and the AWS SDK hand back (Decimal numbers from
+DynamoDB, sets, datetimes) during encoding itself, so items never need a
+separate conversion pass. Uses orjson when it is installed and falls back
+to the standard library otherwise; both produce compact UTF-8 JSON.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import request_timing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment package
+    orjson = None
+
+
+def json_default(value):
+    """Encode types the JSON encoders don't know natively"""
+    if isinstance(value, Decimal):
+        # DynamoDB returns every number as Decimal
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        # Sorted so equal sets always encode (and ETag) identically
+        try:
+            return sorted(value)
+        except TypeError:
+            return list(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_bytes(data):
+    """Encode data as compact UTF-8 JSON bytes"""
+    with request_timing.span("serialize"):
+        if orjson is not None:
+            return orjson.dumps(data, default=json_default)
+        return json.dumps(
+            data, default=json_default, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+
+def to_json(data):
+    """Encode data as a compact JSON string, e.g. for a proxy response body"""
+    return to_json_bytes(data).decode("utf-8")
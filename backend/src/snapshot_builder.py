@@ -0,0 +1,79 @@
+"""
+Static per-category snapshots of the question bank for CDN delivery.
+
+Each category is written to the frontend bucket as an immutable JSON
+shard whose key carries a hash of its content, so CloudFront and browsers
+can cache it indefinitely and a rebuilt category simply gets a new key.
+Which shards are current is recorded separately (see questions_handler),
+so only clients that have authenticated learn the shard URLs.
+"""
+
+import hashlib
+import json
+import logging
+import re
+
+from serialization import to_json_bytes
+
+logger = logging.getLogger(__name__)
+
+SHARD_PREFIX = "snapshots/shards/"
+# Content-addressed keys never change, so they can be cached for a year
+SHARD_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def category_slug(category):
+    """Readable, URL-safe key fragment for a category name"""
+    slug = re.sub(r"[^a-z0-9]+", "-", str(category).lower()).strip("-")
+    return slug or "uncategorized"
+
+
+def encode_shard(category, items):
+    """Encode one category's questions deterministically (sorted by id)"""
+    ordered = sorted(items, key=lambda item: item["id"])
+    return to_json_bytes({"category": category, "items": ordered})
+
+
+def shard_key(category, body):
+    """Object key for a shard: category slug plus a hash of its content"""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return f"{SHARD_PREFIX}{category_slug(category)}-{digest}.json"
+
+
+def publish_shard(s3_client, bucket, category, items):
+    """
+    Upload one category shard.
+
+    Returns:
+        Pointer describing the shard: key, site-relative path and count
+    """
+    body = encode_shard(category, items)
+    key = shard_key(category, body)
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=body,
+        ContentType="application/json",
+        CacheControl=SHARD_CACHE_CONTROL,
+    )
+    return {"key": key, "path": "/" + key, "count": len(items)}
+
+
+def read_shard(s3_client, bucket, key):
+    """Items of a published shard"""
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+    return json.loads(response["Body"].read())["items"]
+
+
+def delete_shards(s3_client, bucket, keys):
+    """Remove superseded shards; failures only leave orphaned objects behind"""
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    try:
+        s3_client.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+        )
+    except Exception as e:
+        logger.warning(f"Failed to delete old snapshot shards: {str(e)}")
@@ -0,0 +1,220 @@
+"""
+Stream Processor Lambda
+Keeps derived views of the question bank up to date from the
+InterviewQuestions DynamoDB stream (NEW_AND_OLD_IMAGES), off the admin
+request path.
+
+Views register themselves with one of two decorators:
+- @record_view: called once per change, in stream order; a failure stops
+  the batch and checkpoints just before the failing record. Lambda may
+  replay a change (the retry starts at the failed record, and bisected
+  batches repeat), so these views must be safe to apply twice; counter
+  deltas are guarded by the change's sequence number, recorded on an
+  expiring "__applied__:<id>" item per question.
+- @batch_view: called once with every change that was applied, e.g. to
+  patch snapshot shards. A failure retries the batch from its first
+  applied change, so these views must be idempotent too.
+
+Partial batch failures are reported with ReportBatchItemFailures, so
+Lambda retries from the first unprocessed record instead of replaying the
+whole batch.
+
+reconcile() runs on a schedule and corrects whatever drift the views
+could still accumulate.
+
+Run locally against a recorded or hand-written stream event:
+    python stream_processor.py path/to/event.json
+"""
+
+import lambda_telemetry  # first, so init timing covers every other import
+
+import json
+import sys
+
+from boto3.dynamodb.types import TypeDeserializer
+
+import questions_handler
+import structured_logging
+
+lambda_telemetry.mark_init_phase("imports")
+
+logger = structured_logging.configure()
+
+deserializer = TypeDeserializer()
+
+RECORD_VIEWS = []
+BATCH_VIEWS = []
+
+
+def record_view(name):
+    """Register a view applied to each change in order"""
+
+    def register(view):
+        RECORD_VIEWS.append((name, view))
+        return view
+
+    return register
+
+
+def batch_view(name):
+    """Register an idempotent view applied once per batch"""
+
+    def register(view):
+        BATCH_VIEWS.append((name, view))
+        return view
+
+    return register
+
+
+def deserialize_image(image):
+    """Convert a stream image from DynamoDB JSON into a plain item"""
+    if not image:
+        return None
+    return {key: deserializer.deserialize(value) for key, value in image.items()}
+
+
+def parse_record(record):
+    """
+    Turn a stream record into a change dict.
+
+    Returns:
+        {"event", "id", "old", "new", "sequence_number"}
+    """
+    data = record["dynamodb"]
+    return {
+        "event": record["eventName"],
+        "id": data["Keys"]["id"]["S"],
+        "old": deserialize_image(data.get("OldImage")),
+        "new": deserialize_image(data.get("NewImage")),
+        "sequence_number": data["SequenceNumber"],
+    }
+
+
+def is_bookkeeping_change(change):
+    """
+    True when only internal attributes changed, e.g. a sample key re-rolled
+    by reconcile(); no view depends on those.
+    """
+    old, new = change["old"], change["new"]
+    if not old or not new:
+        return False
+    strip = questions_handler.convert_dynamodb_item
+    return strip(old) == strip(new)
+
+
+@record_view("facets")
+def update_facets(change):
+    """Move the category/difficulty counters by this change, once"""
+    old_items = [change["old"]] if change["old"] else []
+    new_items = [change["new"]] if change["new"] else []
+    questions_handler.adjust_facets(
+        questions_handler.facet_deltas(old_items, new_items),
+        change["id"],
+        change["sequence_number"],
+    )
+
+
+@record_view("sample_pool")
+def update_sample_pool(change):
+    """Keep a question in the random-index pool matching its facets"""
+    item = change["new"]
+    if not item:
+        return
+
+    pool = questions_handler.pool_key(item.get("category"), item.get("difficulty"))
+    if item.get("sample_pool") != pool or "rand" not in item:
+        questions_handler.move_to_pool(change["id"], item)
+
+
+@batch_view("snapshot")
+def refresh_snapshots(changes):
+    """Republish the snapshot shards of every category touched"""
+    questions_handler.apply_snapshot_changes(changes)
+
+
+@lambda_telemetry.instrument
+def handler(event, context):
+    """
+    Apply a batch of stream records to every registered view.
+
+    Returns:
+        batchItemFailures naming the first record that was not applied
+    """
+    changes = []
+    failure = None
+
+    for record in event.get("Records", []):
+        change = parse_record(record)
+
+        # Bookkeeping items (and replay markers expiring) are written by the
+        # views themselves
+        if questions_handler.is_reserved_id(change["id"]):
+            continue
+        if is_bookkeeping_change(change):
+            continue
+
+        try:
+            for name, view in RECORD_VIEWS:
+                view(change)
+        except Exception as e:
+            logger.error(
+                f"View {name} failed for {change['id']}: {str(e)}",
+                exc_info=True,
+            )
+            failure = change["sequence_number"]
+            break
+
+        changes.append(change)
+
+    if changes:
+        for name, view in BATCH_VIEWS:
+            try:
+                view(changes)
+            except Exception as e:
+                logger.error(f"View {name} failed: {str(e)}", exc_info=True)
+                # Replay the whole batch; the record views skip what they
+                # already applied
+                failure = changes[0]["sequence_number"]
+
+    logger.info(
+        f"Applied {len(changes)} changes"
+        + (f", retrying from {failure}" if failure else "")
+    )
+
+    if failure:
+        return {"batchItemFailures": [{"itemIdentifier": failure}]}
+    return {"batchItemFailures": []}
+
+
+@lambda_telemetry.instrument
+def reconcile(event, context):
+    """
+    Scheduled check of the derived views against the table: corrects facet
+    counter drift, normalizes difficulties stored in another case, re-rolls
+    the random-index sample keys, puts questions missing a sample key
+    (written before random sampling existed) into the random index and
+    republishes every snapshot shard from a consistent scan.
+    """
+    drift = questions_handler.reconcile_facets()
+    # After the counters are checked: the stream moves them for these edits
+    normalized = questions_handler.normalize_stored_difficulties()
+    rerolled = questions_handler.reroll_sample_keys()
+    keyed = questions_handler.backfill_sample_keys()
+    if questions_handler.SNAPSHOT_BUCKET:
+        questions_handler.rebuild_snapshot()
+    logger.info(
+        f"Reconciled facet counters, {len(drift)} corrected; "
+        f"{normalized} difficulties normalized; "
+        f"{rerolled} sample keys re-rolled, {keyed} questions given sample keys"
+    )
+    return {
+        "facet_drift": len(drift),
+        "difficulties_normalized": normalized,
+        "sample_keys_rerolled": rerolled,
+        "sample_keys_backfilled": keyed,
+    }
+
+
+if __name__ == "__main__":
+    with open(sys.argv[1]) as f:
+        print(json.dumps(handler(json.load(f), None), indent=2))
@@ -0,0 +1,65 @@
+"""
+JSON structured logging shared by the Lambda handlers.
+
+The Lambda runtime leaves the root logger at WARNING with a plain-text
+handler, so INFO records (request timings, AWS call stats, cold starts)
+are dropped and extra= fields never printed. Each handler calls
+configure() once at import:
+
+    logger = structured_logging.configure()
+
+which sets the level from LOG_LEVEL and writes every record as one JSON
+object, including the extra fields below.
+"""
+
+import json
+import logging
+import os
+import sys
+
+from serialization import json_default
+
+# extra= fields copied into the JSON record when present
+EXTRA_FIELDS = (
+    "request_id",
+    "path",
+    "method",
+    "error_type",
+    "question_id",
+    "question_count",
+    "timings",
+    "aws_calls",
+    "init_ms",
+    "init_phases",
+    "initialization_type",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        log_data = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+        }
+
+        for field in EXTRA_FIELDS:
+            if hasattr(record, field):
+                log_data[field] = getattr(record, field)
+
+        if record.exc_info:
+            log_data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(log_data, default=json_default)
+
+
+def configure():
+    """Set up the root logger for structured JSON output and return it"""
+    logger = logging.getLogger()
+    logger.setLevel(getattr(logging, os.environ.get("LOG_LEVEL", "INFO")))
+
+    log_handler = logging.StreamHandler(sys.stdout)
+    log_handler.setFormatter(JsonFormatter())
+    logger.handlers = [log_handler]
+    return logger
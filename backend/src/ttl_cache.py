@@ -0,0 +1,71 @@
+"""
+In-process TTL + LRU cache.
+
+Instances are meant to live at module level so entries survive across warm
+Lambda invocations of the same container.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Returned by TTLCache.get when a key is absent or expired
+MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl_seconds"""
+
+    def __init__(self, max_entries=256, ttl_seconds=60.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Returns:
+            The cached value, or MISSING when absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return MISSING
+
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a single key if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
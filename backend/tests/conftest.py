@@ -0,0 +1,21 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_warm_container_state():
+    """Module-level caches survive between invocations, so reset them per test"""
+    questions_handler = sys.modules.get("questions_handler")
+    if questions_handler is not None:
+        questions_handler.reset_caches()
+    # Latency histograms also accumulate across invocations
+    custom_metrics = sys.modules.get("custom_metrics")
+    if custom_metrics is not None:
+        custom_metrics.take_histograms(force=True)
+        for state in custom_metrics.control_state.values():
+            state.clear()
+    evaluation_cache = sys.modules.get("evaluation_cache")
+    if evaluation_cache is not None:
+        evaluation_cache.local_cache.clear()
+    yield
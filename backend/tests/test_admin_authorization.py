@@ -6,6 +6,8 @@ import json
 import os
 from unittest.mock import patch, MagicMock
 
+from botocore.exceptions import ClientError
+
 # Mock boto3 and environment before import
 mock_table = MagicMock()
 mock_dynamodb = MagicMock()
@@ -144,6 +146,42 @@ def test_post_question_as_admin():
     assert body["question_text"] == "What is AWS?"
 
 
+def test_post_and_put_normalize_difficulty():
+    """Test difficulty is stored in its canonical case, since indexes match it exactly"""
+    mock_table.reset_mock()
+    mock_table.put_item.return_value = {}
+    mock_table.update_item.return_value = {"Attributes": {"id": "123", "version": 2}}
+
+    post = create_event(
+        "POST",
+        "/questions",
+        body={"question_text": "What is AWS?", "category": "AWS", "difficulty": "medium "},
+        groups="Admin"
+    )
+    put = create_event("PUT", "/questions/123", body={"difficulty": "HARD"}, groups="Admin")
+
+    assert handler(post, None)["statusCode"] == 201
+    assert handler(put, None)["statusCode"] == 200
+
+    item = mock_table.put_item.call_args[1]["Item"]
+    assert item["difficulty"] == "Medium"
+    assert item["sample_pool"] == '["AWS", "Medium"]'
+    update = next(
+        c[1] for c in mock_table.update_item.call_args_list if c[1]["Key"] == {"id": "123"}
+    )
+    assert update["ExpressionAttributeValues"][":difficulty"] == "Hard"
+
+
+def test_put_question_rejects_non_string_index_keys():
+    """Test PUT can't store a category or difficulty the indexes would reject"""
+    mock_table.reset_mock()
+    for body in ({"category": 5}, {"difficulty": ""}, {"question_text": None}):
+        event = create_event("PUT", "/questions/123", body=body, groups="Admin")
+        response = handler(event, None)
+        assert response["statusCode"] == 400
+    mock_table.update_item.assert_not_called()
+
+
 def test_post_question_as_non_admin():
     """Test POST question fails for non-admin"""
     event = create_event(
@@ -163,16 +201,16 @@ def test_post_question_as_non_admin():
 
 
 def test_put_question_as_admin():
-    """Test PUT question succeeds for admin"""
-    mock_table.get_item.return_value = {
-        "Item": {"id": "123", "question_text": "Old question", "category": "AWS", "difficulty": "Medium"}
+    """Test PUT question succeeds for admin in a single conditional update"""
+    mock_table.reset_mock()
+    mock_table.update_item.return_value = {
+        "Attributes": {"id": "123", "question_text": "Updated question", "category": "AWS", "difficulty": "Hard", "version": 4}
     }
-    mock_table.update_item.return_value = {}
 
     event = create_event(
         "PUT",
         "/questions/123",
-        body={"question_text": "Updated question", "difficulty": "Hard"},
+        body={"question_text": "Updated question", "difficulty": "Hard", "version": 3},
         groups="Admin"
     )
 
@@ -182,6 +220,67 @@ def test_put_question_as_admin():
     response = handler(event, context)
 
     assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["question_text"] == "Updated question"
+    assert body["version"] == 4
+    mock_table.get_item.assert_not_called()
+
+    update = mock_table.update_item.call_args_list[0][1]
+    assert update["ConditionExpression"] == "attribute_exists(#id) AND #version = :expected_version"
+    assert update["ExpressionAttributeValues"][":expected_version"] == 3
+    assert update["ReturnValues"] == "ALL_NEW"
+
+
+def test_put_question_with_stale_version_conflicts():
+    """Test PUT returns 409 when the question changed since it was read"""
+    mock_table.reset_mock()
+    mock_table.update_item.side_effect = ClientError(
+        {
+            "Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"},
+            "Item": {"id": {"S": "123"}, "version": {"N": "5"}},
+        },
+        "UpdateItem",
+    )
+
+    event = create_event("PUT", "/questions/123", body={"question_text": "Q", "version": 4}, groups="Admin")
+    response = handler(event, None)
+    mock_table.update_item.side_effect = None
+
+    assert response["statusCode"] == 409
+    assert json.loads(response["body"])["version"] == 5
+
+
+def test_put_question_rejects_non_object_body():
+    """Test a JSON body that is not an object is a 400, not a crash"""
+    mock_table.reset_mock()
+    event = create_event("PUT", "/questions/123", body=[1], groups="Admin")
+
+    response = handler(event, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == {"error": "Body must be a JSON object"}
+    mock_table.update_item.assert_not_called()
+
+
+def test_put_and_delete_missing_question_return_404():
+    """Test a failed existence check without an item maps to 404"""
+    mock_table.reset_mock()
+    missing = ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}},
+        "UpdateItem",
+    )
+    mock_table.update_item.side_effect = missing
+    mock_table.delete_item.side_effect = missing
+
+    put = create_event("PUT", "/questions/nope", body={"question_text": "Q"}, groups="Admin")
+    delete = create_event("DELETE", "/questions/nope", groups="Admin")
+    put_response = handler(put, None)
+    delete_response = handler(delete, None)
+    mock_table.update_item.side_effect = None
+    mock_table.delete_item.side_effect = None
+
+    assert put_response["statusCode"] == 404
+    assert delete_response["statusCode"] == 404
 
 
 def test_put_question_as_non_admin():
@@ -260,3 +359,243 @@ def test_post_question_missing_required_fields():
 
     assert response["statusCode"] == 400
     assert "Missing required field" in response["body"]
+
+
+def test_admin_write_bumps_bank_version():
+    """Test admin writes bump the version stamp so other containers invalidate"""
+    mock_table.reset_mock()
+    mock_table.update_item.return_value = {"Attributes": {"version": 7}}
+
+    event = create_event(
+        "POST",
+        "/questions",
+        body={"question_text": "What is S3?", "category": "AWS", "difficulty": "Easy"},
+        groups="Admin"
+    )
+
+    context = MagicMock()
+    context.aws_request_id = "test-request-123"
+
+    response = handler(event, context)
+
+    assert response["statusCode"] == 201
+    version_updates = [
+        c for c in mock_table.update_item.call_args_list
+        if c[1]["Key"] == {"id": "__meta__"}
+    ]
+    assert len(version_updates) == 1
+
+
+@patch("questions_handler.SNAPSHOT_BUCKET", "site-bucket")
+@patch("questions_handler.s3")
+def test_admin_writes_leave_derived_views_to_the_stream(mock_s3):
+    """Test POST/PUT/DELETE only write the question and bump the bank version"""
+    mock_table.reset_mock()
+    mock_table.update_item.return_value = {"Attributes": {"version": 2}}
+
+    event = create_event(
+        "POST",
+        "/questions",
+        body={"question_text": "What is S3?", "category": "AWS", "difficulty": "Easy"},
+        groups="Admin"
+    )
+    body = json.loads(handler(event, None)["body"])
+    assert "rand" not in body and "sample_pool" not in body
+
+    mock_table.update_item.return_value = {
+        "Attributes": {"id": "q1", "category": "AWS", "difficulty": "Hard", "version": 2}
+    }
+    event = create_event("PUT", "/questions/q1", body={"difficulty": "Hard"}, groups="Admin")
+    assert handler(event, None)["statusCode"] == 200
+
+    event = create_event("DELETE", "/questions/q1", groups="Admin")
+    assert handler(event, None)["statusCode"] == 204
+
+    touched = {c[1]["Key"]["id"] for c in mock_table.update_item.call_args_list}
+    assert touched == {"q1", "__meta__"}
+    mock_s3.put_object.assert_not_called()
+    mock_table.query.assert_not_called()
+
+
+def test_admin_write_updates_search_index_in_place():
+    """Test writes patch the warm search index instead of forcing a rebuild"""
+    mock_table.reset_mock()
+    mock_table.get_item.return_value = {"Item": {"id": "__meta__", "version": 3}}
+    mock_table.scan.return_value = {
+        "Items": [{"id": "1", "question_text": "Explain Terraform state", "category": "IaC"}]
+    }
+    mock_table.update_item.return_value = {"Attributes": {"version": 4}}
+
+    search = create_event("GET", "/questions/search")
+    search["queryStringParameters"] = {"q": "lambda"}
+    assert json.loads(handler(search, None)["body"])["count"] == 0
+
+    event = create_event(
+        "POST",
+        "/questions",
+        body={"question_text": "What is AWS Lambda?", "category": "AWS", "difficulty": "Easy"},
+        groups="Admin"
+    )
+    assert handler(event, None)["statusCode"] == 201
+
+    body = json.loads(handler(search, None)["body"])
+    assert [item["question_text"] for item in body["items"]] == ["What is AWS Lambda?"]
+    assert mock_table.scan.call_count == 1
+
+
+@patch("questions_handler.dynamodb")
+def test_import_jsonl_as_admin(mock_dynamodb):
+    """Test bulk import validates rows and writes valid ones in batches"""
+    mock_dynamodb.batch_write_item.return_value = {}
+    lines = [
+        json.dumps({"question_text": f"Q{i}", "category": "AWS", "difficulty": "Easy"})
+        for i in range(30)
+    ]
+    lines.insert(3, json.dumps({"question_text": "No category", "difficulty": "Easy"}))
+    lines.insert(5, "{not json")
+
+    event = create_event("POST", "/questions/import", groups="Admin")
+    event["body"] = "\n".join(lines) + "\n"
+    event["headers"] = {"Content-Type": "application/x-ndjson"}
+
+    context = MagicMock()
+    context.aws_request_id = "test-request-123"
+
+    response = handler(event, context)
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["created"] == 30
+    assert body["failed"] == 2
+    assert [r["row"] for r in body["results"]] == list(range(1, 33))
+    assert body["results"][3] == {
+        "row": 4, "status": "error", "error": "Missing required field: category"
+    }
+    assert body["results"][5]["error"].startswith("Invalid JSON")
+
+    # 30 valid rows -> chunks of 25 and 5
+    chunk_sizes = [
+        len(next(iter(c[1]["RequestItems"].values())))
+        for c in mock_dynamodb.batch_write_item.call_args_list
+    ]
+    assert chunk_sizes == [25, 5]
+
+
+@patch("questions_handler.time.sleep")
+@patch("questions_handler.dynamodb")
+def test_import_csv_retries_unprocessed_items(mock_dynamodb, mock_sleep):
+    """Test CSV import retries UnprocessedItems and reports rows still failing"""
+    # The last put request in every call keeps coming back unprocessed
+    mock_dynamodb.batch_write_item.side_effect = lambda RequestItems: {
+        "UnprocessedItems": {k: v[-1:] for k, v in RequestItems.items()}
+    }
+
+    event = create_event("POST", "/questions/import", groups="Admin")
+    event["queryStringParameters"] = {"format": "csv"}
+    event["body"] = (
+        "question_text,category,difficulty,reference_answer\n"
+        "What is EC2?,AWS,Easy,Compute\n"
+        "What is IAM?,AWS,Medium,\n"
+    )
+
+    context = MagicMock()
+    context.aws_request_id = "test-request-123"
+
+    response = handler(event, context)
+
+    body = json.loads(response["body"])
+    assert body["created"] == 1
+    assert body["results"][0]["status"] == "created"
+    assert body["results"][1] == {"row": 2, "status": "error", "error": "Write failed"}
+
+    from questions_handler import BATCH_MAX_ATTEMPTS
+    assert mock_dynamodb.batch_write_item.call_count == BATCH_MAX_ATTEMPTS
+
+
+@patch("questions_handler.record_write")
+@patch("questions_handler.dynamodb")
+def test_import_reports_rejected_chunk_per_row(mock_dynamodb, mock_record_write):
+    """Test a chunk DynamoDB rejects fails its rows without losing the others"""
+    rejected = ClientError(
+        {"Error": {"Code": "ValidationException", "Message": "Bad key"}},
+        "BatchWriteItem",
+    )
+    mock_dynamodb.batch_write_item.side_effect = [rejected, {}]
+    lines = [
+        json.dumps({"question_text": f"Q{i}", "category": "AWS", "difficulty": "Easy"})
+        for i in range(30)
+    ]
+    lines.insert(0, json.dumps({"question_text": "Q", "category": 5, "difficulty": "Easy"}))
+
+    event = create_event("POST", "/questions/import", groups="Admin")
+    event["body"] = "\n".join(lines) + "\n"
+
+    context = MagicMock()
+    context.aws_request_id = "test-request-123"
+
+    response = handler(event, context)
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    # Non-string index keys never reach DynamoDB
+    assert body["results"][0] == {
+        "row": 1, "status": "error", "error": "category must be a non-empty string"
+    }
+    assert body["created"] == 5
+    assert body["failed"] == 26
+    assert body["results"][1]["error"] == "Write failed: ValidationException"
+    assert [r["status"] for r in body["results"][26:]] == ["created"] * 5
+    # The rows that were written still bump the version and search index
+    assert len(mock_record_write.call_args[1]["changed_items"]) == 5
+
+
+def test_import_as_non_admin():
+    """Test bulk import is admin-only"""
+    event = create_event("POST", "/questions/import", groups="Users")
+    event["body"] = json.dumps({"question_text": "Q", "category": "AWS", "difficulty": "Easy"})
+
+    context = MagicMock()
+    context.aws_request_id = "test-request-123"
+
+    response = handler(event, context)
+
+    assert response["statusCode"] == 403
+
+
+@patch("questions_handler.EXPORT_BUCKET", "export-bucket")
+@patch("questions_handler.s3")
+def test_export_as_admin(mock_s3):
+    """Test export streams scan pages to S3 and returns a download URL"""
+    mock_table.reset_mock()
+    mock_table.scan.side_effect = [
+        {"Items": [{"id": "1"}, {"id": "__meta__", "version": 2}], "LastEvaluatedKey": {"id": "1"}},
+        {"Items": [{"id": "2"}]},
+    ]
+    mock_s3.generate_presigned_url.return_value = "https://example.com/export"
+
+    event = create_event("GET", "/questions/export", groups="Admin")
+
+    context = MagicMock()
+    context.aws_request_id = "test-request-123"
+
+    response = handler(event, context)
+    mock_table.scan.side_effect = None
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["count"] == 2
+    assert body["url"] == "https://example.com/export"
+    assert body["key"].endswith("test-request-123.ndjson")
+    assert mock_s3.put_object.call_args[1]["Bucket"] == "export-bucket"
+
+
+def test_export_as_non_admin():
+    """Test export is admin-only"""
+    event = create_event("GET", "/questions/export", groups="Users")
+
+    context = MagicMock()
+    context.aws_request_id = "test-request-123"
+
+    response = handler(event, context)
+
+    assert response["statusCode"] == 403
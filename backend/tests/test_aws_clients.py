@@ -0,0 +1,59 @@
+"""
+Unit tests for the shared AWS client registry
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import aws_clients
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    aws_clients.reset()
+    yield
+    aws_clients.reset()
+
+
+@patch("boto3.client")
+def test_client_is_created_once_with_tuned_config(mock_client):
+    first = aws_clients.client("s3")
+    second = aws_clients.client("s3")
+
+    assert first is second
+    mock_client.assert_called_once()
+    config = mock_client.call_args[1]["config"]
+    assert config.tcp_keepalive is True
+    assert config.retries["mode"] == "adaptive"
+
+
+@patch("boto3.client")
+def test_clients_are_keyed_by_arguments(mock_client):
+    mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+
+    default = aws_clients.client("bedrock-runtime")
+    london = aws_clients.client("bedrock-runtime", region_name="eu-west-2")
+
+    assert default is not london
+    assert aws_clients.client("bedrock-runtime", region_name="eu-west-2") is london
+
+
+def test_service_overrides_keep_shared_defaults():
+    config = aws_clients.config_for("bedrock-runtime")
+
+    assert config.read_timeout == 25
+    assert config.max_pool_connections == aws_clients.BASE_CONFIG.max_pool_connections
+    assert aws_clients.config_for("s3") is aws_clients.BASE_CONFIG
+
+
+@patch("boto3.client")
+def test_lazy_client_defers_creation_until_used(mock_client):
+    proxy = aws_clients.lazy_client("cloudwatch")
+    mock_client.assert_not_called()
+
+    proxy.put_metric_data(Namespace="RoleReady", MetricData=[])
+
+    mock_client.assert_called_once()
+    assert mock_client.call_args[0] == ("cloudwatch",)
+    mock_client.return_value.put_metric_data.assert_called_once()
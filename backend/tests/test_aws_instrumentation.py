@@ -0,0 +1,124 @@
+"""
+Unit tests for botocore event-hook instrumentation, against stubbed clients
+"""
+
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+import aws_instrumentation
+import lambda_telemetry
+import request_timing
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    aws_instrumentation.take_stats()
+    yield
+    aws_instrumentation.take_stats()
+
+
+def instrumented_client(service_name):
+    client = boto3.client(
+        service_name,
+        region_name="eu-west-2",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    aws_instrumentation.install(client.meta.events, service_name)
+    return client
+
+
+def test_dynamodb_calls_request_and_record_consumed_capacity():
+    client = instrumented_client("dynamodb")
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "query",
+            {
+                "Items": [],
+                "ConsumedCapacity": {"TableName": "Questions", "CapacityUnits": 2.5},
+                "ResponseMetadata": {"HTTPStatusCode": 200, "RetryAttempts": 1},
+            },
+            {
+                "TableName": "Questions",
+                "KeyConditionExpression": "id = :id",
+                "ExpressionAttributeValues": {":id": {"S": "q1"}},
+                "ReturnConsumedCapacity": "TOTAL",
+            },
+        )
+        client.query(
+            TableName="Questions",
+            KeyConditionExpression="id = :id",
+            ExpressionAttributeValues={":id": {"S": "q1"}},
+        )
+
+    stats = aws_instrumentation.take_stats()[("dynamodb", "Query")]
+    assert stats["calls"] == 1
+    assert stats["retries"] == 1
+    assert stats["statuses"] == {200: 1}
+    assert stats["capacity"] == {"Questions": 2.5}
+    assert len(stats["durations"]) == 1
+
+
+def test_throttled_calls_are_counted():
+    client = instrumented_client("dynamodb")
+    with Stubber(client) as stubber:
+        stubber.add_client_error(
+            "get_item",
+            service_error_code="ProvisionedThroughputExceededException",
+            http_status_code=400,
+        )
+        with pytest.raises(ClientError):
+            client.get_item(TableName="Questions", Key={"id": {"S": "q1"}})
+
+    stats = aws_instrumentation.take_stats()[("dynamodb", "GetItem")]
+    assert stats["errors"] == 1
+    assert stats["throttles"] == 1
+    assert stats["statuses"] == {400: 1}
+
+
+def test_calls_are_added_to_request_timing():
+    client = instrumented_client("cognito-idp")
+    timer = request_timing.start()
+    try:
+        with Stubber(client) as stubber:
+            stubber.add_response("admin_create_user", {})
+            client.admin_create_user(UserPoolId="pool", Username="a@example.com")
+    finally:
+        request_timing.stop()
+
+    assert "cognito" in timer.phases
+
+
+def test_cloudwatch_is_not_instrumented():
+    client = instrumented_client("cloudwatch")
+    with Stubber(client) as stubber:
+        stubber.add_response("put_metric_data", {})
+        client.put_metric_data(Namespace="RoleReady", MetricData=[])
+
+    assert aws_instrumentation.take_stats() == {}
+
+
+@patch("custom_metrics.emit_metric")
+@patch("custom_metrics.record_distribution")
+def test_invocation_reports_aws_calls(mock_record, mock_emit):
+    aws_instrumentation.record_call(
+        "dynamodb", "Scan", 40.0, 200, 2, None, {"Questions": 10.0}
+    )
+    aws_instrumentation.record_call(
+        "dynamodb", "Scan", 35.0, 400, 0, "ThrottlingException", {}
+    )
+
+    lambda_telemetry.report_aws_calls()
+
+    emitted = {c[0][0]: c[0][1] for c in mock_emit.call_args_list}
+    assert emitted["AWSCalls"] == 2
+    assert emitted["AWSRetries"] == 2
+    assert emitted["AWSThrottles"] == 1
+    assert emitted["AWSErrors"] == 1
+    assert emitted["DynamoDBConsumedCapacity"] == 10.0
+    assert [c[0][1] for c in mock_record.call_args_list] == [40.0, 35.0]
+    assert aws_instrumentation.take_stats() == {}
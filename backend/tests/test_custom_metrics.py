@@ -2,10 +2,17 @@
 Unit tests for custom CloudWatch metrics module
 """
 
+import json
+
 import pytest
 from unittest.mock import Mock, patch, call
 from custom_metrics import (
+    MAX_DATUMS_PER_CALL,
+    buffered_metrics,
+    HISTOGRAM_PRECISION,
+    emf_documents,
     emit_metric,
+    flush_metrics,
     QuestionsMetrics,
     EvaluationMetrics,
     SystemMetrics,
@@ -46,6 +53,183 @@ def test_emit_metric_handles_errors(mock_cloudwatch):
     emit_metric('TestMetric', 1, 'Count')
 
 
+@patch('custom_metrics.cloudwatch')
+def test_buffered_metrics_flush_once_at_end(mock_cloudwatch):
+    """Test datapoints inside a buffered block are sent together on exit"""
+    with buffered_metrics():
+        emit_metric('APILatency', 12, 'Milliseconds', [{'Name': 'Operation', 'Value': 'List'}])
+        emit_metric('APILatency', 12, 'Milliseconds', [{'Name': 'Operation', 'Value': 'List'}])
+        emit_metric('APILatency', 30, 'Milliseconds', [{'Name': 'Operation', 'Value': 'List'}])
+        emit_metric('QuestionsRetrieved', 15, 'Count')
+        mock_cloudwatch.put_metric_data.assert_not_called()
+
+    mock_cloudwatch.put_metric_data.assert_called_once()
+    datums = mock_cloudwatch.put_metric_data.call_args[1]['MetricData']
+    assert len(datums) == 2
+    latency = datums[0]
+    assert latency['Values'] == [12, 30] and latency['Counts'] == [2, 1]
+    assert latency['Dimensions'] == [{'Name': 'Operation', 'Value': 'List'}]
+    assert 'Dimensions' not in datums[1]
+
+
+@patch('custom_metrics.cloudwatch')
+def test_buffered_metrics_flush_when_block_raises(mock_cloudwatch):
+    """Test buffered metrics still go out on error paths"""
+    with pytest.raises(RuntimeError):
+        with buffered_metrics():
+            emit_metric('EvaluationFailure', 1, 'Count')
+            raise RuntimeError('boom')
+
+    mock_cloudwatch.put_metric_data.assert_called_once()
+
+
+@patch('custom_metrics.cloudwatch')
+def test_buffered_metrics_respect_batch_limit(mock_cloudwatch):
+    """Test flushes are split at the PutMetricData datum limit"""
+    with buffered_metrics():
+        for i in range(MAX_DATUMS_PER_CALL + 1):
+            emit_metric(f'Metric{i}', 1, 'Count')
+
+    assert mock_cloudwatch.put_metric_data.call_count == 2
+    sizes = [len(c[1]['MetricData']) for c in mock_cloudwatch.put_metric_data.call_args_list]
+    assert sizes == [MAX_DATUMS_PER_CALL, 1]
+
+
+@patch('custom_metrics.METRICS_BACKEND', 'emf')
+@patch('custom_metrics.cloudwatch')
+def test_emf_backend_writes_log_lines_instead_of_calling_api(mock_cloudwatch, capsys):
+    """Test the EMF backend emits one JSON document per dimension set"""
+    operation = [{'Name': 'Operation', 'Value': 'ListQuestions'}]
+    with buffered_metrics():
+        emit_metric('APILatency', 12.5, 'Milliseconds', operation)
+        emit_metric('APILatency', 30.0, 'Milliseconds', operation)
+        QuestionsMetrics.questions_retrieved(15)
+
+    mock_cloudwatch.put_metric_data.assert_not_called()
+    documents = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(documents) == 2
+
+    latency = documents[0]
+    directive = latency['_aws']['CloudWatchMetrics'][0]
+    assert directive['Namespace'] == NAMESPACE
+    assert directive['Dimensions'] == [['Operation']]
+    assert directive['Metrics'] == [{'Name': 'APILatency', 'Unit': 'Milliseconds'}]
+    assert latency['Operation'] == 'ListQuestions'
+    assert latency['APILatency'] == [12.5, 30.0]
+
+    retrieved = documents[1]
+    assert retrieved['_aws']['CloudWatchMetrics'][0]['Dimensions'] == [[]]
+    assert retrieved['QuestionsRetrieved'] == 15
+
+
+@patch('custom_metrics.METRICS_BACKEND', 'emf')
+def test_emf_documents_respect_value_limit():
+    """Test a metric with more than 100 values spills into another document"""
+    with patch('custom_metrics.write_emf') as mock_write:
+        with buffered_metrics():
+            for i in range(150):
+                emit_metric('SearchResultCount', i, 'Count')
+
+    documents = emf_documents(mock_write.call_args[0][0])
+    assert [len(d['SearchResultCount']) for d in documents] == [100, 50]
+
+
+@patch('custom_metrics.cloudwatch')
+def test_latency_histogram_aggregates_across_invocations(mock_cloudwatch):
+    """Test latency samples from several invocations go out as one datum"""
+    for latency in (100.0, 101.0, 250.0):
+        with buffered_metrics():
+            QuestionsMetrics.api_latency(latency, 'GetQuestion')
+    mock_cloudwatch.put_metric_data.assert_not_called()
+
+    flush_metrics(force_histograms=True)
+
+    datums = mock_cloudwatch.put_metric_data.call_args[1]['MetricData']
+    assert len(datums) == 1
+    datum = datums[0]
+    assert datum['MetricName'] == 'APILatency'
+    assert datum['Dimensions'] == [{'Name': 'Operation', 'Value': 'GetQuestion'}]
+    # 100 and 101 share a bucket; each value stays within the bucket precision
+    assert datum['Counts'] == [2, 1]
+    assert datum['Values'][0] == pytest.approx(100.5, rel=HISTOGRAM_PRECISION)
+    assert datum['Values'][1] == pytest.approx(250.0, rel=HISTOGRAM_PRECISION)
+
+
+@patch('custom_metrics.HISTOGRAM_FLUSH_SECONDS', 0)
+@patch('custom_metrics.cloudwatch')
+def test_latency_histogram_flushes_when_due(mock_cloudwatch):
+    """Test histograms are sent with the invocation once their age is reached"""
+    with buffered_metrics():
+        EvaluationMetrics.ai_response_time(2500.0)
+
+    datum = mock_cloudwatch.put_metric_data.call_args[1]['MetricData'][0]
+    assert datum['MetricName'] == 'MarcusResponseTime'
+    assert datum['Counts'] == [1]
+
+
+@patch('custom_metrics.HISTOGRAM_MAX_BUCKETS', 2)
+@patch('custom_metrics.cloudwatch')
+def test_latency_histogram_flushes_when_large(mock_cloudwatch):
+    """Test histograms are sent early once they hold enough distinct buckets"""
+    with buffered_metrics():
+        QuestionsMetrics.api_latency(10.0, 'GetQuestion')
+    mock_cloudwatch.put_metric_data.assert_not_called()
+
+    with buffered_metrics():
+        QuestionsMetrics.api_latency(500.0, 'GetQuestion')
+    mock_cloudwatch.put_metric_data.assert_called_once()
+
+
+@patch('custom_metrics.random.random', return_value=0.1)
+@patch('custom_metrics.cloudwatch')
+def test_sampled_counts_are_scaled_up(mock_cloudwatch, mock_random):
+    """Test a kept sample of a Count metric stands in for the dropped ones"""
+    QuestionsMetrics.question_viewed('q1', 'AWS')
+
+    datum = mock_cloudwatch.put_metric_data.call_args[1]['MetricData'][0]
+    assert datum['MetricName'] == 'QuestionViewed'
+    assert datum['Value'] == 4.0
+
+    mock_random.return_value = 0.9
+    QuestionsMetrics.question_viewed('q1', 'AWS')
+    assert mock_cloudwatch.put_metric_data.call_count == 1
+
+
+@patch.dict('custom_metrics.METRIC_CONTROLS', {
+    'Tagged': {'dimensions': ['Category'], 'max_dimension_values': 1}
+})
+@patch('custom_metrics.cloudwatch')
+def test_dimension_allowlist_and_value_cap(mock_cloudwatch):
+    """Test unlisted dimensions are dropped and excess values become Other"""
+    emit_metric('Tagged', 1, 'Count', [
+        {'Name': 'Category', 'Value': 'AWS'},
+        {'Name': 'QuestionId', 'Value': 'q1'},
+    ])
+    emit_metric('Tagged', 1, 'Count', [{'Name': 'Category', 'Value': 'IaC'}])
+
+    sent = [c[1]['MetricData'][0]['Dimensions'] for c in mock_cloudwatch.put_metric_data.call_args_list]
+    assert sent == [
+        [{'Name': 'Category', 'Value': 'AWS'}],
+        [{'Name': 'Category', 'Value': 'Other'}],
+    ]
+
+
+@patch.dict('custom_metrics.METRIC_CONTROLS', {'Capped': {'max_per_minute': 2}})
+@patch('custom_metrics.time.time', return_value=600.0)
+@patch('custom_metrics.cloudwatch')
+def test_rate_cap_carries_suppressed_counts(mock_cloudwatch, mock_time):
+    """Test datapoints over the cap are dropped but their counts are kept"""
+    for _ in range(4):
+        emit_metric('Capped', 1, 'Count')
+    assert mock_cloudwatch.put_metric_data.call_count == 2
+
+    mock_time.return_value = 660.0
+    emit_metric('Capped', 1, 'Count')
+
+    values = [c[1]['MetricData'][0]['Value'] for c in mock_cloudwatch.put_metric_data.call_args_list]
+    assert values == [1, 1, 3]
+
+
 @patch('custom_metrics.emit_metric')
 def test_questions_retrieved(mock_emit):
     """Test QuestionsRetrieved metric"""
@@ -83,12 +267,12 @@ def test_question_not_found(mock_emit):
     mock_emit.assert_called_once_with('QuestionNotFound', 1, 'Count')
 
 
-@patch('custom_metrics.emit_metric')
-def test_api_latency(mock_emit):
-    """Test APILatency metric"""
+@patch('custom_metrics.record_distribution')
+def test_api_latency(mock_record):
+    """Test APILatency metric is aggregated as a distribution"""
     QuestionsMetrics.api_latency(150.5, 'GetQuestion')
 
-    mock_emit.assert_called_once_with(
+    mock_record.assert_called_once_with(
         'APILatency',
         150.5,
         'Milliseconds',
@@ -96,6 +280,40 @@ def test_api_latency(mock_emit):
     )
 
 
+@patch('custom_metrics.emit_metric')
+def test_questions_imported(mock_emit):
+    """Test QuestionsImported metric"""
+    QuestionsMetrics.questions_imported(42)
+
+    mock_emit.assert_called_once_with('QuestionsImported', 42, 'Count')
+
+
+@patch('custom_metrics.emit_metric')
+def test_cache_hit(mock_emit):
+    """Test CacheHit metric"""
+    QuestionsMetrics.cache_hit('List')
+
+    mock_emit.assert_called_once_with(
+        'CacheHit',
+        1,
+        'Count',
+        [{'Name': 'Cache', 'Value': 'List'}]
+    )
+
+
+@patch('custom_metrics.emit_metric')
+def test_cache_miss(mock_emit):
+    """Test CacheMiss metric"""
+    QuestionsMetrics.cache_miss('Item')
+
+    mock_emit.assert_called_once_with(
+        'CacheMiss',
+        1,
+        'Count',
+        [{'Name': 'Cache', 'Value': 'Item'}]
+    )
+
+
 @patch('custom_metrics.emit_metric')
 def test_search_performed(mock_emit):
     """Test SearchPerformed metric"""
@@ -162,12 +380,12 @@ def test_evaluation_failure(mock_emit):
     )
 
 
-@patch('custom_metrics.emit_metric')
-def test_ai_response_time(mock_emit):
-    """Test MarcusResponseTime metric"""
+@patch('custom_metrics.record_distribution')
+def test_ai_response_time(mock_record):
+    """Test MarcusResponseTime metric is aggregated as a distribution"""
     EvaluationMetrics.ai_response_time(2543.7)
 
-    mock_emit.assert_called_once_with('MarcusResponseTime', 2543.7, 'Milliseconds')
+    mock_record.assert_called_once_with('MarcusResponseTime', 2543.7, 'Milliseconds')
 
 
 @patch('custom_metrics.emit_metric')
@@ -234,7 +452,33 @@ def test_cold_start(mock_emit):
     """Test ColdStart metric"""
     SystemMetrics.cold_start()
 
-    mock_emit.assert_called_once_with('ColdStart', 1, 'Count')
+    mock_emit.assert_called_once_with('ColdStart', 1, 'Count', [])
+
+
+@patch('custom_metrics.emit_metric')
+def test_cold_start_with_function_name(mock_emit):
+    """Test ColdStart metric is dimensioned by function name when known"""
+    SystemMetrics.cold_start('QuestionsHandler')
+
+    mock_emit.assert_called_once_with(
+        'ColdStart', 1, 'Count', [{'Name': 'FunctionName', 'Value': 'QuestionsHandler'}]
+    )
+
+
+@patch('custom_metrics.emit_metric')
+def test_init_phase_duration(mock_emit):
+    """Test InitPhaseDuration metric carries function and phase dimensions"""
+    SystemMetrics.init_phase_duration('imports', 210.5, 'QuestionsHandler')
+
+    mock_emit.assert_called_once_with(
+        'InitPhaseDuration',
+        210.5,
+        'Milliseconds',
+        [
+            {'Name': 'FunctionName', 'Value': 'QuestionsHandler'},
+            {'Name': 'Phase', 'Value': 'imports'},
+        ],
+    )
 
 
 @patch('custom_metrics.emit_metric')
@@ -242,7 +486,7 @@ def test_memory_usage(mock_emit):
     """Test MemoryUsage metric"""
     SystemMetrics.memory_usage(128.5)
 
-    mock_emit.assert_called_once_with('MemoryUsage', 128.5, 'Megabytes')
+    mock_emit.assert_called_once_with('MemoryUsage', 128.5, 'Megabytes', [])
 
 
 @patch('custom_metrics.emit_metric')
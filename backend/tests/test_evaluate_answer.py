@@ -5,7 +5,7 @@ import sys
 import os
 
 # Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 from evaluate_answer import handler
 
 
@@ -98,3 +98,63 @@ def test_evaluate_answer_strips_markdown(mock_bedrock):
     assert response["statusCode"] == 200
     body = json.loads(response["body"])
     assert body["score"] == 90
+
+
+def bedrock_feedback(score):
+    return {
+        "body": Mock(
+            read=lambda: json.dumps(
+                {
+                    "content": [
+                        {
+                            "text": json.dumps(
+                                {
+                                    "is_correct": True,
+                                    "score": score,
+                                    "marcus_comment": "Nice",
+                                }
+                            )
+                        }
+                    ]
+                }
+            ).encode()
+        )
+    }
+
+
+@patch("evaluate_answer.bedrock")
+def test_resubmitted_answer_is_served_from_cache(mock_bedrock):
+    """Test the same answer (modulo case and spacing) skips Bedrock"""
+    mock_bedrock.invoke_model.return_value = bedrock_feedback(70)
+    first = {
+        "body": json.dumps(
+            {"question": "What is IAM?", "answer": "Identity  and access"}
+        )
+    }
+    again = {
+        "body": json.dumps(
+            {"question": "what is IAM?", "answer": "identity and access "}
+        )
+    }
+
+    miss = handler(first, Mock())
+    hit = handler(again, Mock())
+
+    assert mock_bedrock.invoke_model.call_count == 1
+    assert json.loads(miss["body"])["cached"] is False
+    body = json.loads(hit["body"])
+    assert body["cached"] is True
+    assert body["score"] == 70
+    assert hit["headers"]["X-Cache"] == "Hit"
+
+
+@patch("evaluate_answer.bedrock")
+def test_different_competency_is_evaluated_again(mock_bedrock):
+    """Test the competency is part of the cache key"""
+    mock_bedrock.invoke_model.return_value = bedrock_feedback(60)
+    body = {"question": "What is IAM?", "answer": "Identity and access"}
+
+    handler({"body": json.dumps({**body, "competency_type": "security"})}, Mock())
+    handler({"body": json.dumps({**body, "competency_type": "networking"})}, Mock())
+
+    assert mock_bedrock.invoke_model.call_count == 2
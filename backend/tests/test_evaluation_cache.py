@@ -0,0 +1,68 @@
+"""
+Unit tests for the Marcus evaluation cache
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import evaluation_cache
+
+
+def test_cache_key_ignores_case_and_spacing():
+    a = evaluation_cache.cache_key("What is S3?", "Object  storage", "AWS", "model-a")
+    b = evaluation_cache.cache_key(
+        " what is s3? ", "object storage\n", "aws", "model-a"
+    )
+
+    assert a == b
+    assert len(a) == 64
+
+
+def test_cache_key_depends_on_model_and_answer():
+    base = evaluation_cache.cache_key("Q", "A", "general", "model-a")
+
+    assert evaluation_cache.cache_key("Q", "A", "general", "model-b") != base
+    assert evaluation_cache.cache_key("Q", "B", "general", "model-a") != base
+
+
+@patch("evaluation_cache.CACHE_TABLE", None)
+def test_local_tier_without_table():
+    evaluation_cache.store("k1", {"score": 80}, "model-a")
+
+    assert evaluation_cache.lookup("k1") == ({"score": 80}, "local")
+    assert evaluation_cache.lookup("k2") == (None, None)
+
+
+@patch("evaluation_cache.CACHE_TABLE", "evaluation-cache")
+@patch("evaluation_cache.dynamodb")
+def test_dynamodb_tier_is_written_with_ttl_and_read_back(mock_dynamodb):
+    evaluation_cache.store("k1", {"score": 80}, "model-a")
+
+    item = mock_dynamodb.put_item.call_args[1]["Item"]
+    assert item["key"] == {"S": "k1"}
+    assert json.loads(item["feedback"]["S"]) == {"score": 80}
+    assert int(item["expires_at"]["N"]) > time.time()
+
+    # Another container only has the shared tier
+    evaluation_cache.local_cache.clear()
+    mock_dynamodb.get_item.return_value = {"Item": item}
+
+    assert evaluation_cache.lookup("k1") == ({"score": 80}, "dynamodb")
+    assert evaluation_cache.lookup("k1") == ({"score": 80}, "local")
+    assert mock_dynamodb.get_item.call_count == 1
+
+
+@patch("evaluation_cache.CACHE_TABLE", "evaluation-cache")
+@patch("evaluation_cache.dynamodb")
+def test_expired_and_failed_reads_are_misses(mock_dynamodb):
+    mock_dynamodb.get_item.return_value = {
+        "Item": {
+            "feedback": {"S": "{}"},
+            "expires_at": {"N": str(int(time.time()) - 1)},
+        }
+    }
+    assert evaluation_cache.lookup("k1") == (None, None)
+
+    mock_dynamodb.get_item.side_effect = Exception("throttled")
+    assert evaluation_cache.lookup("k1") == (None, None)
@@ -0,0 +1,105 @@
+"""
+Unit tests for cold-start and per-invocation telemetry
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import lambda_telemetry
+
+
+@pytest.fixture
+def cold_container(monkeypatch):
+    """A container that has not served an invocation, with known init marks"""
+    start = lambda_telemetry.INIT_STARTED
+    monkeypatch.setattr(lambda_telemetry, "state", {"warm": False})
+    monkeypatch.setattr(
+        lambda_telemetry,
+        "init_phases",
+        [("imports", start + 0.2), ("clients", start + 0.25), ("handler", start + 0.26)],
+    )
+
+
+def metric_calls(mock_emit, name):
+    return [c[0] for c in mock_emit.call_args_list if c[0][0] == name]
+
+
+def test_init_phase_durations_accumulate_repeated_phases(monkeypatch):
+    start = lambda_telemetry.INIT_STARTED
+    monkeypatch.setattr(
+        lambda_telemetry,
+        "init_phases",
+        [("imports", start + 0.1), ("handler", start + 0.15), ("imports", start + 0.2)],
+    )
+
+    durations = dict(lambda_telemetry.init_phase_durations())
+
+    assert list(durations) == ["imports", "handler"]
+    assert durations["imports"] == pytest.approx(150)
+    assert durations["handler"] == pytest.approx(50)
+
+
+@patch("custom_metrics.emit_metric")
+def test_first_invocation_reports_cold_start_once(mock_emit, cold_container):
+    handler = lambda_telemetry.instrument(lambda event, context: {"statusCode": 200})
+    context = MagicMock(function_name="QuestionsHandler")
+
+    response = handler({}, context)
+    assert response["statusCode"] == 200
+    assert "total;dur=" in response["headers"]["Server-Timing"]
+    handler({}, context)
+
+    dimension = {"Name": "FunctionName", "Value": "QuestionsHandler"}
+    assert len(metric_calls(mock_emit, "ColdStart")) == 1
+    init = metric_calls(mock_emit, "InitDuration")[0]
+    # Init ends at the last mark, including the one made by instrument()
+    assert init[1] == pytest.approx(
+        sum(ms for _, ms in lambda_telemetry.init_phase_durations())
+    )
+    phases = [c[3][1]["Value"] for c in metric_calls(mock_emit, "InitPhaseDuration")]
+    assert phases == ["imports", "clients", "handler"]
+    memory = metric_calls(mock_emit, "MemoryUsage")
+    assert len(memory) == 2
+    assert memory[0][1] > 0 and memory[0][3] == [dimension]
+
+
+@patch("custom_metrics.emit_metric")
+def test_memory_is_reported_when_the_handler_raises(mock_emit, cold_container):
+    def failing(event, context):
+        raise RuntimeError("boom")
+
+    handler = lambda_telemetry.instrument(failing)
+
+    with pytest.raises(RuntimeError):
+        handler({}, None)
+
+    assert len(metric_calls(mock_emit, "MemoryUsage")) == 1
+
+
+@patch("custom_metrics.emit_metric")
+def test_memory_peak_is_reset_for_each_invocation(mock_emit, cold_container):
+    def allocating(event, context):
+        if event.get("allocate"):
+            block = bytearray(64 * 1024 * 1024)
+            block[::4096] = b"x" * len(block[::4096])  # touch every page
+        return {"statusCode": 200}
+
+    handler = lambda_telemetry.instrument(allocating)
+    handler({"allocate": True}, None)
+    handler({}, None)
+
+    large, small = [c[1] for c in metric_calls(mock_emit, "MemoryUsage")]
+    # The second invocation must not inherit the first one's peak
+    assert large - small > 48
+
+
+@patch("custom_metrics.emit_metric")
+def test_memory_is_not_reported_without_proc(mock_emit, cold_container, monkeypatch):
+    monkeypatch.setattr(lambda_telemetry, "CLEAR_REFS_PATH", "/nonexistent/clear_refs")
+    handler = lambda_telemetry.instrument(lambda event, context: {"statusCode": 200})
+
+    handler({}, None)
+
+    assert lambda_telemetry.reset_peak_rss() is False
+    assert metric_calls(mock_emit, "MemoryUsage") == []
@@ -0,0 +1,60 @@
+"""
+Unit tests for the streaming NDJSON export
+"""
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from question_export import export_questions
+
+
+def make_s3():
+    s3 = MagicMock()
+    s3.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    s3.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+    return s3
+
+
+def test_small_export_uses_single_put():
+    s3 = make_s3()
+    pages = [[{"id": "1"}, {"id": "2"}], [{"id": "3"}]]
+
+    count = export_questions(pages, s3, "bucket", "export.ndjson")
+
+    assert count == 3
+    s3.create_multipart_upload.assert_not_called()
+    body = s3.put_object.call_args[1]["Body"].decode()
+    assert [json.loads(line)["id"] for line in body.splitlines()] == ["1", "2", "3"]
+
+
+def test_large_export_streams_parts():
+    s3 = make_s3()
+    pages = ([{"id": str(i), "question_text": "x" * 40}] for i in range(10))
+
+    count = export_questions(pages, s3, "bucket", "export.ndjson", part_size=100)
+
+    assert count == 10
+    # Every part is uploaded as soon as the buffer fills up
+    part_sizes = [len(c[1]["Body"]) for c in s3.upload_part.call_args_list]
+    assert all(size >= 100 for size in part_sizes[:-1])
+    parts = s3.complete_multipart_upload.call_args[1]["MultipartUpload"]["Parts"]
+    assert [p["PartNumber"] for p in parts] == list(range(1, len(part_sizes) + 1))
+    s3.put_object.assert_not_called()
+
+
+def test_failed_export_aborts_upload():
+    s3 = make_s3()
+
+    def pages():
+        yield [{"id": str(i), "question_text": "x" * 100} for i in range(3)]
+        raise RuntimeError("scan failed")
+
+    with pytest.raises(RuntimeError):
+        export_questions(pages(), s3, "bucket", "export.ndjson", part_size=100)
+
+    s3.abort_multipart_upload.assert_called_once_with(
+        Bucket="bucket", Key="export.ndjson", UploadId="upload-1"
+    )
+    s3.complete_multipart_upload.assert_not_called()
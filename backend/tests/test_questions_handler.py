@@ -1,7 +1,12 @@
 import json
 import os
 import sys
-from unittest.mock import patch, MagicMock
+from decimal import Decimal
+from unittest.mock import ANY, patch, MagicMock
+
+import boto3
+import pytest
+from botocore.stub import Stubber
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -27,6 +32,18 @@ def test_handler_hello_endpoint():
     assert body["message"] == "Hello from Lambda!"
 
 
+def test_handler_returns_server_timing():
+    """Test responses carry the request's phase timings"""
+    response = handler({"path": "/testing"}, {})
+
+    phases = [
+        entry.split(";")[0]
+        for entry in response["headers"]["Server-Timing"].split(", ")
+    ]
+    assert "serialize" in phases
+    assert phases[-1] == "total"
+
+
 @patch('questions_handler.table')
 def test_get_all_questions(mock_table):
     mock_table.scan.return_value = {
@@ -90,3 +107,760 @@ def test_error_handling(mock_table):
     assert response["statusCode"] == 500
     body = json.loads(response["body"])
     assert "error" in body
+
+
+@patch('questions_handler.table')
+def test_get_questions_page_returns_cursor(mock_table):
+    mock_table.scan.return_value = {
+        'Items': [{'id': '1', 'question_text': 'Q1'}, {'id': '2', 'question_text': 'Q2'}],
+        'LastEvaluatedKey': {'id': '2'},
+    }
+
+    event = {"path": "/questions", "queryStringParameters": {"limit": "2"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert [item["id"] for item in body["items"]] == ['1', '2']
+    assert body["next_cursor"] is not None
+    assert mock_table.scan.call_args[1]["Limit"] == 2
+
+    # The cursor maps back to ExclusiveStartKey on the next request
+    mock_table.scan.return_value = {'Items': [{'id': '3', 'question_text': 'Q3'}]}
+    event["queryStringParameters"] = {"limit": "2", "cursor": body["next_cursor"]}
+    response = handler(event, {})
+
+    body = json.loads(response["body"])
+    assert mock_table.scan.call_args[1]["ExclusiveStartKey"] == {'id': '2'}
+    assert [item["id"] for item in body["items"]] == ['3']
+    assert body["next_cursor"] is None
+
+
+@patch('questions_handler.table')
+def test_get_questions_page_clamps_limit(mock_table):
+    mock_table.scan.return_value = {'Items': []}
+
+    event = {"path": "/questions", "queryStringParameters": {"limit": "100000"}}
+    handler(event, {})
+
+    from questions_handler import MAX_PAGE_SIZE
+    assert mock_table.scan.call_args[1]["Limit"] == MAX_PAGE_SIZE
+
+
+@patch('questions_handler.table')
+def test_get_questions_page_stops_when_out_of_time(mock_table):
+    mock_table.scan.return_value = {
+        'Items': [{'id': '1'}],
+        'LastEvaluatedKey': {'id': '1'},
+    }
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 100
+
+    event = {"path": "/questions", "queryStringParameters": {"limit": "10"}}
+    response = handler(event, context)
+
+    body = json.loads(response["body"])
+    assert mock_table.scan.call_count == 1
+    assert len(body["items"]) == 1
+    assert body["next_cursor"] is not None
+
+
+def test_get_questions_page_invalid_cursor():
+    event = {"path": "/questions", "queryStringParameters": {"cursor": "not-a-cursor"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 400
+
+
+def test_get_questions_page_invalid_limit():
+    event = {"path": "/questions", "queryStringParameters": {"limit": "ten"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 400
+
+
+@patch('questions_handler.table')
+def test_filter_by_category_queries_index(mock_table):
+    mock_table.query.return_value = {
+        'Items': [{'id': '1', 'category': 'AWS', 'difficulty': 'Easy'}]
+    }
+
+    event = {"path": "/questions", "queryStringParameters": {"category": "AWS"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    assert len(json.loads(response["body"])) == 1
+    mock_table.scan.assert_not_called()
+    assert mock_table.query.call_args[1]["IndexName"] == "category-index"
+
+
+@patch('questions_handler.table')
+def test_filter_by_category_and_difficulty_pages_index(mock_table):
+    mock_table.query.return_value = {
+        'Items': [{'id': '1', 'category': 'AWS', 'difficulty': 'Hard'}],
+        'LastEvaluatedKey': {'id': '1', 'category': 'AWS', 'difficulty': 'Hard'},
+    }
+
+    event = {
+        "path": "/questions",
+        "queryStringParameters": {"category": "AWS", "difficulty": "Hard", "limit": "1"},
+    }
+    response = handler(event, {})
+
+    body = json.loads(response["body"])
+    assert body["next_cursor"] is not None
+    mock_table.scan.assert_not_called()
+    call_kwargs = mock_table.query.call_args[1]
+    assert call_kwargs["IndexName"] == "category-difficulty-index"
+    assert call_kwargs["Limit"] == 1
+
+
+@patch('questions_handler.table')
+def test_filter_by_difficulty_only_scans(mock_table):
+    mock_table.scan.return_value = {'Items': []}
+
+    event = {"path": "/questions", "queryStringParameters": {"difficulty": "Easy"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    mock_table.query.assert_not_called()
+    assert "FilterExpression" in mock_table.scan.call_args[1]
+
+
+@patch('questions_handler.DEPLOYED_INDEXES', frozenset({'category-index'}))
+@patch('questions_handler.table')
+def test_combined_filter_before_its_index_is_deployed(mock_table):
+    mock_table.query.return_value = {'Items': []}
+
+    event = {
+        "path": "/questions",
+        "queryStringParameters": {"category": "AWS", "difficulty": "Hard"},
+    }
+    assert handler(event, {})["statusCode"] == 200
+
+    call_kwargs = mock_table.query.call_args[1]
+    assert call_kwargs["IndexName"] == "category-index"
+    assert "FilterExpression" in call_kwargs
+
+
+@patch('questions_handler.DEPLOYED_INDEXES', frozenset())
+@patch('questions_handler.table')
+def test_category_filter_scans_without_indexes(mock_table):
+    mock_table.scan.return_value = {'Items': []}
+
+    event = {"path": "/questions", "queryStringParameters": {"category": "AWS"}}
+    assert handler(event, {})["statusCode"] == 200
+
+    mock_table.query.assert_not_called()
+    assert "FilterExpression" in mock_table.scan.call_args[1]
+
+
+@patch('questions_handler.QuestionsMetrics')
+@patch('questions_handler.table')
+def test_list_is_served_from_cache(mock_table, mock_metrics):
+    mock_table.scan.return_value = {'Items': [{'id': '1', 'question_text': 'Q1'}]}
+    mock_table.get_item.return_value = {'Item': {'id': '__meta__', 'version': 3}}
+
+    first = handler({"path": "/questions"}, {})
+    second = handler({"path": "/questions"}, {})
+
+    assert first["body"] == second["body"]
+    assert mock_table.scan.call_count == 1
+    mock_metrics.cache_miss.assert_called_once_with("List")
+    mock_metrics.cache_hit.assert_called_once_with("List")
+
+
+@patch('questions_handler.table')
+def test_missing_question_is_negatively_cached(mock_table):
+    mock_table.get_item.return_value = {}
+
+    handler({"path": "/questions/999"}, {})
+    response = handler({"path": "/questions/999"}, {})
+
+    assert response["statusCode"] == 404
+    # One version stamp read plus a single lookup of the missing id
+    item_lookups = [
+        c for c in mock_table.get_item.call_args_list if c[1]["Key"] == {"id": "999"}
+    ]
+    assert len(item_lookups) == 1
+
+
+@patch('questions_handler.table')
+def test_version_bump_from_other_container_invalidates_cache(mock_table):
+    import questions_handler
+
+    mock_table.scan.return_value = {'Items': [{'id': '1'}]}
+    mock_table.get_item.return_value = {'Item': {'id': '__meta__', 'version': 1}}
+    handler({"path": "/questions"}, {})
+
+    # Another container wrote a question and bumped the version stamp
+    mock_table.get_item.return_value = {'Item': {'id': '__meta__', 'version': 2}}
+    questions_handler.cache_state["checked_at"] = 0.0
+    handler({"path": "/questions"}, {})
+
+    assert mock_table.scan.call_count == 2
+
+
+@patch('questions_handler.table')
+def test_meta_item_is_never_returned(mock_table):
+    mock_table.scan.return_value = {
+        'Items': [{'id': '__meta__', 'version': 4}, {'id': '1', 'question_text': 'Q1'}]
+    }
+    mock_table.get_item.return_value = {'Item': {'id': '__meta__', 'version': 4}}
+
+    body = json.loads(handler({"path": "/questions"}, {})["body"])
+    assert [item["id"] for item in body] == ['1']
+
+    response = handler({"path": "/questions/__meta__"}, {})
+    assert response["statusCode"] == 404
+
+
+@patch('questions_handler.table')
+def test_list_returns_etag_and_304_on_match(mock_table):
+    mock_table.scan.return_value = {'Items': [{'id': '1', 'question_text': 'Q1'}]}
+
+    response = handler({"path": "/questions"}, {})
+    etag = response["headers"]["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    event = {"path": "/questions", "headers": {"if-none-match": etag}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 304
+    assert response["body"] == ""
+    assert response["headers"]["ETag"] == etag
+
+
+@patch('questions_handler.table')
+def test_single_question_etag_mismatch_returns_body(mock_table):
+    mock_table.get_item.return_value = {
+        'Item': {'id': '1', 'question_text': 'Q1', 'category': 'AWS'}
+    }
+
+    event = {"path": "/questions/1", "headers": {"If-None-Match": '"stale"'}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["id"] == '1'
+
+    event["headers"]["If-None-Match"] = 'W/' + response["headers"]["ETag"]
+    assert handler(event, {})["statusCode"] == 304
+
+
+@patch('questions_handler.table')
+def test_etag_changes_with_content(mock_table):
+    import questions_handler
+
+    mock_table.scan.return_value = {'Items': [{'id': '1', 'question_text': 'Q1'}]}
+    first = handler({"path": "/questions"}, {})["headers"]["ETag"]
+
+    questions_handler.reset_caches()
+    mock_table.scan.return_value = {'Items': [{'id': '1', 'question_text': 'Q1 v2'}]}
+    second = handler({"path": "/questions"}, {})["headers"]["ETag"]
+
+    assert first != second
+
+
+@patch('questions_handler.SCAN_SEGMENTS', 3)
+@patch('questions_handler.SCAN_MAX_WORKERS', 1)
+def test_full_list_uses_parallel_segmented_scan():
+    # A real resource client, so items go through boto3's own deserialization
+    stub_table = boto3.resource('dynamodb', region_name='us-east-1').Table('test-table')
+
+    def scan_params(segment, start=None):
+        params = {
+            'TableName': 'test-table',
+            'Segment': segment,
+            'TotalSegments': 3,
+            'ProjectionExpression': ANY,
+            'ExpressionAttributeNames': ANY,
+        }
+        if start:
+            params['ExclusiveStartKey'] = {'id': start}
+        return params
+
+    with Stubber(stub_table.meta.client) as stubber:
+        stubber.add_response('get_item', {}, None)
+        stubber.add_response(
+            'scan',
+            {'Items': [{'id': {'S': 'a'}}], 'LastEvaluatedKey': {'id': {'S': 'a'}}},
+            scan_params(0),
+        )
+        stubber.add_response('scan', {'Items': [{'id': {'S': 'b'}}]}, scan_params(0, 'a'))
+        stubber.add_response(
+            'scan',
+            {'Items': [{'id': {'S': 'c'}, 'difficulty': {'S': 'Easy'}}]},
+            scan_params(1),
+        )
+        stubber.add_response(
+            'scan',
+            {'Items': [{'id': {'S': '__meta__'}, 'version': {'N': '0'}}]},
+            scan_params(2),
+        )
+
+        with patch('questions_handler.table', stub_table):
+            response = handler({"path": "/questions"}, {})
+
+        stubber.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    # Merged in segment order, meta item excluded
+    assert body == [{'id': 'a'}, {'id': 'b'}, {'id': 'c', 'difficulty': 'Easy'}]
+
+
+@patch('questions_handler.SCAN_SEGMENTS', 4)
+@patch('questions_handler.table')
+def test_filtered_list_does_not_use_parallel_scan(mock_table):
+    mock_table.query.return_value = {'Items': []}
+
+    handler({"path": "/questions", "queryStringParameters": {"category": "AWS"}}, {})
+
+    mock_table.meta.client.scan.assert_not_called()
+
+
+@patch('questions_handler.table')
+def test_list_defaults_to_summary_projection(mock_table):
+    mock_table.scan.return_value = {'Items': []}
+
+    handler({"path": "/questions"}, {})
+
+    call_kwargs = mock_table.scan.call_args[1]
+    assert set(call_kwargs["ExpressionAttributeNames"].values()) == {
+        "id", "question_text", "category", "difficulty"
+    }
+    assert "reference_answer" not in call_kwargs["ProjectionExpression"]
+
+
+@patch('questions_handler.table')
+def test_list_fields_all_skips_projection(mock_table):
+    mock_table.scan.return_value = {'Items': []}
+
+    handler({"path": "/questions", "queryStringParameters": {"fields": "all"}}, {})
+
+    assert "ProjectionExpression" not in mock_table.scan.call_args[1]
+
+
+@patch('questions_handler.table')
+def test_single_question_with_fields(mock_table):
+    mock_table.get_item.return_value = {'Item': {'id': '1', 'reference_answer': 'A'}}
+
+    event = {
+        "path": "/questions/1",
+        "queryStringParameters": {"fields": "reference_answer"},
+    }
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    call_kwargs = mock_table.get_item.call_args[1]
+    assert call_kwargs["ProjectionExpression"] == "#id, #reference_answer"
+
+
+def test_unknown_field_is_rejected():
+    event = {"path": "/questions", "queryStringParameters": {"fields": "password"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 400
+    assert "Unknown field" in json.loads(response["body"])["error"]
+
+
+@patch('questions_handler.time.sleep')
+@patch('questions_handler.dynamodb')
+@patch('questions_handler.table')
+def test_batch_get_returns_items_in_request_order(mock_table, mock_dynamodb, mock_sleep):
+    mock_table.name = 'test-table'
+    mock_dynamodb.batch_get_item.side_effect = [
+        {
+            'Responses': {'test-table': [{'id': '3'}]},
+            'UnprocessedKeys': {'test-table': {'Keys': [{'id': '1'}]}},
+        },
+        {'Responses': {'test-table': [{'id': '1', 'tags': {'x'}}]}},
+    ]
+
+    event = {
+        "path": "/questions/batch",
+        "httpMethod": "POST",
+        "body": json.dumps({"ids": ['1', '2', '3', '1']}),
+    }
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert [item["id"] for item in body["items"]] == ['1', '3']
+    assert body["missing"] == ['2']
+    assert body["unprocessed"] == []
+    # Unprocessed keys were retried after a backoff
+    assert mock_dynamodb.batch_get_item.call_count == 2
+    mock_sleep.assert_called_once()
+
+
+@patch('questions_handler.dynamodb')
+@patch('questions_handler.table')
+def test_batch_get_chunks_at_100_keys(mock_table, mock_dynamodb):
+    mock_table.name = 'test-table'
+    mock_dynamodb.batch_get_item.return_value = {'Responses': {'test-table': []}}
+
+    ids = [str(i) for i in range(250)]
+    event = {
+        "path": "/questions/batch",
+        "httpMethod": "POST",
+        "body": json.dumps({"ids": ids}),
+    }
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    chunk_sizes = [
+        len(c[1]["RequestItems"]["test-table"]["Keys"])
+        for c in mock_dynamodb.batch_get_item.call_args_list
+    ]
+    assert chunk_sizes == [100, 100, 50]
+    assert len(json.loads(response["body"])["missing"]) == 250
+
+
+def test_batch_get_rejects_too_many_ids():
+    from questions_handler import BATCH_GET_MAX_IDS
+
+    event = {
+        "path": "/questions/batch",
+        "httpMethod": "POST",
+        "body": json.dumps({"ids": [str(i) for i in range(BATCH_GET_MAX_IDS + 1)]}),
+    }
+    response = handler(event, {})
+
+    assert response["statusCode"] == 400
+
+
+def test_batch_get_rejects_missing_ids():
+    event = {"path": "/questions/batch", "httpMethod": "POST", "body": "{}"}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 400
+
+
+@pytest.mark.parametrize("body", [
+    {"ids": ["1"], "fields": ["id", "category"]},
+    {"ids": ["1"], "fields": 3},
+    ["1", "2"],
+])
+def test_batch_get_rejects_malformed_body(body):
+    event = {"path": "/questions/batch", "httpMethod": "POST", "body": json.dumps(body)}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 400
+    assert "error" in json.loads(response["body"])
+
+
+@patch('questions_handler.table')
+def test_search_ranks_and_filters(mock_table):
+    mock_table.scan.return_value = {
+        'Items': [
+            {'id': '1', 'question_text': 'Kubernetes pod scheduling', 'category': 'Kubernetes', 'difficulty': 'Hard'},
+            {'id': '2', 'question_text': 'What is a Kubernetes service?', 'category': 'Kubernetes', 'difficulty': 'Easy'},
+            {'id': '3', 'question_text': 'Secure an S3 bucket', 'category': 'AWS', 'difficulty': 'Easy'},
+        ]
+    }
+
+    event = {"path": "/questions/search", "queryStringParameters": {"q": "kubernetes servce"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert [item["id"] for item in body["items"]] == ['2', '1']
+    assert "ETag" in response["headers"]
+
+    event["queryStringParameters"]["difficulty"] = "Hard"
+    body = json.loads(handler(event, {})["body"])
+    assert [item["id"] for item in body["items"]] == ['1']
+
+    # The index is built once per container
+    assert mock_table.scan.call_count == 1
+
+
+def test_search_requires_query():
+    response = handler({"path": "/questions/search", "queryStringParameters": {"q": " "}}, {})
+    assert response["statusCode"] == 400
+
+    event = {"path": "/questions/search", "queryStringParameters": {"q": "s3", "limit": "0"}}
+    assert handler(event, {})["statusCode"] == 400
+
+
+@patch('questions_handler.table')
+def test_facets_read_counters_with_one_get_item(mock_table):
+    mock_table.get_item.return_value = {
+        'Item': {
+            'counts': {
+                '["AWS", "Easy"]': 3,
+                '["AWS", "Hard"]': 1,
+                '["Kubernetes", "Easy"]': 2,
+                '["IaC", "Medium"]': 0,
+            }
+        }
+    }
+
+    response = handler({"path": "/questions/facets"}, {})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["categories"] == {'AWS': 4, 'Kubernetes': 2}
+    assert body["difficulties"] == {'Easy': 5, 'Hard': 1}
+    assert body["total"] == 6
+    assert {'category': 'AWS', 'difficulty': 'Hard', 'count': 1} in body["combinations"]
+    mock_table.scan.assert_not_called()
+    # Only the counters are read, never the rest of the item
+    assert mock_table.get_item.call_args[1]["ProjectionExpression"] == "#counts"
+
+
+@patch('questions_handler.table')
+def test_facets_backfill_from_scan_when_missing(mock_table):
+    mock_table.get_item.return_value = {}
+    mock_table.scan.return_value = {
+        'Items': [
+            {'id': '1', 'category': 'AWS', 'difficulty': 'Easy'},
+            {'id': '2', 'category': 'AWS', 'difficulty': 'Easy'},
+            {'id': '__meta__', 'version': 3},
+            {'id': '__applied__:1', 'sequence_number': '1'.zfill(64)},
+        ]
+    }
+
+    body = json.loads(handler({"path": "/questions/facets"}, {})["body"])
+
+    assert body["categories"] == {'AWS': 2}
+    item = mock_table.put_item.call_args[1]["Item"]
+    assert item == {'id': '__facets__', 'counts': {'["AWS", "Easy"]': 2}}
+
+
+@patch('questions_handler.table')
+def test_facets_replace_item_in_old_layout(mock_table):
+    """Test a facets item without a counts map is rebuilt, not read"""
+    mock_table.get_item.return_value = {'Item': {}}
+    mock_table.scan.return_value = {
+        'Items': [{'id': '1', 'category': 'AWS', 'difficulty': 'Easy'}]
+    }
+
+    body = json.loads(handler({"path": "/questions/facets"}, {})["body"])
+
+    assert body["total"] == 1
+    put = mock_table.put_item.call_args[1]
+    assert put["ConditionExpression"] == "attribute_not_exists(#counts)"
+
+
+@patch('questions_handler.table')
+def test_facets_merge_difficulties_stored_in_another_case(mock_table):
+    mock_table.get_item.return_value = {
+        'Item': {'counts': {'["AWS", "medium"]': 1, '["AWS", "Medium"]': 2}}
+    }
+
+    body = json.loads(handler({"path": "/questions/facets"}, {})["body"])
+
+    assert body["difficulties"] == {'Medium': 3}
+    assert body["combinations"] == [{'category': 'AWS', 'difficulty': 'Medium', 'count': 3}]
+
+
+@patch('questions_handler.table')
+def test_difficulty_filter_uses_canonical_case(mock_table):
+    mock_table.query.return_value = {'Items': []}
+
+    event = {"path": "/questions", "queryStringParameters": {"category": "AWS", "difficulty": "medium"}}
+    handler(event, {})
+
+    condition = mock_table.query.call_args[1]["KeyConditionExpression"]
+    assert condition.get_expression()["values"][1].get_expression()["values"][1] == "Medium"
+
+
+@patch('questions_handler.record_write')
+@patch('questions_handler.table')
+def test_normalize_stored_difficulties(mock_table, mock_record_write):
+    import questions_handler
+
+    mock_table.scan.return_value = {
+        'Items': [{'id': 'q1', 'difficulty': 'medium'}, {'id': 'q2', 'difficulty': 'Hard'}]
+    }
+    mock_table.update_item.return_value = {
+        'Attributes': {'id': 'q1', 'difficulty': 'Medium', 'rand': Decimal('0.5')}
+    }
+
+    assert questions_handler.normalize_stored_difficulties() == 1
+
+    update = mock_table.update_item.call_args[1]
+    assert update["Key"] == {'id': 'q1'}
+    assert update["ExpressionAttributeValues"][":difficulty"] == 'Medium'
+    # Only rewrites the value the scan saw
+    assert update["ConditionExpression"] == "#difficulty = :stored"
+    assert update["ExpressionAttributeValues"][":stored"] == 'medium'
+    changed = mock_record_write.call_args[1]["changed_items"]
+    assert changed == [{'id': 'q1', 'difficulty': 'Medium'}]
+
+
+def test_allocate_draws_is_exact_and_bounded():
+    from questions_handler import allocate_draws
+
+    allocation = allocate_draws({'a': 2, 'b': 1, 'c': 5}, 4)
+    assert sum(allocation.values()) == 4
+    assert allocation.get('a', 0) <= 2 and allocation.get('b', 0) <= 1
+
+    # Asking for more than exists returns everything
+    assert allocate_draws({'a': 2, 'b': 1}, 10) == {'a': 2, 'b': 1}
+    assert allocate_draws({}, 3) == {}
+
+
+@patch('questions_handler.table')
+def test_random_sample_uses_random_index(mock_table):
+    mock_table.get_item.return_value = {
+        'Item': {'counts': {'["AWS", "Medium"]': 2, '["IaC", "Easy"]': 4}}
+    }
+    pool_items = [
+        {'id': 'a1', 'category': 'AWS', 'rand': Decimal('0.2'), 'sample_pool': '["AWS", "Medium"]'},
+        {'id': 'a2', 'category': 'AWS', 'rand': Decimal('0.7'), 'sample_pool': '["AWS", "Medium"]'},
+    ]
+    queries = []
+
+    def fake_query(**kwargs):
+        assert kwargs['IndexName'] == 'random-index'
+        assert kwargs['Limit'] == 1
+        queries.append(kwargs)
+        return {'Items': [pool_items[len(queries) % 2]]}
+
+    mock_table.query.side_effect = fake_query
+
+    event = {"path": "/questions/random", "queryStringParameters": {"n": "2", "category": "AWS"}}
+    response = handler(event, {})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert sorted(item["id"] for item in body["items"]) == ['a1', 'a2']
+    assert all('rand' not in item and 'sample_pool' not in item for item in body["items"])
+    assert len(queries) == 2
+    mock_table.scan.assert_not_called()
+
+
+def test_random_sample_rejects_bad_size():
+    event = {"path": "/questions/random", "queryStringParameters": {"n": "500"}}
+    assert handler(event, {})["statusCode"] == 400
+
+
+@patch('questions_handler.table')
+def test_random_draw_writes_nothing(mock_table):
+    """Test a learner's random sample is served from reads alone"""
+    mock_table.get_item.return_value = {'Item': {'counts': {'["AWS", "Easy"]': 3}}}
+    mock_table.query.return_value = {
+        'Items': [{'id': 'q1', 'category': 'AWS', 'rand': Decimal('0.25'), 'sample_pool': '["AWS", "Easy"]'}]
+    }
+
+    body = json.loads(handler({"path": "/questions/random", "queryStringParameters": {"n": "1"}}, {})["body"])
+
+    assert [item["id"] for item in body["items"]] == ['q1']
+    mock_table.update_item.assert_not_called()
+    mock_table.put_item.assert_not_called()
+
+
+@patch('questions_handler.table')
+def test_reroll_sample_keys_moves_every_keyed_question(mock_table):
+    import questions_handler
+
+    mock_table.scan.return_value = {'Items': [{'id': 'q1'}, {'id': 'q2'}]}
+
+    assert questions_handler.reroll_sample_keys() == 2
+
+    updates = [c[1] for c in mock_table.update_item.call_args_list]
+    assert [u["Key"] for u in updates] == [{'id': 'q1'}, {'id': 'q2'}]
+    assert all(u["UpdateExpression"] == "SET #rand = :rand" for u in updates)
+    # Deleted or never-keyed questions are left alone
+    assert all(u["ConditionExpression"] == "attribute_exists(#rand)" for u in updates)
+
+
+@patch('questions_handler.DEPLOYED_INDEXES', frozenset({'category-index'}))
+@patch('questions_handler.table')
+def test_random_sample_unavailable_until_index_is_deployed(mock_table):
+    response = handler({"path": "/questions/random"}, {})
+
+    assert response["statusCode"] == 503
+    mock_table.query.assert_not_called()
+
+
+@patch('questions_handler.table')
+def test_random_sample_never_scans_for_unkeyed_questions(mock_table):
+    """Test an empty pool is left to the scheduled backfill, not fixed inline"""
+    mock_table.get_item.return_value = {'Item': {'counts': {'["AWS", "Easy"]': 1}}}
+    mock_table.query.return_value = {'Items': []}
+
+    body = json.loads(handler({"path": "/questions/random"}, {})["body"])
+
+    assert body["items"] == []
+    mock_table.scan.assert_not_called()
+    mock_table.update_item.assert_not_called()
+
+
+@patch('questions_handler.table')
+def test_numeric_and_set_attributes_serialize(mock_table):
+    mock_table.get_item.return_value = {
+        'Item': {
+            'id': '1',
+            'question_text': 'Q1',
+            'category': 'AWS',
+            'version': Decimal('4'),
+            'tags': {'s3', 'iam'},
+            'rand': Decimal('0.5'),
+        }
+    }
+
+    response = handler({"path": "/questions/1"}, {})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["version"] == 4
+    assert body["tags"] == ['iam', 's3']
+    assert 'rand' not in body
+
+
+@patch('questions_handler.SNAPSHOT_BUCKET', 'site-bucket')
+@patch('questions_handler.table')
+def test_snapshot_manifest_lists_published_shards(mock_table):
+    mock_table.get_item.side_effect = [
+        {'Item': {'id': '__meta__', 'version': 2}},
+        {'Item': {'id': '__snapshot__', 'shard:AWS': {'key': 'snapshots/shards/aws-1.json', 'path': '/snapshots/shards/aws-1.json', 'count': Decimal('1')}}},
+    ]
+
+    response = handler({"path": "/questions/snapshot"}, {})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["shards"] == [{'category': 'AWS', 'path': '/snapshots/shards/aws-1.json', 'count': 1}]
+
+
+@patch('questions_handler.SNAPSHOT_BUCKET', 'site-bucket')
+@patch('questions_handler.s3')
+@patch('questions_handler.table')
+def test_snapshot_unavailable_until_first_publish(mock_table, mock_s3):
+    """Test a learner GET never runs the first publish's full scan"""
+    mock_table.get_item.side_effect = [{'Item': {'id': '__meta__', 'version': 2}}, {}]
+
+    response = handler({"path": "/questions/snapshot"}, {})
+
+    assert response["statusCode"] == 503
+    mock_table.scan.assert_not_called()
+    mock_s3.put_object.assert_not_called()
+
+
+@patch('questions_handler.SNAPSHOT_BUCKET', 'site-bucket')
+@patch('questions_handler.s3')
+@patch('questions_handler.table')
+def test_rebuild_snapshot_publishes_every_category(mock_table, mock_s3):
+    import questions_handler
+
+    mock_table.get_item.return_value = {}
+    mock_table.scan.return_value = {
+        'Items': [{'id': '1', 'question_text': 'Q1', 'category': 'AWS', 'difficulty': 'Easy'}]
+    }
+
+    questions_handler.rebuild_snapshot()
+
+    assert mock_s3.put_object.call_args[1]["Bucket"] == 'site-bucket'
+    update = mock_table.update_item.call_args[1]
+    assert update["Key"] == {'id': '__snapshot__'}
+    assert update["ExpressionAttributeNames"] == {'#s0': 'shard:AWS'}
+    scanned = mock_table.scan.call_args[1]["ExpressionAttributeNames"].values()
+    assert "reference_answer" not in scanned
+
+
+def test_snapshot_not_configured():
+    assert handler({"path": "/questions/snapshot"}, {})["statusCode"] == 501
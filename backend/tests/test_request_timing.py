@@ -0,0 +1,53 @@
+"""
+Unit tests for per-request phase timing
+"""
+
+from unittest.mock import patch
+
+import request_timing
+
+
+def test_spans_accumulate_per_phase():
+    timer = request_timing.start()
+    try:
+        with patch("request_timing.time.perf_counter", side_effect=[1.0, 1.002]):
+            with request_timing.span("dynamodb"):
+                pass
+        with patch("request_timing.time.perf_counter", side_effect=[2.0, 2.003]):
+            with request_timing.span("dynamodb"):
+                pass
+        request_timing.record("parse", 0.25)
+    finally:
+        request_timing.stop()
+
+    assert round(timer.phases["dynamodb"], 3) == 5.0
+    assert timer.phases["parse"] == 0.25
+
+
+def test_span_is_a_no_op_outside_a_request():
+    with request_timing.span("serialize"):
+        pass
+    request_timing.record("parse", 1.0)
+
+    assert request_timing.state["timer"] is None
+
+
+def test_server_timing_header_lists_phases_and_total():
+    timer = request_timing.RequestTimer()
+    timer.add("parse", 0.21)
+    timer.add("dynamodb", 12.34)
+
+    response = request_timing.add_server_timing(
+        {"statusCode": 200, "headers": {"Access-Control-Allow-Origin": "*"}}, timer
+    )
+
+    header = response["headers"]["Server-Timing"]
+    assert header.startswith("parse;dur=0.2, dynamodb;dur=12.3, total;dur=")
+    assert response["headers"]["Timing-Allow-Origin"] == "*"
+
+
+def test_non_proxy_responses_are_left_alone():
+    timer = request_timing.RequestTimer()
+    result = {"batchItemFailures": []}
+
+    assert request_timing.add_server_timing(result, timer) == {"batchItemFailures": []}
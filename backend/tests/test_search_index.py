@@ -0,0 +1,90 @@
+"""
+Unit tests for the question search index
+"""
+
+from search_index import SearchIndex, tokenize, within_one_edit
+
+QUESTIONS = [
+    {
+        'id': '1',
+        'question_text': 'How do you secure an S3 bucket?',
+        'category': 'AWS',
+        'difficulty': 'Easy',
+    },
+    {
+        'id': '2',
+        'question_text': 'Explain Kubernetes pod scheduling',
+        'category': 'Kubernetes',
+        'difficulty': 'Hard',
+    },
+    {
+        'id': '3',
+        'question_text': 'What is a Kubernetes service?',
+        'category': 'Kubernetes',
+        'difficulty': 'Easy',
+    },
+    {
+        'id': '4',
+        'question_text': 'Describe Terraform state locking',
+        'category': 'IaC',
+        'difficulty': 'Medium',
+    },
+]
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert tokenize('What is an S3 Bucket?') == ['s3', 'bucket']
+    assert tokenize(None) == []
+
+
+def test_within_one_edit():
+    assert within_one_edit('bucket', 'bucket')
+    assert within_one_edit('bucket', 'buckt')
+    assert within_one_edit('bucket', 'bukcet')
+    assert within_one_edit('bucket', 'bicket')
+    assert not within_one_edit('bucket', 'bkcuet')
+    assert not within_one_edit('bucket', 'bkt')
+
+
+def test_exact_match_ranks_by_bm25():
+    index = SearchIndex.from_items(QUESTIONS)
+
+    results = index.search('kubernetes service')
+
+    # Both mention kubernetes; only one also matches "service"
+    assert [r['id'] for r in results] == ['3', '2']
+    assert results[0]['score'] > results[1]['score']
+    assert results[0]['category'] == 'Kubernetes'
+
+
+def test_prefix_match():
+    index = SearchIndex.from_items(QUESTIONS)
+
+    assert [r['id'] for r in index.search('terra')] == ['4']
+
+
+def test_typo_tolerance():
+    index = SearchIndex.from_items(QUESTIONS)
+
+    assert [r['id'] for r in index.search('buckt')] == ['1']
+    assert index.search('zzzz') == []
+
+
+def test_add_replaces_and_remove_drops():
+    index = SearchIndex.from_items(QUESTIONS)
+
+    index.add({'id': '4', 'question_text': 'Explain S3 lifecycle rules', 'category': 'AWS'})
+    assert index.search('terraform') == []
+    assert {r['id'] for r in index.search('s3')} == {'1', '4'}
+
+    index.remove('1')
+    index.remove('missing')
+    assert [r['id'] for r in index.search('s3')] == ['4']
+    assert len(index) == 3
+
+
+def test_limit():
+    index = SearchIndex.from_items(QUESTIONS)
+
+    assert len(index.search('kubernetes', limit=1)) == 1
+    assert len(index.search('kubernetes', limit=None)) == 2
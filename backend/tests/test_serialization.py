@@ -0,0 +1,45 @@
+"""
+Unit tests for the shared JSON serializer
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+import serialization
+from serialization import json_default, to_json, to_json_bytes
+
+
+def test_decimals_become_ints_or_floats():
+    body = json.loads(to_json({"version": Decimal("3"), "rand": Decimal("0.25")}))
+    assert body == {"version": 3, "rand": 0.25}
+    assert isinstance(body["version"], int)
+
+
+def test_sets_are_sorted_lists():
+    assert json.loads(to_json({"tags": {"b", "a", "c"}})) == {"tags": ["a", "b", "c"]}
+    assert json_default({Decimal("2"), Decimal("1")}) == [Decimal("1"), Decimal("2")]
+
+
+def test_datetimes_use_isoformat():
+    moment = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert json.loads(to_json({"at": moment})) == {"at": "2024-01-02T03:04:05+00:00"}
+
+
+def test_nested_values_are_converted_in_one_pass():
+    data = [{"id": "1", "scores": [Decimal("1.5")], "meta": {"n": Decimal("2")}}]
+    assert json.loads(to_json(data)) == [{"id": "1", "scores": [1.5], "meta": {"n": 2}}]
+
+
+def test_unknown_types_raise():
+    with pytest.raises(TypeError):
+        to_json({"x": object()})
+
+
+def test_stdlib_fallback_is_compact_utf8():
+    with patch.object(serialization, "orjson", None):
+        encoded = to_json_bytes({"q": "café", "n": Decimal("1")})
+    assert encoded == '{"q":"café","n":1}'.encode("utf-8")
@@ -0,0 +1,54 @@
+"""
+Unit tests for static question snapshot shards
+"""
+
+import json
+from unittest.mock import MagicMock
+
+from snapshot_builder import (
+    SHARD_CACHE_CONTROL,
+    category_slug,
+    delete_shards,
+    publish_shard,
+)
+
+
+def test_category_slug():
+    assert category_slug('System Design') == 'system-design'
+    assert category_slug('C++ / Rust') == 'c-rust'
+    assert category_slug('!!!') == 'uncategorized'
+
+
+def test_publish_shard_is_content_addressed_and_immutable():
+    s3 = MagicMock()
+    items = [{'id': 'b', 'question_text': 'Q2'}, {'id': 'a', 'question_text': 'Q1'}]
+
+    pointer = publish_shard(s3, 'site-bucket', 'AWS', items)
+
+    put = s3.put_object.call_args[1]
+    assert put['Key'] == pointer['key']
+    assert pointer['path'] == '/' + pointer['key']
+    assert pointer['key'].startswith('snapshots/shards/aws-')
+    assert pointer['count'] == 2
+    assert put['CacheControl'] == SHARD_CACHE_CONTROL
+    assert [item['id'] for item in json.loads(put['Body'])['items']] == ['a', 'b']
+
+    # Same content, same key regardless of input order
+    again = publish_shard(s3, 'site-bucket', 'AWS', list(reversed(items)))
+    assert again['key'] == pointer['key']
+
+    changed = publish_shard(s3, 'site-bucket', 'AWS', items[:1])
+    assert changed['key'] != pointer['key']
+
+
+def test_delete_shards_batches_and_tolerates_failure():
+    s3 = MagicMock()
+    delete_shards(s3, 'site-bucket', ['k2', 'k1', 'k1'])
+    assert s3.delete_objects.call_args[1]['Delete']['Objects'] == [{'Key': 'k1'}, {'Key': 'k2'}]
+
+    s3.delete_objects.side_effect = Exception('denied')
+    delete_shards(s3, 'site-bucket', ['k1'])
+
+    s3.reset_mock()
+    delete_shards(s3, 'site-bucket', [])
+    s3.delete_objects.assert_not_called()
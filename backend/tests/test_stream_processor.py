@@ -0,0 +1,312 @@
+"""
+Unit tests for the DynamoDB stream processor, driven by a recorded stream event
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+with patch.dict(
+    os.environ,
+    {"TABLE_NAME": "test-table", "AWS_DEFAULT_REGION": "us-east-1"},
+):
+    with patch("boto3.resource", return_value=MagicMock()):
+        import stream_processor
+
+FIXTURE = Path(__file__).parent / "fixtures" / "stream_event.json"
+
+
+def load_event():
+    return json.loads(FIXTURE.read_text())
+
+
+def updates_to(mock_table, item_id):
+    return [
+        c[1] for c in mock_table.update_item.call_args_list
+        if c[1]["Key"] == {"id": item_id}
+    ]
+
+
+def facet_transactions(mock_table):
+    """(marker put, facets update) of each facet counter transaction"""
+    return [
+        [next(iter(action.values())) for action in c[1]["TransactItems"]]
+        for c in mock_table.meta.client.transact_write_items.call_args_list
+    ]
+
+
+def counter_deltas(update):
+    """{combination: delta} from a facets counter update"""
+    names = update["ExpressionAttributeNames"]
+    values = update["ExpressionAttributeValues"]
+    return {
+        names[alias]: values[":d" + alias[2:]]
+        for alias in names
+        if alias.startswith("#f")
+    }
+
+
+@patch("questions_handler.table")
+def test_stream_batch_adjusts_facet_counters(mock_table):
+    """Test each change moves the category/difficulty counters by its images"""
+    result = stream_processor.handler(load_event(), None)
+
+    assert result == {"batchItemFailures": []}
+    transactions = facet_transactions(mock_table)
+    assert [counter_deltas(update) for _, update in transactions] == [
+        {'["AWS", "Easy"]': 1},
+        {'["IaC", "Medium"]': -1, '["IaC", "Hard"]': 1},
+        {'["AWS", "Medium"]': -1},
+    ]
+    marker, update = transactions[1]
+    assert update["Key"] == {"id": "__facets__"}
+    assert update["UpdateExpression"].startswith(
+        "SET #counts.#f0 = if_not_exists(#counts.#f0, :zero) + :d0"
+    )
+    # The guard lives on a per-question item, not on the facets item
+    assert marker["Item"]["id"] == "__applied__:q2"
+    assert marker["Item"]["sequence_number"] == "300".zfill(64)
+    assert marker["Item"]["expires_at"] > 0
+
+
+def test_replayed_changes_move_facet_counters_once():
+    """Test a change retried after a later view failed is not counted twice"""
+    counts = {}
+    markers = {}
+
+    def transact_write_items(TransactItems):
+        # Evaluate the marker's guard the way DynamoDB would
+        marker = TransactItems[0]["Put"]
+        question_id = marker["Item"]["id"]
+        sequence = marker["ExpressionAttributeValues"][":sequence"]
+        if question_id in markers and markers[question_id] >= sequence:
+            raise ClientError(
+                {
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [
+                        {"Code": "ConditionalCheckFailed"},
+                        {"Code": "None"},
+                    ],
+                },
+                "TransactWriteItems",
+            )
+        markers[question_id] = sequence
+        for key, delta in counter_deltas(TransactItems[1]["Update"]).items():
+            counts[key] = counts.get(key, 0) + delta
+
+    def update_item(**kwargs):
+        if kwargs["Key"] == {"id": "q2"} and not failed:
+            failed.append(True)
+            raise ClientError({"Error": {"Code": "InternalServerError"}}, "UpdateItem")
+        return {}
+
+    failed = []
+    with patch("questions_handler.table") as mock_table:
+        mock_table.update_item.side_effect = update_item
+        mock_table.meta.client.transact_write_items.side_effect = transact_write_items
+        event = load_event()
+        first = stream_processor.handler(event, None)
+        # Lambda retries from the failed record; then the whole batch again
+        retry = dict(event, Records=event["Records"][2:])
+        assert stream_processor.handler(retry, None) == {"batchItemFailures": []}
+        assert stream_processor.handler(event, None) == {"batchItemFailures": []}
+
+    assert first == {"batchItemFailures": [{"itemIdentifier": "300"}]}
+    assert counts == {
+        '["IaC", "Medium"]': -1,
+        '["IaC", "Hard"]': 1,
+        '["AWS", "Easy"]': 1,
+        '["AWS", "Medium"]': -1,
+    }
+
+
+def test_counter_errors_other_than_replays_fail_the_record():
+    """Test a transaction conflict is retried rather than treated as a replay"""
+    conflict = ClientError(
+        {
+            "Error": {"Code": "TransactionCanceledException"},
+            "CancellationReasons": [{"Code": "None"}, {"Code": "TransactionConflict"}],
+        },
+        "TransactWriteItems",
+    )
+    with patch("questions_handler.table") as mock_table:
+        mock_table.meta.client.transact_write_items.side_effect = conflict
+        result = stream_processor.handler(load_event(), None)
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "100"}]}
+
+
+@patch("questions_handler.table")
+def test_reconcile_corrects_drift_and_backfills_sample_keys(mock_table):
+    """Test the scheduled reconcile fixes counters and keys unkeyed questions"""
+    mock_table.get_item.return_value = {
+        "Item": {"counts": {'["AWS", "Easy"]': 3, '["IaC", "Hard"]': 1}}
+    }
+    mock_table.scan.return_value = {
+        "Items": [
+            {"id": "q1", "category": "AWS", "difficulty": "Easy"},
+            {"id": "q2", "category": "IaC", "difficulty": "Hard"},
+            {"id": "__applied__:q1", "sequence_number": "1".zfill(64)},
+        ]
+    }
+
+    result = stream_processor.reconcile({}, None)
+
+    assert result == {
+        "facet_drift": 1,
+        "difficulties_normalized": 0,
+        "sample_keys_rerolled": 2,
+        "sample_keys_backfilled": 2,
+    }
+    update = updates_to(mock_table, "__facets__")[0]
+    assert counter_deltas(update) == {'["AWS", "Easy"]': -2}
+    assert update["ConditionExpression"] == "attribute_exists(#counts)"
+
+    # Keys are re-rolled, then questions lacking one join the random index
+    reroll, backfill = updates_to(mock_table, "q2")
+    assert reroll["UpdateExpression"] == "SET #rand = :rand"
+    assert backfill["ExpressionAttributeValues"][":sample_pool"] == '["IaC", "Hard"]'
+    assert backfill["ConditionExpression"] == "attribute_exists(#id)"
+
+
+@patch("questions_handler.table")
+def test_stream_moves_changed_question_to_its_pool(mock_table):
+    """Test only questions whose facets left their random-index pool are moved"""
+    stream_processor.handler(load_event(), None)
+
+    assert not updates_to(mock_table, "q1")
+    move = updates_to(mock_table, "q2")[0]
+    assert move["ExpressionAttributeValues"][":sample_pool"] == '["IaC", "Hard"]'
+    assert move["ExpressionAttributeValues"][":version"] == 4
+
+
+@patch("questions_handler.table")
+def test_stream_skips_reserved_items(mock_table):
+    """Test bookkeeping items written by the views don't feed back into them"""
+    event = load_event()
+    event["Records"] = [event["Records"][1]]
+
+    assert stream_processor.handler(event, None) == {"batchItemFailures": []}
+    mock_table.update_item.assert_not_called()
+
+
+@patch("questions_handler.table")
+def test_stream_skips_replay_markers(mock_table):
+    """Test the facet counters' replay markers (and their expiry) are ignored"""
+    event = load_event()
+    record = event["Records"][3]
+    record["dynamodb"]["Keys"] = {"id": {"S": "__applied__:q3"}}
+    record["dynamodb"]["OldImage"] = {
+        "id": {"S": "__applied__:q3"},
+        "sequence_number": {"S": "400".zfill(64)},
+    }
+    event["Records"] = [record]
+
+    assert stream_processor.handler(event, None) == {"batchItemFailures": []}
+    mock_table.meta.client.transact_write_items.assert_not_called()
+
+
+@patch("questions_handler.SNAPSHOT_BUCKET", "site-bucket")
+@patch("questions_handler.s3")
+@patch("questions_handler.table")
+def test_stream_ignores_rerolled_sample_keys(mock_table, mock_s3):
+    """Test a re-rolled rand key changes no view"""
+    event = load_event()
+    record = event["Records"][0]
+    record["eventName"] = "MODIFY"
+    record["dynamodb"]["OldImage"] = dict(record["dynamodb"]["NewImage"], rand={"N": "0.9"})
+    event["Records"] = [record]
+
+    assert stream_processor.handler(event, None) == {"batchItemFailures": []}
+    mock_table.update_item.assert_not_called()
+    mock_s3.put_object.assert_not_called()
+
+
+@patch("questions_handler.SNAPSHOT_BUCKET", "site-bucket")
+@patch("questions_handler.s3")
+@patch("questions_handler.table")
+def test_stream_patches_touched_category_shards_from_images(mock_table, mock_s3):
+    """Test each touched shard is edited with the stream images, not re-queried"""
+    mock_table.get_item.return_value = {
+        "Item": {"id": "__snapshot__", "shard:AWS": {"key": "snapshots/shards/aws-old.json"}}
+    }
+    old_shard = {
+        "category": "AWS",
+        "items": [
+            {"id": "q3", "question_text": "What is a VPC?", "category": "AWS"},
+            {"id": "q9", "question_text": "What is IAM?", "category": "AWS",
+             "reference_answer": "Identity and Access Management"},
+        ],
+    }
+    mock_s3.get_object.return_value = {"Body": MagicMock(read=lambda: json.dumps(old_shard))}
+
+    assert stream_processor.handler(load_event(), None) == {"batchItemFailures": []}
+
+    mock_table.query.assert_not_called()
+    mock_table.scan.assert_not_called()
+    shards = {
+        json.loads(c[1]["Body"])["category"]: json.loads(c[1]["Body"])["items"]
+        for c in mock_s3.put_object.call_args_list
+    }
+    assert [item["id"] for item in shards["AWS"]] == ["q1", "q9"]
+    assert [item["id"] for item in shards["IaC"]] == ["q2"]
+    assert shards["IaC"][0]["difficulty"] == "Hard"
+    assert "rand" not in shards["AWS"][0]
+    # Shards are public to URL holders, so reference answers never go in
+    assert all("reference_answer" not in item for item in shards["AWS"])
+
+    update = updates_to(mock_table, "__snapshot__")[0]
+    # Only repoints categories still at the shards the patch started from
+    assert "#s0.#key = :p0" in update["ConditionExpression"]
+    assert "attribute_not_exists(#s1)" in update["ConditionExpression"]
+    deleted = mock_s3.delete_objects.call_args[1]["Delete"]["Objects"]
+    assert deleted == [{"Key": "snapshots/shards/aws-old.json"}]
+
+
+@patch("questions_handler.SNAPSHOT_BUCKET", "site-bucket")
+@patch("questions_handler.s3")
+@patch("questions_handler.table")
+def test_stream_retries_batch_when_snapshot_publish_fails(mock_table, mock_s3):
+    """Test a failed shard publish is reported so Lambda retries the batch"""
+    mock_table.get_item.return_value = {"Item": {"id": "__snapshot__"}}
+    mock_s3.put_object.side_effect = Exception("SlowDown")
+
+    result = stream_processor.handler(load_event(), None)
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "100"}]}
+
+
+@patch("questions_handler.table")
+def test_stream_reports_first_failed_record(mock_table):
+    """Test a failing view checkpoints before the record so only the rest retry"""
+    def update_item(**kwargs):
+        if kwargs["Key"] == {"id": "q2"}:
+            raise ClientError(
+                {"Error": {"Code": "ProvisionedThroughputExceededException"}},
+                "UpdateItem",
+            )
+        return {}
+
+    mock_table.update_item.side_effect = update_item
+
+    result = stream_processor.handler(load_event(), None)
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "300"}]}
+    # The record after the failure was not applied
+    deltas = [counter_deltas(update) for _, update in facet_transactions(mock_table)]
+    assert {'["AWS", "Medium"]': -1} not in deltas
+
+
+def test_parse_record_deserializes_images():
+    record = load_event()["Records"][3]
+
+    change = stream_processor.parse_record(record)
+
+    assert change["event"] == "REMOVE"
+    assert change["id"] == "q3"
+    assert change["new"] is None
+    assert change["old"]["category"] == "AWS"
+    assert change["sequence_number"] == "400"
@@ -0,0 +1,52 @@
+"""
+Unit tests for the shared JSON log setup
+"""
+
+import json
+import logging
+from decimal import Decimal
+from unittest.mock import patch
+
+import structured_logging
+
+
+def format_record(**extra):
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "Request timing", (), None)
+    record.__dict__.update(extra)
+    return json.loads(structured_logging.JsonFormatter().format(record))
+
+
+def test_formatter_includes_known_extra_fields():
+    data = format_record(
+        timings={"bedrock": 812.4, "total": 830.1},
+        aws_calls=[{"service": "dynamodb", "calls": 2}],
+        init_ms=Decimal("120"),
+        init_phases={"imports": 80.0},
+        initialization_type="provisioned-concurrency",
+        unrelated="dropped",
+    )
+
+    assert data["message"] == "Request timing"
+    assert data["level"] == "INFO"
+    assert data["timings"] == {"bedrock": 812.4, "total": 830.1}
+    assert data["aws_calls"] == [{"service": "dynamodb", "calls": 2}]
+    assert data["init_ms"] == 120
+    assert data["initialization_type"] == "provisioned-concurrency"
+    assert "unrelated" not in data
+
+
+def test_configure_enables_info_on_the_root_logger():
+    root = logging.getLogger()
+    saved = (root.level, root.handlers)
+    try:
+        root.setLevel(logging.WARNING)
+        with patch.dict("os.environ", {}, clear=True):
+            logger = structured_logging.configure()
+
+        assert logger is root
+        assert root.level == logging.INFO
+        assert len(root.handlers) == 1
+        assert isinstance(root.handlers[0].formatter, structured_logging.JsonFormatter)
+    finally:
+        root.setLevel(saved[0])
+        root.handlers = saved[1]
@@ -0,0 +1,75 @@
+"""
+Unit tests for the warm-container TTL/LRU cache
+"""
+
+from ttl_cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_missing_for_unknown_key():
+    cache = TTLCache()
+    assert cache.get("nope") is MISSING
+
+
+def test_set_and_get():
+    cache = TTLCache()
+    cache.set("a", {"id": "1"})
+    assert cache.get("a") == {"id": "1"}
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10.0
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Touch "a" so "b" becomes the eviction candidate
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_none_is_a_cacheable_value():
+    cache = TTLCache()
+    cache.set("a", None)
+    assert cache.get("a") is None
+
+
+def test_delete_and_clear():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    assert cache.get("a") is MISSING
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_zero_ttl_disables_caching():
+    cache = TTLCache(ttl_seconds=0)
+    cache.set("a", 1)
+    assert cache.get("a") is MISSING
@@ -2,15 +2,20 @@ import { useState, useMemo, useEffect } from 'react';
 import { fetchAuthSession } from 'aws-amplify/auth';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
-import { getAllQuestions } from '../services/api';
-import type { Question } from '../services/api';
+import { getAllQuestions, getQuestionById, getQuestionFacets, searchQuestions } from '../services/api';
+import type { Question, QuestionFilters } from '../services/api';
 import './Questions.css';
 import './Admin.css';
 
+const SEARCH_DEBOUNCE_MS = 250;
+
 function Admin() {
   const [isAdmin, setIsAdmin] = useState<boolean>(false);
   const [loading, setLoading] = useState<boolean>(true);
   const [questions, setQuestions] = useState<Question[]>([]);
+  const [searchResults, setSearchResults] = useState<Question[] | null>(null);
+  const [categoryOptions, setCategoryOptions] = useState<string[]>([]);
+  const [difficultyOptions, setDifficultyOptions] = useState<string[]>([]);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState('All');
   const [selectedDifficulty, setSelectedDifficulty] = useState('All');
@@ -48,12 +53,39 @@ function Admin() {
     }
   };
 
+  useEffect(() => {
+    if (isAdmin) {
+      loadQuestions();
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [selectedCategory, selectedDifficulty]);
+
+  // Category/difficulty filtering happens server-side against the indexes
+  const currentFilters = (): QuestionFilters => {
+    const filters: QuestionFilters = {};
+    if (selectedCategory !== 'All') {
+      filters.category = selectedCategory;
+    }
+    if (selectedDifficulty !== 'All') {
+      filters.difficulty = capitalizeDifficulty(selectedDifficulty);
+    }
+    return filters;
+  };
+
   const loadQuestions = async () => {
     try {
       setLoading(true);
       const token = await getAuthToken();
-      const data = await getAllQuestions(token);
+      const filters = currentFilters();
+
+      // Facet counts are one cheap read; refresh them with every reload so edits show up
+      const [data, facets] = await Promise.all([
+        getAllQuestions(token, filters),
+        getQuestionFacets(token),
+      ]);
       setQuestions(data);
+      setCategoryOptions(Object.keys(facets.categories));
+      setDifficultyOptions(Array.from(new Set(Object.keys(facets.difficulties).map(d => d.toLowerCase()))));
     } catch (error) {
       console.error('Error fetching questions:', error);
     } finally {
@@ -61,28 +93,39 @@ function Admin() {
     }
   };
 
-  const categories = useMemo(() => {
-    const cats = new Set(questions.map(q => q.category));
-    return ['All', ...Array.from(cats)];
-  }, [questions]);
+  const categories = useMemo(() => ['All', ...categoryOptions], [categoryOptions]);
 
-  const difficulties = useMemo(() => {
-    const diffs = new Set(questions.map(q => q.difficulty.toLowerCase()));
-    return ['All', ...Array.from(diffs)];
-  }, [questions]);
+  const difficulties = useMemo(() => ['All', ...difficultyOptions], [difficultyOptions]);
 
-  const filteredQuestions = useMemo(() => {
-    return questions.filter(question => {
-      const matchesSearch = question.question_text.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                           question.category.toLowerCase().includes(searchTerm.toLowerCase());
+  // Ranked search runs on the server; re-run after a reload so edits show up
+  useEffect(() => {
+    const query = searchTerm.trim();
+    if (!isAdmin || !query) {
+      setSearchResults(null);
+      return;
+    }
 
-      const matchesCategory = selectedCategory === 'All' || question.category === selectedCategory;
-      const matchesDifficulty = selectedDifficulty === 'All' ||
-                                question.difficulty.toLowerCase() === selectedDifficulty.toLowerCase();
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const token = await getAuthToken();
+        const results = await searchQuestions(query, token, currentFilters());
+        if (!cancelled) {
+          setSearchResults(results);
+        }
+      } catch (error) {
+        console.error('Error searching questions:', error);
+      }
+    }, SEARCH_DEBOUNCE_MS);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [isAdmin, searchTerm, questions]);
 
-      return matchesSearch && matchesCategory && matchesDifficulty;
-    });
-  }, [questions, searchTerm, selectedCategory, selectedDifficulty]);
+  const filteredQuestions = searchResults ?? questions;
 
   const getDifficultyClass = (difficulty: string) => {
     return `difficulty difficulty-${difficulty.toLowerCase()}`;
@@ -152,6 +195,7 @@ function Admin() {
           category: editingQuestion.category,
           difficulty: editingQuestion.difficulty,
           reference_answer: editingQuestion.reference_answer,
+          version: editingQuestion.version ?? 0,
         }),
       });
 
@@ -159,6 +203,8 @@ function Admin() {
         await loadQuestions();
         setEditingQuestion(null);
         alert('Question updated successfully!');
+      } else if (response.status === 409) {
+        alert('This question was changed by someone else. Reopen it to see the latest version.');
       } else {
         const error = await response.json();
         alert(`Error: ${error.message || 'Failed to update question'}`);
@@ -169,6 +215,19 @@ function Admin() {
     }
   };
 
+  const handleEditQuestion = async (question: Question) => {
+    setShowCreateForm(false);
+
+    // The list only carries summary fields; load the full question to edit
+    try {
+      const token = await getAuthToken();
+      setEditingQuestion(await getQuestionById(question.id, token));
+    } catch (error) {
+      console.error('Error loading question:', error);
+      alert('Error loading question');
+    }
+  };
+
   const handleDeleteQuestion = async (id: string) => {
     if (!confirm('Are you sure you want to delete this question?')) {
       return;
@@ -188,6 +247,9 @@ function Admin() {
       if (response.ok || response.status === 204) {
         await loadQuestions();
         alert('Question deleted successfully!');
+      } else if (response.status === 404) {
+        await loadQuestions();
+        alert('This question has already been deleted.');
       } else {
         alert('Error deleting question');
       }
@@ -342,7 +404,7 @@ function Admin() {
             <div className="form-group">
               <label>Reference Answer:</label>
               <textarea
-                value={editingQuestion.reference_answer}
+                value={editingQuestion.reference_answer ?? ''}
                 onChange={(e) => setEditingQuestion({ ...editingQuestion, reference_answer: e.target.value })}
                 rows={6}
               />
@@ -422,10 +484,7 @@ function Admin() {
                 <div className="admin-buttons">
                   <button
                     className="btn btn-small btn-edit"
-                    onClick={() => {
-                      setEditingQuestion(question);
-                      setShowCreateForm(false);
-                    }}
+                    onClick={() => handleEditQuestion(question)}
                   >
                     ✏️ Edit
                   </button>
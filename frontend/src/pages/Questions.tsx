@@ -1,14 +1,19 @@
 import { useState, useMemo, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
-import { getAllQuestions, evaluateAnswer } from '../services/api';
-import type { Question, EvaluationResponse } from '../services/api';
+import { getAllQuestions, getQuestionById, getQuestionFacets, getRandomQuestions, getSnapshotQuestions, evaluateAnswer, searchQuestions } from '../services/api';
+import type { Question, QuestionFilters, EvaluationResponse } from '../services/api';
 import './Questions.css';
 
+const SEARCH_DEBOUNCE_MS = 250;
+
 export default function Questions() {
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState('All');
   const [selectedDifficulty, setSelectedDifficulty] = useState('All');
   const [questions, setQuestions] = useState<Question[]>([]);
+  const [searchResults, setSearchResults] = useState<Question[] | null>(null);
+  const [categoryOptions, setCategoryOptions] = useState<string[]>([]);
+  const [difficultyOptions, setDifficultyOptions] = useState<string[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const { user, getAuthToken } = useAuth();
@@ -19,6 +24,18 @@ export default function Questions() {
   const [evaluating, setEvaluating] = useState(false);
   const [evaluation, setEvaluation] = useState<EvaluationResponse | null>(null);
 
+  // Category/difficulty filtering happens server-side against the indexes
+  const currentFilters = (): QuestionFilters => {
+    const filters: QuestionFilters = {};
+    if (selectedCategory !== 'All') {
+      filters.category = selectedCategory;
+    }
+    if (selectedDifficulty !== 'All') {
+      filters.difficulty = capitalizeDifficulty(selectedDifficulty);
+    }
+    return filters;
+  };
+
   const loadQuestions = async () => {
     if (!user) {
       setLoading(false);
@@ -30,7 +47,20 @@ export default function Questions() {
       setLoading(true);
       setError(null);
       const token = await getAuthToken();
-      const data = await getAllQuestions(token);
+      const filters = currentFilters();
+
+      let data: Question[];
+      try {
+        // Served from the CDN; the API is only asked where the shards are
+        data = await getSnapshotQuestions(token, filters);
+      } catch (snapshotErr) {
+        console.warn('Snapshot unavailable, loading questions from the API:', snapshotErr);
+        data = await getAllQuestions(token, filters, (loaded) => {
+          // Render the first pages while the rest of the bank is still loading
+          setQuestions(loaded);
+          setLoading(false);
+        });
+      }
       setQuestions(data);
     } catch (err) {
       console.error('Error loading questions:', err);
@@ -43,30 +73,65 @@ export default function Questions() {
   useEffect(() => {
     loadQuestions();
     // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [user, selectedCategory, selectedDifficulty]);
+
+  // Filter options come from the facet counts, so they render before the list loads
+  useEffect(() => {
+    if (!user) {
+      return;
+    }
+
+    const loadFacets = async () => {
+      try {
+        const token = await getAuthToken();
+        const facets = await getQuestionFacets(token);
+        setCategoryOptions(Object.keys(facets.categories));
+        setDifficultyOptions(Array.from(new Set(Object.keys(facets.difficulties).map(d => d.toLowerCase()))));
+      } catch (err) {
+        console.error('Error loading facets:', err);
+      }
+    };
+
+    loadFacets();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [user]);
 
-  const categories = useMemo(() => {
-    const cats = new Set(questions.map(q => q.category));
-    return ['All', ...Array.from(cats)];
-  }, [questions]);
+  const categories = useMemo(() => ['All', ...categoryOptions], [categoryOptions]);
 
-  const difficulties = useMemo(() => {
-    const diffs = new Set(questions.map(q => q.difficulty.toLowerCase()));
-    return ['All', ...Array.from(diffs)];
-  }, [questions]);
+  const difficulties = useMemo(() => ['All', ...difficultyOptions], [difficultyOptions]);
 
-  const filteredQuestions = useMemo(() => {
-    return questions.filter(question => {
-      const matchesSearch = question.question_text.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                           question.category.toLowerCase().includes(searchTerm.toLowerCase());
+  // Ranked search runs on the server, debounced so typing doesn't send a request per keystroke
+  useEffect(() => {
+    const query = searchTerm.trim();
+    if (!user || !query) {
+      setSearchResults(null);
+      return;
+    }
 
-      const matchesCategory = selectedCategory === 'All' || question.category === selectedCategory;
-      const matchesDifficulty = selectedDifficulty === 'All' ||
-                                question.difficulty.toLowerCase() === selectedDifficulty.toLowerCase();
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const token = await getAuthToken();
+        const results = await searchQuestions(query, token, currentFilters());
+        if (!cancelled) {
+          setSearchResults(results);
+        }
+      } catch (err) {
+        console.error('Error searching questions:', err);
+        if (!cancelled) {
+          setError(err instanceof Error ? err.message : 'Failed to search questions');
+        }
+      }
+    }, SEARCH_DEBOUNCE_MS);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [user, searchTerm, selectedCategory, selectedDifficulty]);
 
-      return matchesSearch && matchesCategory && matchesDifficulty;
-    });
-  }, [questions, searchTerm, selectedCategory, selectedDifficulty]);
+  const filteredQuestions = searchResults ?? questions;
 
   const getDifficultyClass = (difficulty: string) => {
     return `difficulty difficulty-${difficulty.toLowerCase()}`;
@@ -80,10 +145,37 @@ export default function Questions() {
     return difficulty.charAt(0).toUpperCase() + difficulty.slice(1).toLowerCase();
   };
 
-  const handlePracticeAnswer = (question: Question) => {
+  const handlePracticeAnswer = async (question: Question) => {
     setSelectedQuestion(question);
     setUserAnswer('');
     setEvaluation(null);
+
+    // Snapshot shards and API listings leave out the reference answer
+    if (question.reference_answer !== undefined) {
+      return;
+    }
+
+    // Load the reference answer on demand
+    try {
+      const token = await getAuthToken();
+      const fullQuestion = await getQuestionById(question.id, token);
+      setSelectedQuestion(current => (current?.id === question.id ? fullQuestion : current));
+    } catch (err) {
+      console.error('Error loading question details:', err);
+    }
+  };
+
+  // Sampled on the server from the random index, honouring the current filters
+  const handleRandomQuestion = async () => {
+    try {
+      const token = await getAuthToken();
+      const [question] = await getRandomQuestions(1, token, currentFilters());
+      if (question) {
+        handlePracticeAnswer(question);
+      }
+    } catch (err) {
+      console.error('Error picking a random question:', err);
+    }
   };
 
   const handleCloseModal = () => {
@@ -180,6 +272,14 @@ export default function Questions() {
             >
               {loading ? 'Loading...' : '🔄 Refresh'}
             </button>
+
+            <button
+              className="btn btn-small"
+              onClick={handleRandomQuestion}
+              disabled={loading}
+            >
+              🎲 Random
+            </button>
           </div>
 
           {loading && (
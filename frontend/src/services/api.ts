@@ -3,10 +3,13 @@ import { awsConfig } from '../aws-config';
 export interface Question {
   id: string;
   category: string;
-  created_at: string;
+  created_at?: string;
   difficulty: string;
   question_text: string;
-  reference_answer: string;
+  // Omitted from listings, which return summary fields only
+  reference_answer?: string;
+  // Bumped on every edit; sent back with updates to detect conflicting edits
+  version?: number;
 }
 
 export interface EvaluationRequest {
@@ -26,6 +29,42 @@ export interface EvaluationResponse {
 
 const API_BASE_URL = awsConfig.API.REST.InterviewQuestionsAPI.endpoint;
 
+/**
+ * Last ETag and parsed body seen per URL. Sent back as If-None-Match so
+ * unchanged responses come back as an empty 304.
+ */
+const validatorCache = new Map<string, { etag: string; data: unknown }>();
+
+/**
+ * GET a URL, revalidating against the stored ETag when there is one.
+ * Returns the raw response for error handling and the parsed body.
+ */
+async function fetchWithValidator<T>(
+  url: string,
+  headers: Record<string, string>
+): Promise<{ response: Response; data: T | null }> {
+  const cached = validatorCache.get(url);
+  if (cached) {
+    headers['If-None-Match'] = cached.etag;
+  }
+
+  const response = await fetch(url, { method: 'GET', headers });
+
+  if (response.status === 304 && cached) {
+    return { response, data: cached.data as T };
+  }
+  if (!response.ok) {
+    return { response, data: null };
+  }
+
+  const data = (await response.json()) as T;
+  const etag = response.headers.get('ETag');
+  if (etag) {
+    validatorCache.set(url, { etag, data });
+  }
+  return { response, data };
+}
+
 /**
  * Public signup endpoint (no authentication required)
  */
@@ -39,10 +78,29 @@ export async function signupUser(email: string): Promise<{ message: string; user
   return response.json();
 }
 
+export interface QuestionPage {
+  items: Question[];
+  next_cursor: string | null;
+}
+
+export interface QuestionFilters {
+  category?: string;
+  difficulty?: string;
+}
+
+const QUESTIONS_PAGE_SIZE = 100;
+
 /**
- * Fetch all questions from the API
+ * Fetch a single page of questions. Pass the previous page's next_cursor
+ * to continue where it left off. Category/difficulty filters are served
+ * from DynamoDB indexes on the server.
  */
-export async function getAllQuestions(authToken: string | null): Promise<Question[]> {
+export async function getQuestionsPage(
+  authToken: string | null,
+  cursor: string | null = null,
+  filters: QuestionFilters = {},
+  limit: number = QUESTIONS_PAGE_SIZE
+): Promise<QuestionPage> {
   const headers: HeadersInit = {
     'Content-Type': 'application/json',
   };
@@ -51,20 +109,109 @@ export async function getAllQuestions(authToken: string | null): Promise<Questio
     headers['Authorization'] = authToken;
   }
 
-  const response = await fetch(`${API_BASE_URL}questions`, {
-    method: 'GET',
-    headers,
-  });
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  if (filters.category) {
+    params.set('category', filters.category);
+  }
+  if (filters.difficulty) {
+    params.set('difficulty', filters.difficulty);
+  }
 
-  if (!response.ok) {
+  const { response, data } = await fetchWithValidator<QuestionPage>(
+    `${API_BASE_URL}questions?${params.toString()}`,
+    headers
+  );
+
+  if (data === null) {
     const errorText = await response.text();
     throw new Error(`Failed to fetch questions: ${response.status} ${errorText}`);
   }
 
-  const data = await response.json();
   return data;
 }
 
+/**
+ * Fetch all questions matching the filters, one page at a time.
+ * onPage is called with the questions loaded so far after every page.
+ */
+export async function getAllQuestions(
+  authToken: string | null,
+  filters: QuestionFilters = {},
+  onPage?: (questions: Question[]) => void
+): Promise<Question[]> {
+  const questions: Question[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const page: QuestionPage = await getQuestionsPage(authToken, cursor, filters);
+    questions.push(...page.items);
+    cursor = page.next_cursor;
+    onPage?.([...questions]);
+  } while (cursor);
+
+  return questions;
+}
+
+export interface SnapshotShard {
+  category: string;
+  path: string;
+  count: number;
+}
+
+export interface SnapshotManifest {
+  version: number | null;
+  shards: SnapshotShard[];
+}
+
+/**
+ * Load questions from the static per-category snapshot served by CloudFront.
+ * Only the small manifest comes from the API; shards are immutable,
+ * content-hashed files that the browser and CDN cache indefinitely.
+ */
+export async function getSnapshotQuestions(
+  authToken: string | null,
+  filters: QuestionFilters = {}
+): Promise<Question[]> {
+  const headers: HeadersInit = {
+    'Content-Type': 'application/json',
+  };
+
+  if (authToken) {
+    headers['Authorization'] = authToken;
+  }
+
+  const { response, data: manifest } = await fetchWithValidator<SnapshotManifest>(
+    `${API_BASE_URL}questions/snapshot`,
+    headers
+  );
+
+  if (manifest === null) {
+    throw new Error(`Failed to fetch snapshot manifest: ${response.status}`);
+  }
+
+  const shards = manifest.shards.filter(
+    shard => !filters.category || shard.category === filters.category
+  );
+
+  const pages = await Promise.all(
+    shards.map(async shard => {
+      const shardResponse = await fetch(shard.path);
+      if (!shardResponse.ok) {
+        throw new Error(`Failed to fetch snapshot shard: ${shardResponse.status}`);
+      }
+      const body: { items: Question[] } = await shardResponse.json();
+      return body.items;
+    })
+  );
+
+  return pages
+    .flat()
+    .filter(question => !filters.difficulty || question.difficulty === filters.difficulty);
+}
+
 /**
  * Fetch a single question by ID
  */
@@ -77,12 +224,12 @@ export async function getQuestionById(id: string, authToken: string | null): Pro
     headers['Authorization'] = authToken;
   }
 
-  const response = await fetch(`${API_BASE_URL}questions/${id}`, {
-    method: 'GET',
-    headers,
-  });
+  const { response, data } = await fetchWithValidator<Question>(
+    `${API_BASE_URL}questions/${id}`,
+    headers
+  );
 
-  if (!response.ok) {
+  if (data === null) {
     if (response.status === 404) {
       throw new Error('Question not found');
     }
@@ -90,6 +237,163 @@ export async function getQuestionById(id: string, authToken: string | null): Pro
     throw new Error(`Failed to fetch question: ${response.status} ${errorText}`);
   }
 
+  return data;
+}
+
+export interface QuestionFacets {
+  categories: Record<string, number>;
+  difficulties: Record<string, number>;
+  combinations: { category: string; difficulty: string; count: number }[];
+  total: number;
+}
+
+/**
+ * Question counts per category and difficulty, read from a single
+ * aggregate item so filters can render before any questions load.
+ */
+export async function getQuestionFacets(authToken: string | null): Promise<QuestionFacets> {
+  const headers: HeadersInit = {
+    'Content-Type': 'application/json',
+  };
+
+  if (authToken) {
+    headers['Authorization'] = authToken;
+  }
+
+  const { response, data } = await fetchWithValidator<QuestionFacets>(
+    `${API_BASE_URL}questions/facets`,
+    headers
+  );
+
+  if (data === null) {
+    const errorText = await response.text();
+    throw new Error(`Failed to fetch facets: ${response.status} ${errorText}`);
+  }
+
+  return data;
+}
+
+/**
+ * Draw a random practice set (summary fields) from the server,
+ * optionally limited to a category and/or difficulty.
+ */
+export async function getRandomQuestions(
+  count: number,
+  authToken: string | null,
+  filters: QuestionFilters = {}
+): Promise<Question[]> {
+  const headers: HeadersInit = {
+    'Content-Type': 'application/json',
+  };
+
+  if (authToken) {
+    headers['Authorization'] = authToken;
+  }
+
+  const params = new URLSearchParams({ n: String(count) });
+  if (filters.category) {
+    params.set('category', filters.category);
+  }
+  if (filters.difficulty) {
+    params.set('difficulty', filters.difficulty);
+  }
+
+  const response = await fetch(`${API_BASE_URL}questions/random?${params.toString()}`, {
+    method: 'GET',
+    headers,
+  });
+
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`Failed to fetch random questions: ${response.status} ${errorText}`);
+  }
+
+  const data = await response.json();
+  return data.items;
+}
+
+export interface SearchResult extends Question {
+  score: number;
+}
+
+export interface QuestionSearch {
+  query: string;
+  items: SearchResult[];
+  count: number;
+}
+
+/**
+ * Ranked full-text search over question text and category, served from
+ * an index on the server. Tolerates partial words and small typos.
+ */
+export async function searchQuestions(
+  query: string,
+  authToken: string | null,
+  filters: QuestionFilters = {},
+  limit: number = 50
+): Promise<SearchResult[]> {
+  const headers: HeadersInit = {
+    'Content-Type': 'application/json',
+  };
+
+  if (authToken) {
+    headers['Authorization'] = authToken;
+  }
+
+  const params = new URLSearchParams({ q: query, limit: String(limit) });
+  if (filters.category) {
+    params.set('category', filters.category);
+  }
+  if (filters.difficulty) {
+    params.set('difficulty', filters.difficulty);
+  }
+
+  const { response, data } = await fetchWithValidator<QuestionSearch>(
+    `${API_BASE_URL}questions/search?${params.toString()}`,
+    headers
+  );
+
+  if (data === null) {
+    const errorText = await response.text();
+    throw new Error(`Failed to search questions: ${response.status} ${errorText}`);
+  }
+
+  return data.items;
+}
+
+export interface QuestionBatch {
+  items: Question[];
+  missing: string[];
+  unprocessed: string[];
+}
+
+/**
+ * Fetch several questions by ID in one request (e.g. a practice set).
+ * Items come back in the order requested; unknown IDs are listed in missing.
+ */
+export async function getQuestionsByIds(
+  ids: string[],
+  authToken: string | null
+): Promise<QuestionBatch> {
+  const headers: HeadersInit = {
+    'Content-Type': 'application/json',
+  };
+
+  if (authToken) {
+    headers['Authorization'] = authToken;
+  }
+
+  const response = await fetch(`${API_BASE_URL}questions/batch`, {
+    method: 'POST',
+    headers,
+    body: JSON.stringify({ ids }),
+  });
+
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`Failed to fetch questions: ${response.status} ${errorText}`);
+  }
+
   const data = await response.json();
   return data;
 }
@@ -16,6 +16,34 @@ import * as sns from 'aws-cdk-lib/aws-sns';
 import * as cloudwatch_actions from 'aws-cdk-lib/aws-cloudwatch-actions';
 import * as iam from 'aws-cdk-lib/aws-iam';
 import * as cloudtrail from 'aws-cdk-lib/aws-cloudtrail';
+import * as sqs from 'aws-cdk-lib/aws-sqs';
+import * as lambdaEventSources from 'aws-cdk-lib/aws-lambda-event-sources';
+import * as events from 'aws-cdk-lib/aws-events';
+import * as eventsTargets from 'aws-cdk-lib/aws-events-targets';
+
+// Package only the modules a handler imports, so each function's bundle
+// (and what its cold start has to load) stays small
+function backendCode(modules: string[]): lambda.Code {
+  return lambda.Code.fromAsset('../backend/src', {
+    exclude: ['*', ...modules.map((module) => `!${module}.py`)],
+  });
+}
+
+// Modules shared by the questions API and the stream processor
+const QUESTION_MODULES = [
+  'aws_clients',
+  'aws_instrumentation',
+  'custom_metrics',
+  'lambda_telemetry',
+  'question_export',
+  'questions_handler',
+  'request_timing',
+  'search_index',
+  'serialization',
+  'snapshot_builder',
+  'structured_logging',
+  'ttl_cache',
+];
 
 export interface ServiceStackProps extends cdk.StackProps {
   enableMonitoring?: boolean;
@@ -254,6 +282,29 @@ export class ServiceStack extends cdk.Stack {
       ),
     });
 
+    // Private bucket for admin NDJSON exports of the question bank
+    const exportBucket = new s3.Bucket(this, 'ExportBucket', {
+      blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+      publicReadAccess: false,
+      encryption: s3.BucketEncryption.S3_MANAGED,
+      enforceSSL: true,
+      lifecycleRules: [
+        {
+          id: 'ExpireExports',
+          enabled: true,
+          expiration: cdk.Duration.days(7),
+          abortIncompleteMultipartUploadAfter: cdk.Duration.days(1),
+        },
+      ],
+      removalPolicy: cdk.RemovalPolicy.RETAIN,
+      autoDeleteObjects: false,
+    });
+
+    new cdk.CfnOutput(this, 'ExportBucketName', {
+      value: exportBucket.bucketName,
+      description: 'S3 bucket for question bank exports',
+    });
+
     // Dynamo DB Table
     const table = new dynamodb.Table(this, 'InterviewQuestions', {
       partitionKey: { name: 'id', type: dynamodb.AttributeType.STRING },
@@ -261,7 +312,52 @@ export class ServiceStack extends cdk.Stack {
       removalPolicy: cdk.RemovalPolicy.RETAIN,
       encryption: dynamodb.TableEncryption.AWS_MANAGED,
       pointInTimeRecovery: true,
-    });
+      // Feeds the stream processor that maintains derived views
+      stream: dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
+      // Expires the stream processor's per-question replay markers
+      timeToLiveAttribute: 'expires_at',
+    });
+
+    // Table GSIs in rollout order. CloudFormation creates or deletes at most
+    // one GSI per table update, so on the existing table they are added one
+    // deployment at a time: the questionIndexesDeployed context value in
+    // cdk.json goes up by one per deploy, only after the previous index is
+    // ACTIVE in every environment. CI deploys only the tip of main, so each
+    // bump must be merged as its own pull request; two bumps landing in one
+    // push would reach CloudFormation as one update and fail. New indexes
+    // are appended to the end.
+    // Without the context value (new stacks, tests) every index is created.
+    const questionIndexes: dynamodb.GlobalSecondaryIndexProps[] = [
+      // Indexes for filtered listing (GET /questions?category=&difficulty=)
+      {
+        indexName: 'category-index',
+        partitionKey: { name: 'category', type: dynamodb.AttributeType.STRING },
+        sortKey: { name: 'created_at', type: dynamodb.AttributeType.STRING },
+        projectionType: dynamodb.ProjectionType.ALL,
+      },
+      {
+        indexName: 'category-difficulty-index',
+        partitionKey: { name: 'category', type: dynamodb.AttributeType.STRING },
+        sortKey: { name: 'difficulty', type: dynamodb.AttributeType.STRING },
+        projectionType: dynamodb.ProjectionType.ALL,
+      },
+      // Sparse index for random practice sets: questions sit at a random
+      // point (rand) within their category/difficulty pool (sample_pool)
+      {
+        indexName: 'random-index',
+        partitionKey: { name: 'sample_pool', type: dynamodb.AttributeType.STRING },
+        sortKey: { name: 'rand', type: dynamodb.AttributeType.NUMBER },
+        projectionType: dynamodb.ProjectionType.INCLUDE,
+        nonKeyAttributes: ['question_text', 'category', 'difficulty'],
+      },
+    ];
+    const indexesDeployed = Number(
+      this.node.tryGetContext('questionIndexesDeployed') ?? questionIndexes.length,
+    );
+    const deployedIndexes = questionIndexes.slice(0, indexesDeployed);
+    deployedIndexes.forEach((index) => table.addGlobalSecondaryIndex(index));
+    // Tells the handlers which indexes they can query yet
+    const deployedIndexNames = deployedIndexes.map((index) => index.indexName).join(',');
 
     new cdk.CfnOutput(this, 'EPAproject', {
       value: table.tableName,
@@ -272,19 +368,30 @@ export class ServiceStack extends cdk.Stack {
     const questionsHandler = new lambda.Function(this, 'QuestionsHandler', {
       runtime: lambda.Runtime.PYTHON_3_11,
       handler: 'questions_handler.handler',
-      code: lambda.Code.fromAsset("../backend/src"),
+      code: backendCode(QUESTION_MODULES),
       timeout: cdk.Duration.seconds(30),
       memorySize: 256,
       logRetention: logs.RetentionDays.ONE_MONTH,
       environment: {
         TABLE_NAME: table.tableName,
+        QUESTION_INDEXES: deployedIndexNames,
         LOG_LEVEL: 'INFO',
+        // Metrics as Embedded Metric Format log lines, not PutMetricData calls
+        METRICS_BACKEND: 'emf',
+        // Parallel segments for full-bank scans (admin listing)
+        SCAN_SEGMENTS: '4',
+        EXPORT_BUCKET: exportBucket.bucketName,
+        // Per-category question snapshots served by CloudFront
+        SNAPSHOT_BUCKET: frontendS3.bucketName,
       },
     });
 
     // Grant the Lambda function read/write permissions to the table
     table.grantReadWriteData(questionsHandler);
 
+    // Write exports and presign download URLs for them
+    exportBucket.grantReadWrite(questionsHandler);
+
     // Grant permission to emit custom CloudWatch metrics
     questionsHandler.addToRolePolicy(new iam.PolicyStatement({
       actions: ['cloudwatch:PutMetricData'],
@@ -292,14 +399,119 @@ export class ServiceStack extends cdk.Stack {
       conditions: { 'StringEquals': { 'cloudwatch:namespace': 'RoleReady' } }
     }));
 
+    // Lambda keeping facet counts, random-index pools and snapshot shards
+    // in step with the table, driven by its stream
+    const streamProcessor = new lambda.Function(this, 'StreamProcessor', {
+      runtime: lambda.Runtime.PYTHON_3_11,
+      handler: 'stream_processor.handler',
+      code: backendCode([...QUESTION_MODULES, 'stream_processor']),
+      timeout: cdk.Duration.seconds(60),
+      memorySize: 256,
+      logRetention: logs.RetentionDays.ONE_MONTH,
+      environment: {
+        TABLE_NAME: table.tableName,
+        QUESTION_INDEXES: deployedIndexNames,
+        LOG_LEVEL: 'INFO',
+        // Metrics as Embedded Metric Format log lines, not PutMetricData calls
+        METRICS_BACKEND: 'emf',
+        SNAPSHOT_BUCKET: frontendS3.bucketName,
+      },
+    });
+
+    table.grantReadWriteData(streamProcessor);
+    // Shards are patched in place: read back, edited, republished
+    frontendS3.grantRead(streamProcessor, 'snapshots/*');
+    frontendS3.grantPut(streamProcessor, 'snapshots/*');
+    frontendS3.grantDelete(streamProcessor, 'snapshots/*');
+
+    streamProcessor.addToRolePolicy(new iam.PolicyStatement({
+      actions: ['cloudwatch:PutMetricData'],
+      resources: ['*'],
+      conditions: { 'StringEquals': { 'cloudwatch:namespace': 'RoleReady' } }
+    }));
+
+    // Records that still fail after retries are parked here for inspection
+    const streamDeadLetterQueue = new sqs.Queue(this, 'StreamProcessorDLQ', {
+      retentionPeriod: cdk.Duration.days(14),
+      encryption: sqs.QueueEncryption.SQS_MANAGED,
+    });
+
+    streamProcessor.addEventSource(new lambdaEventSources.DynamoEventSource(table, {
+      startingPosition: lambda.StartingPosition.TRIM_HORIZON,
+      batchSize: 100,
+      maxBatchingWindow: cdk.Duration.seconds(1),
+      // Retry from the first failed record rather than the whole batch
+      reportBatchItemFailures: true,
+      bisectBatchOnError: true,
+      retryAttempts: 5,
+      onFailure: new lambdaEventSources.SqsDlq(streamDeadLetterQueue),
+    }));
+
+    // Scheduled reconciliation of the stream-derived views against the table
+    // (facet counter drift, sample key backfill, snapshot shards)
+    const streamReconciler = new lambda.Function(this, 'StreamReconciler', {
+      runtime: lambda.Runtime.PYTHON_3_11,
+      handler: 'stream_processor.reconcile',
+      code: backendCode([...QUESTION_MODULES, 'stream_processor']),
+      timeout: cdk.Duration.minutes(5),
+      memorySize: 256,
+      logRetention: logs.RetentionDays.ONE_MONTH,
+      environment: {
+        TABLE_NAME: table.tableName,
+        QUESTION_INDEXES: deployedIndexNames,
+        LOG_LEVEL: 'INFO',
+        // Parallel segments for the full-bank recount
+        SCAN_SEGMENTS: '4',
+        METRICS_BACKEND: 'emf',
+        SNAPSHOT_BUCKET: frontendS3.bucketName,
+      },
+    });
+
+    table.grantReadWriteData(streamReconciler);
+    // Republishes every shard, replacing any stale or superseded ones
+    frontendS3.grantPut(streamReconciler, 'snapshots/*');
+    frontendS3.grantDelete(streamReconciler, 'snapshots/*');
+
+    new events.Rule(this, 'StreamReconcileSchedule', {
+      schedule: events.Schedule.rate(cdk.Duration.hours(6)),
+      targets: [new eventsTargets.LambdaFunction(streamReconciler)],
+    });
+
+    // Content-addressed cache of Marcus evaluations; entries expire via TTL
+    // and can always be regenerated, so the table is disposable
+    const evaluationCacheTable = new dynamodb.Table(this, 'EvaluationCache', {
+      partitionKey: { name: 'key', type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      encryption: dynamodb.TableEncryption.AWS_MANAGED,
+      timeToLiveAttribute: 'expires_at',
+    });
+
     // Lambda for Marcus evaluation (direct model invocation)
     const evaluateAnswerFn = new lambda.Function(this, 'EvaluateAnswerFunction', {
       runtime: lambda.Runtime.PYTHON_3_11,
       handler: 'evaluate_answer.handler',
-      code: lambda.Code.fromAsset("../backend/src"),
+      code: backendCode([
+        'aws_clients',
+        'aws_instrumentation',
+        'custom_metrics',
+        'evaluate_answer',
+        'evaluation_cache',
+        'lambda_telemetry',
+        'request_timing',
+        'serialization',
+        'structured_logging',
+        'ttl_cache',
+      ]),
       timeout: cdk.Duration.seconds(30),
+      environment: {
+        EVALUATION_CACHE_TABLE: evaluationCacheTable.tableName,
+        METRICS_BACKEND: 'emf',
+      },
     });
 
+    evaluationCacheTable.grant(evaluateAnswerFn, 'dynamodb:GetItem', 'dynamodb:PutItem');
+
     // Grant Bedrock model invocation permission
     evaluateAnswerFn.addToRolePolicy(new iam.PolicyStatement({
       actions: ['bedrock:InvokeModel'],
@@ -317,10 +529,20 @@ export class ServiceStack extends cdk.Stack {
     const signupHandler = new lambda.Function(this, 'SignupHandler', {
       runtime: lambda.Runtime.PYTHON_3_11,
       handler: 'admin_create_user.handler',
-      code: lambda.Code.fromAsset("../backend/src"),
+      code: backendCode([
+        'admin_create_user',
+        'aws_clients',
+        'aws_instrumentation',
+        'custom_metrics',
+        'lambda_telemetry',
+        'request_timing',
+        'serialization',
+        'structured_logging',
+      ]),
       timeout: cdk.Duration.seconds(30),
       environment: {
         USER_POOL_ID: userPool.userPoolId,
+        METRICS_BACKEND: 'emf',
       },
     });
 
@@ -351,6 +573,7 @@ export class ServiceStack extends cdk.Stack {
           'Authorization',
           'X-Api-Key',
           'X-Amz-Security-Token',
+          'If-None-Match',
         ],
         allowCredentials: true,
       },
@@ -405,6 +628,55 @@ export class ServiceStack extends cdk.Stack {
       authorizationType: apigw.AuthorizationType.COGNITO,
     });
 
+    // Admin NDJSON export
+    const questionsExport = questions.addResource('export');
+    questionsExport.addMethod('GET', lambdaIntegration, {
+      authorizer: cognitoAuthorizer,
+      authorizationType: apigw.AuthorizationType.COGNITO,
+    });
+
+    // Category/difficulty counts for filter dropdowns
+    const questionsFacets = questions.addResource('facets');
+    questionsFacets.addMethod('GET', lambdaIntegration, {
+      authorizer: cognitoAuthorizer,
+      authorizationType: apigw.AuthorizationType.COGNITO,
+    });
+
+    // Random practice sets
+    const questionsRandom = questions.addResource('random');
+    questionsRandom.addMethod('GET', lambdaIntegration, {
+      authorizer: cognitoAuthorizer,
+      authorizationType: apigw.AuthorizationType.COGNITO,
+    });
+
+    // Locations of the CDN-served question snapshot
+    const questionsSnapshot = questions.addResource('snapshot');
+    questionsSnapshot.addMethod('GET', lambdaIntegration, {
+      authorizer: cognitoAuthorizer,
+      authorizationType: apigw.AuthorizationType.COGNITO,
+    });
+
+    // Ranked full-text search
+    const questionsSearch = questions.addResource('search');
+    questionsSearch.addMethod('GET', lambdaIntegration, {
+      authorizer: cognitoAuthorizer,
+      authorizationType: apigw.AuthorizationType.COGNITO,
+    });
+
+    // Fetch several questions by id in one request
+    const questionsBatch = questions.addResource('batch');
+    questionsBatch.addMethod('POST', lambdaIntegration, {
+      authorizer: cognitoAuthorizer,
+      authorizationType: apigw.AuthorizationType.COGNITO,
+    });
+
+    // Admin bulk import (JSON Lines or CSV)
+    const questionsImport = questions.addResource('import');
+    questionsImport.addMethod('POST', lambdaIntegration, {
+      authorizer: cognitoAuthorizer,
+      authorizationType: apigw.AuthorizationType.COGNITO,
+    });
+
     const questionById = questions.addResource('{id}');
     questionById.addMethod('GET', lambdaIntegration, {
       authorizer: cognitoAuthorizer,
@@ -600,6 +872,34 @@ export class ServiceStack extends cdk.Stack {
         })
       );
 
+      // Cold starts and init time per function (emitted by lambda_telemetry)
+      const instrumentedFunctions = [questionsHandler, streamProcessor, evaluateAnswerFn, signupHandler];
+      const perFunction = (metricName: string, statistic: string) =>
+        instrumentedFunctions.map((fn) => new cloudwatch.Metric({
+          namespace: 'RoleReady',
+          metricName,
+          dimensionsMap: { FunctionName: fn.functionName },
+          statistic,
+        }));
+
+      dashboard.addWidgets(
+        new cloudwatch.GraphWidget({
+          title: 'Cold Starts',
+          left: perFunction('ColdStart', 'Sum'),
+          width: 8,
+        }),
+        new cloudwatch.GraphWidget({
+          title: 'Init Duration (p90)',
+          left: perFunction('InitDuration', 'p90'),
+          width: 8,
+        }),
+        new cloudwatch.GraphWidget({
+          title: 'Peak Memory (max)',
+          left: perFunction('MemoryUsage', 'Maximum'),
+          width: 8,
+        })
+      );
+
       new cdk.CfnOutput(this, 'DashboardUrl', {
         value: `https://console.aws.amazon.com/cloudwatch/home?region=${this.region}#dashboards:name=${dashboard.dashboardName}`,
         description: 'CloudWatch Dashboard URL',
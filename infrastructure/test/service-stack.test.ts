@@ -29,10 +29,10 @@ describe('ServiceStack CDK tests', () => {
   test('Stack contains core resources', () => {
     const template = synthTemplate();
 
-    template.resourceCountIs('AWS::DynamoDB::Table', 1);
-    // Expect 5: QuestionsHandler + EvaluateAnswerFn + AdminCreateUser + DnsValidatedCertificate custom resource + LogRetention custom resource Lambda
-    template.resourceCountIs('AWS::Lambda::Function', 5);
-    template.resourceCountIs('AWS::S3::Bucket', 2); // Frontend + CloudTrail
+    template.resourceCountIs('AWS::DynamoDB::Table', 2); // Questions + EvaluationCache
+    // Expect 7: QuestionsHandler + StreamProcessor + StreamReconciler + EvaluateAnswerFn + AdminCreateUser + DnsValidatedCertificate custom resource + LogRetention custom resource Lambda
+    template.resourceCountIs('AWS::Lambda::Function', 7);
+    template.resourceCountIs('AWS::S3::Bucket', 3); // Frontend + Export + CloudTrail
     template.resourceCountIs('AWS::CloudFront::Distribution', 1);
     template.resourceCountIs('AWS::Cognito::UserPool', 1);
     template.resourceCountIs('AWS::ApiGateway::RestApi', 1);
@@ -42,12 +42,12 @@ describe('ServiceStack CDK tests', () => {
     const template = synthTemplate();
 
     template.hasResourceProperties('AWS::DynamoDB::Table', {
-      AttributeDefinitions: [
+      AttributeDefinitions: Match.arrayWith([
         {
           AttributeName: 'id',
           AttributeType: 'S',
         },
-      ],
+      ]),
       KeySchema: [
         {
           AttributeName: 'id',
@@ -61,6 +61,123 @@ describe('ServiceStack CDK tests', () => {
       SSESpecification: {
         SSEEnabled: true,
       },
+      // Replay markers written by the stream processor expire
+      TimeToLiveSpecification: {
+        AttributeName: 'expires_at',
+        Enabled: true,
+      },
+    });
+  });
+
+  test('DynamoDB table has category and category+difficulty indexes', () => {
+    const template = synthTemplate();
+
+    template.hasResourceProperties('AWS::DynamoDB::Table', {
+      GlobalSecondaryIndexes: Match.arrayWith([
+        Match.objectLike({
+          IndexName: 'category-index',
+          KeySchema: [
+            { AttributeName: 'category', KeyType: 'HASH' },
+            { AttributeName: 'created_at', KeyType: 'RANGE' },
+          ],
+        }),
+        Match.objectLike({
+          IndexName: 'category-difficulty-index',
+          KeySchema: [
+            { AttributeName: 'category', KeyType: 'HASH' },
+            { AttributeName: 'difficulty', KeyType: 'RANGE' },
+          ],
+        }),
+      ]),
+    });
+  });
+
+  test('Question indexes roll out one per deployment', () => {
+    const app = new cdk.App({
+      context: {
+        'hosted-zone:account=123456789012:domainName=apaps.people.aws.dev:region=eu-west-1': {
+          Id: '/hostedzone/ZXXXXXXXXXXXXX',
+          Name: 'apaps.people.aws.dev',
+        },
+        questionIndexesDeployed: 1,
+      },
+    });
+    const stack = new ServiceStack(app, 'TestServiceStack', {
+      env: { account: '123456789012', region: 'eu-west-1' },
+      environment: 'prod',
+      domainName: 'apaps.people.aws.dev',
+    });
+    const template = Template.fromStack(stack);
+
+    template.hasResourceProperties('AWS::DynamoDB::Table', {
+      GlobalSecondaryIndexes: [Match.objectLike({ IndexName: 'category-index' })],
+    });
+    template.hasResourceProperties('AWS::Lambda::Function', {
+      Handler: 'questions_handler.handler',
+      Environment: {
+        Variables: Match.objectLike({ QUESTION_INDEXES: 'category-index' }),
+      },
+    });
+  });
+
+  test('DynamoDB table has a random sampling index', () => {
+    const template = synthTemplate();
+
+    template.hasResourceProperties('AWS::DynamoDB::Table', {
+      GlobalSecondaryIndexes: Match.arrayWith([
+        Match.objectLike({
+          IndexName: 'random-index',
+          KeySchema: [
+            { AttributeName: 'sample_pool', KeyType: 'HASH' },
+            { AttributeName: 'rand', KeyType: 'RANGE' },
+          ],
+          Projection: Match.objectLike({ ProjectionType: 'INCLUDE' }),
+        }),
+      ]),
+    });
+  });
+
+  test('Table stream drives the stream processor with partial batch failures', () => {
+    const template = synthTemplate();
+
+    template.hasResourceProperties('AWS::DynamoDB::Table', {
+      StreamSpecification: { StreamViewType: 'NEW_AND_OLD_IMAGES' },
+    });
+    template.hasResourceProperties('AWS::Lambda::Function', {
+      Handler: 'stream_processor.handler',
+    });
+    template.hasResourceProperties('AWS::Lambda::EventSourceMapping', {
+      StartingPosition: 'TRIM_HORIZON',
+      FunctionResponseTypes: ['ReportBatchItemFailures'],
+      BisectBatchOnFunctionError: true,
+      DestinationConfig: Match.objectLike({ OnFailure: Match.anyValue() }),
+    });
+    template.resourceCountIs('AWS::SQS::Queue', 1);
+  });
+
+  test('Stream-derived views are reconciled on a schedule', () => {
+    const template = synthTemplate();
+
+    template.hasResourceProperties('AWS::Lambda::Function', {
+      Handler: 'stream_processor.reconcile',
+    });
+    template.hasResourceProperties('AWS::Events::Rule', {
+      ScheduleExpression: 'rate(6 hours)',
+    });
+  });
+
+  test('Evaluation cache table expires entries and is wired to the evaluate function', () => {
+    const template = synthTemplate();
+
+    template.hasResourceProperties('AWS::DynamoDB::Table', {
+      KeySchema: [{ AttributeName: 'key', KeyType: 'HASH' }],
+      TimeToLiveSpecification: { AttributeName: 'expires_at', Enabled: true },
+    });
+    template.hasResourceProperties('AWS::Lambda::Function', {
+      Handler: 'evaluate_answer.handler',
+      Environment: {
+        Variables: Match.objectLike({ EVALUATION_CACHE_TABLE: Match.anyValue() }),
+      },
     });
   });
 